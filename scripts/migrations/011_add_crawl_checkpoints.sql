@@ -0,0 +1,24 @@
+-- Crawl checkpoints: persisted progress of a crawl run so `mcf crawl-incremental
+-- --resume <run_id>` can continue after a crash, timeout or Ctrl-C.
+--   crawl_checkpoints:      small run state (params, phase, per-category listing cursor)
+--   crawl_checkpoint_items: per-job progress (stage = listed | added | fetched | embedded | classified);
+--                           payload holds the embedding text for 'fetched' rows
+-- Both are deleted when the run finishes.
+-- Run: psql $DATABASE_URL -f scripts/migrations/011_add_crawl_checkpoints.sql
+
+CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+  run_id TEXT PRIMARY KEY,
+  state_json TEXT NOT NULL,
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS crawl_checkpoint_items (
+  run_id TEXT NOT NULL,
+  stage TEXT NOT NULL,
+  job_uuid TEXT NOT NULL,
+  payload TEXT,
+  PRIMARY KEY (run_id, stage, job_uuid)
+);
+
+ALTER TABLE crawl_checkpoints ENABLE ROW LEVEL SECURITY;
+ALTER TABLE crawl_checkpoint_items ENABLE ROW LEVEL SECURITY;
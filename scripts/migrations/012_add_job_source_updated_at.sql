@@ -0,0 +1,6 @@
+-- Change detection for maintained jobs: the source's last-modified watermark
+-- (MCF search results' metadata.updatedAt) as of the last detail fetch.
+-- The incremental crawl refetches a maintained job when the listed watermark differs.
+-- Run: psql $DATABASE_URL -f scripts/migrations/012_add_job_source_updated_at.sql
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS source_updated_at TEXT;
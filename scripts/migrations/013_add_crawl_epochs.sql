@@ -0,0 +1,34 @@
+-- Crawl epochs: one full pass over a source split into shards that can run in
+-- parallel (`mcf crawl-epoch start`, then `mcf crawl-incremental --epoch <id> --shard <n>`).
+--   crawl_epochs:       the shard plan and whether removals have been applied
+--   crawl_epoch_shards: one row per finished shard (its run, and whether its listing was truncated)
+--   crawl_epoch_seen:   every job UUID listed by any shard; removals are inferred from
+--                       the union once all shards finish
+-- Run: psql $DATABASE_URL -f scripts/migrations/013_add_crawl_epochs.sql
+
+CREATE TABLE IF NOT EXISTS crawl_epochs (
+  epoch_id TEXT PRIMARY KEY,
+  source_id TEXT NOT NULL,
+  plan_json TEXT NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  finished_at TIMESTAMPTZ
+);
+
+CREATE TABLE IF NOT EXISTS crawl_epoch_shards (
+  epoch_id TEXT NOT NULL,
+  shard INTEGER NOT NULL,
+  run_id TEXT NOT NULL,
+  truncated BOOLEAN NOT NULL DEFAULT FALSE,
+  finished_at TIMESTAMPTZ DEFAULT NOW(),
+  PRIMARY KEY (epoch_id, shard)
+);
+
+CREATE TABLE IF NOT EXISTS crawl_epoch_seen (
+  epoch_id TEXT NOT NULL,
+  job_uuid TEXT NOT NULL,
+  PRIMARY KEY (epoch_id, job_uuid)
+);
+
+ALTER TABLE crawl_epochs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE crawl_epoch_shards ENABLE ROW LEVEL SECURITY;
+ALTER TABLE crawl_epoch_seen ENABLE ROW LEVEL SECURITY;
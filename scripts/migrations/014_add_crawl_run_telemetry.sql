@@ -0,0 +1,6 @@
+-- Per-run crawl telemetry (phase timings, detail-fetch latency histogram,
+-- embed throughput, HTTP retries / 403s / bytes) written by finish_run as JSON.
+-- Read with `mcf runs --stats` or GET /api/admin/crawl-runs.
+-- Run: psql $DATABASE_URL -f scripts/migrations/014_add_crawl_run_telemetry.sql
+
+ALTER TABLE crawl_runs ADD COLUMN IF NOT EXISTS telemetry_json TEXT;
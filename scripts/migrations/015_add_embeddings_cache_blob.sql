@@ -0,0 +1,8 @@
+-- embeddings_cache: store vectors as little-endian float32/float16 blobs
+-- ($EMBEDDINGS_CACHE_DTYPE) instead of JSON text. Existing rows keep
+-- embedding_json and are still read; new writes leave it NULL.
+-- Run: psql $DATABASE_URL -f scripts/migrations/015_add_embeddings_cache_blob.sql
+
+ALTER TABLE embeddings_cache ADD COLUMN IF NOT EXISTS embedding_blob BYTEA;
+ALTER TABLE embeddings_cache ADD COLUMN IF NOT EXISTS embedding_dtype TEXT;
+ALTER TABLE embeddings_cache ALTER COLUMN embedding_json DROP NOT NULL;
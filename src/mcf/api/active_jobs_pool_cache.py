@@ -8,6 +8,8 @@ compute_ranked_from_pool can use a single vectorised matrix multiply instead
 of a per-job Python loop.
 
 Invalidate when: crawl completes, jobs deactivated, embeddings updated.
+Delta crawls that only add jobs call add_jobs() instead, so the warm pool
+grows in place rather than being rebuilt from the DB.
 """
 
 from __future__ import annotations
@@ -64,6 +66,34 @@ def invalidate() -> None:
         logger.debug("active jobs pool cache invalidated")
 
 
+def add_jobs(entries: list[tuple[str, list[float], datetime | None]]) -> int:
+    """Append newly embedded jobs to a warm cache; return how many were added.
+
+    Entries whose job_uuid is already pooled replace the old row. No-op when the
+    cache is cold — the next get_pool_or_fetch() loads them from the DB anyway.
+    The TTL is not extended.
+    """
+    global _cache
+    if _cache is None or not entries:
+        return 0
+    pool, matrix, expires_at = _cache
+    new_uuids = {job_uuid for job_uuid, _, _ in entries}
+    keep = [i for i, (job_uuid, _, _) in enumerate(pool) if job_uuid not in new_uuids]
+    new_rows = np.array([emb for _, emb, _ in entries], dtype=np.float32)
+    if matrix.ndim == 2 and matrix.shape[0] == len(pool) and matrix.shape[0] > 0:
+        if new_rows.shape[1] != matrix.shape[1]:
+            # Model changed under us — fall back to a full reload.
+            _cache = None
+            return 0
+        matrix = np.vstack([matrix[keep], new_rows])
+    else:
+        matrix = new_rows
+    pool = [pool[i] for i in keep] + list(entries)
+    _cache = (pool, matrix, expires_at)
+    logger.debug("active jobs pool cache extended: +%d jobs (%d total)", len(entries), len(pool))
+    return len(entries)
+
+
 def compute_ranked_from_pool(
     pool: list[tuple[str, list[float], datetime | None]],
     query_embedding: list[float],
@@ -50,6 +50,11 @@ class Settings(BaseSettings):
     # Avoid re-computing BGE embeddings for same text. LRU in-memory + optional DB table.
     enable_embeddings_cache: bool = os.getenv("ENABLE_EMBEDDINGS_CACHE", "1") in ("1", "true", "yes")
 
+    # --- Embedding model ---
+    # Load the embedding model in the background at startup so the first resume upload
+    # or lowball check does not wait for it. Endpoints share one loaded model either way.
+    preload_embedder: bool = os.getenv("PRELOAD_EMBEDDER", "1") in ("1", "true", "yes")
+
     # --- Admin ---
     # Comma-separated user IDs allowed to access admin endpoints (when using JWT auth)
     admin_user_ids: str = os.getenv("ADMIN_USER_IDS", "")
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 import secrets
+import threading
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -18,6 +19,7 @@ from starlette.requests import Request
 
 from mcf.api.auth import get_current_user, get_optional_user
 from mcf.api.config import settings
+from mcf.api.active_jobs_pool_cache import add_jobs as add_jobs_to_active_jobs_pool
 from mcf.api.active_jobs_pool_cache import invalidate as invalidate_active_jobs_pool
 from mcf.api.matches_cache import get_cached, invalidate_user, invalidate_all, set_cached, cache_stats as matches_cache_stats
 from mcf.api.response_cache import (
@@ -32,11 +34,13 @@ from mcf.api.response_cache import (
 )
 from mcf.api.services.matching_service import MatchingService
 from mcf.lib.embeddings.base import EmbedderProtocol
-from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig
 from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
+from mcf.lib.embeddings.registry import get_embedder, preload_embedder
 from mcf.lib.embeddings.resume import extract_resume_text, preprocess_resume_text
 from mcf.lib.storage.base import Storage
 
+logger = logging.getLogger(__name__)
+
 
 def _make_store() -> Storage:
     """Return a DuckDBStore or PostgresStore depending on DATABASE_URL."""
@@ -81,6 +85,14 @@ def _verify_admin_or_secret(
     raise HTTPException(status_code=403, detail="Admin access required")
 
 
+def _preload_embedder() -> None:
+    try:
+        embedder = preload_embedder()
+        logger.info("Embedding model %s loaded", embedder.model_name)
+    except Exception:
+        logger.warning("Failed to preload embedding model", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global _store
@@ -93,6 +105,10 @@ async def lifespan(app: FastAPI):
             logger.info("Active jobs pool warmed on startup")
         except Exception:
             logger.warning("Failed to warm active jobs pool on startup", exc_info=True)
+    # Load the embedding model off the startup path; requests that need it before
+    # the load finishes wait for it rather than loading a second copy.
+    if settings.preload_embedder:
+        threading.Thread(target=_preload_embedder, name="preload-embedder", daemon=True).start()
     yield
     if _store:
         _store.close()
@@ -593,7 +609,7 @@ def _process_resume_text(
             store.update_profile(profile_id=profile_id, resume_storage_path=storage_path)
 
     embeddings_cache = EmbeddingsCache(store=store) if settings.enable_embeddings_cache else None
-    embedder: EmbedderProtocol = Embedder(EmbedderConfig(), embeddings_cache=embeddings_cache)
+    embedder: EmbedderProtocol = get_embedder(embeddings_cache=embeddings_cache)
     preprocessed = preprocess_resume_text(resume_text)
     try:
         embedding = embedder.embed_resume(preprocessed)
@@ -817,6 +833,31 @@ def admin_invalidate_pool(_: str = Depends(_verify_admin_or_secret)):
     return {"status": "ok"}
 
 
+class PoolAddJobsRequest(BaseModel):
+    job_uuids: list[str]
+
+
+@app.post("/api/admin/pool/add-jobs")
+def admin_pool_add_jobs(
+    body: PoolAddJobsRequest,
+    _: str = Depends(_verify_admin_or_secret),
+    store: Storage = Depends(get_store),
+):
+    """Add newly crawled jobs to the warm active jobs pool without a full reload.
+
+    Called by delta crawls (see CRAWL_API_URL). Auth: X-Crawl-Secret header or
+    JWT with admin role / ADMIN_USER_IDS.
+    """
+    added = 0
+    if settings.enable_active_jobs_pool_cache and body.job_uuids:
+        from datetime import datetime, timezone
+
+        now = datetime.now(timezone.utc)
+        rows = store.get_job_embeddings_for_uuids(body.job_uuids)
+        added = add_jobs_to_active_jobs_pool([(job_uuid, emb, now) for job_uuid, emb in rows])
+    return {"status": "ok", "added": added}
+
+
 @app.post("/api/admin/invalidate-cache")
 def admin_invalidate_cache(
     _: str = Depends(_verify_admin_or_secret),
@@ -882,6 +923,19 @@ def admin_clear_cache(
     return {"removed": removed}
 
 
+@app.get("/api/admin/crawl-runs")
+def admin_crawl_runs(
+    _: str = Depends(_verify_admin_or_secret),
+    store: Storage = Depends(get_store),
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Recent crawl runs with their telemetry (phase timings, fetch latency, HTTP counters).
+
+    Auth: X-Crawl-Secret or admin JWT.
+    """
+    return {"runs": store.get_recent_runs(limit=limit)}
+
+
 @app.get("/api/admin/cache-timestamp")
 def admin_cache_timestamp(_: str = Depends(_verify_admin_or_secret)):
     """Last crawl/cache update timestamp from DB. Auth: X-Crawl-Secret or admin JWT."""
@@ -933,7 +987,7 @@ def check_lowball(body: LowballCheckRequest, _: str | None = Depends(get_optiona
     """Check if an offered salary is competitive for a described role."""
     store = get_store()
     embeddings_cache_inst = EmbeddingsCache(store=store) if settings.enable_embeddings_cache else None
-    embedder: EmbedderProtocol = Embedder(EmbedderConfig(), embeddings_cache=embeddings_cache_inst)
+    embedder: EmbedderProtocol = get_embedder(embeddings_cache=embeddings_cache_inst)
     vector = embedder.embed_text(body.job_description)
 
     if settings.enable_active_jobs_pool_cache:
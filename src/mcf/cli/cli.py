@@ -17,13 +17,23 @@ from rich.progress import (
 )
 
 from mcf.api.services.matching_service import MatchingService
-from mcf.lib.api.client import MCFAPIError
+from mcf.lib.archive.raw_archive import ARCHIVE_DIR_ENV, RawArchive
 from mcf.lib.crawler.crawler import CrawlProgress
-from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig
+from mcf.lib.embeddings.embedder import EmbedderConfig
 from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
 from mcf.lib.embeddings.job_text import build_job_text_from_dict
+from mcf.lib.embeddings.process_pool import WORKERS_ENV, ProcessPoolEmbedder
+from mcf.lib.embeddings.registry import get_embedder
 from mcf.lib.embeddings.resume import extract_resume_text, preprocess_resume_text
-from mcf.lib.pipeline.incremental_crawl import run_incremental_crawl
+from mcf.lib.pipeline.backfill import BACKFILL_CHECKPOINT_KEY, run_rich_backfill
+from mcf.lib.pipeline.daemon import DaemonCycleResult, run_crawl_daemon
+from mcf.lib.pipeline.incremental_crawl import (
+    default_embedder,
+    run_incremental_crawl,
+    run_multi_source_crawl,
+    start_crawl_epoch,
+)
+from mcf.lib.pipeline.reparse import run_reparse
 from mcf.lib.sources.cag_source import CareersGovJobSource
 from mcf.lib.sources.mcf_source import MCFJobSource
 from mcf.lib.storage.base import Storage
@@ -100,23 +110,95 @@ def crawl_incremental(
             help="Job source to crawl: mcf | cag | all (default: mcf)",
         ),
     ] = "mcf",
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            "--concurrency",
+            "-c",
+            help="Max job-detail requests in flight (still bounded by --rate-limit)",
+        ),
+    ] = 8,
+    delta: Annotated[
+        bool,
+        typer.Option(
+            "--delta",
+            help="Only ingest new postings (stop paging at already-known jobs; no removals)",
+        ),
+    ] = False,
+    resume: Annotated[
+        Optional[str],
+        typer.Option(
+            "--resume",
+            help="Continue an interrupted run by its run ID (reuses that run's source and options)",
+        ),
+    ] = None,
+    embed_workers: Annotated[
+        int,
+        typer.Option(
+            "--embed-workers",
+            help="Embedding worker processes (each loads the model once; 1 = in-process)",
+            envvar=WORKERS_ENV,
+        ),
+    ] = 1,
+    epoch: Annotated[
+        Optional[str],
+        typer.Option("--epoch", help="Crawl one shard of this crawl epoch (see plan-crawl-epoch; MCF only)"),
+    ] = None,
+    shard: Annotated[
+        Optional[int],
+        typer.Option("--shard", help="Shard number within --epoch (0-based)"),
+    ] = None,
 ) -> None:
     """Incrementally crawl jobs (fetch job detail only for newly-seen UUIDs).
 
     Use [bold]--source mcf[/bold] for MyCareersFuture, [bold]--source cag[/bold] for
-    Careers@Gov, or [bold]--source all[/bold] to crawl both sequentially.
+    Careers@Gov, or [bold]--source all[/bold] to crawl both in parallel as one run.
+
+    Use [bold]--delta[/bold] for cheap frequent runs that only pick up new postings;
+    a regular (non-delta) crawl is still needed to detect removed jobs.
+
+    Progress is checkpointed as the crawl runs; if it dies partway, rerun with
+    [bold]--resume <run_id>[/bold] to continue where it stopped.
+
+    Use [bold]--epoch <id> --shard <n>[/bold] to crawl one shard of a full crawl
+    split across runners; the last shard to finish infers removals for all.
     """
     valid_sources = {"mcf", "cag", "all"}
     if source not in valid_sources:
         console.print(f"[red]Invalid --source '{source}'. Must be one of: {', '.join(sorted(valid_sources))}[/red]")
         raise typer.Exit(1)
+    if (epoch is None) != (shard is None):
+        console.print("[red]--epoch and --shard must be given together.[/red]")
+        raise typer.Exit(1)
+    if epoch and (source != "mcf" or delta or limit or categories):
+        console.print("[red]--epoch crawls an MCF shard in full; it cannot be combined with "
+                      "--source, --delta, --limit or --categories.[/red]")
+        raise typer.Exit(1)
 
     store, db_display = _open_store(db, db_url)
 
+    if resume:
+        checkpoint_state = store.get_crawl_checkpoint(resume)
+        if checkpoint_state is None:
+            console.print(f"[red]No checkpoint for run '{resume}' (already finished, or never started).[/red]")
+            store.close()
+            raise typer.Exit(1)
+        # A multi-source run (--source all) records its source IDs instead.
+        source = "all" if "source_ids" in checkpoint_state else checkpoint_state["source_id"]
+
     console.print(f"[bold cyan]Incremental Crawler[/bold cyan]")
     console.print(f"  Source: [magenta]{source}[/magenta]")
     console.print(f"  Storage: [green]{db_display}[/green]")
     console.print(f"  Rate limit: [yellow]{rate_limit}[/yellow] req/s")
+    console.print(f"  Concurrency: [yellow]{concurrency}[/yellow]")
+    if embed_workers > 1:
+        console.print(f"  Embedding workers: [yellow]{embed_workers}[/yellow]")
+    if resume:
+        console.print(f"  Resuming run: [yellow]{resume}[/yellow]")
+    if epoch:
+        console.print(f"  Epoch: [yellow]{epoch}[/yellow] shard [yellow]{shard}[/yellow]")
+    if delta:
+        console.print("  Mode: [yellow]delta (new postings only)[/yellow]")
     if limit:
         console.print(f"  Limit: [yellow]{limit}[/yellow] jobs")
     if categories and source in ("mcf", "all"):
@@ -124,6 +206,8 @@ def crawl_incremental(
     console.print()
 
     cats = [c.strip() for c in categories.split(",") if c.strip()] if categories else None
+    # Shared by every source; the plain in-process embedder is left to the pipeline.
+    embedder = default_embedder(store, workers=embed_workers) if embed_workers > 1 else None
 
     def _run_source(source_obj, source_label: str, cats_arg=None) -> None:
         """Run incremental crawl for a single source with a progress bar."""
@@ -150,35 +234,333 @@ def crawl_incremental(
                         description=f"[cyan]{p.current_category}[/cyan] ({p.category_index}/{p.total_categories})",
                     )
 
-            result = run_incremental_crawl(
-                store=store,
-                source=source_obj,
-                rate_limit=rate_limit,
-                categories=cats_arg,
-                limit=limit,
-                on_progress=on_progress,
-            )
+            try:
+                result = run_incremental_crawl(
+                    store=store,
+                    source=source_obj,
+                    embedder=embedder,
+                    rate_limit=rate_limit,
+                    categories=cats_arg,
+                    limit=limit,
+                    on_progress=on_progress,
+                    concurrency=concurrency,
+                    delta=delta,
+                    resume_run_id=resume,
+                    epoch_id=epoch,
+                    shard=shard,
+                )
+            finally:
+                if hasattr(source_obj, "close"):
+                    source_obj.close()
 
         console.print()
+        _print_result(source_label, result)
+
+    def _print_result(source_label: str, result) -> None:
         console.print(f"[bold green]{source_label} crawl complete[/bold green]")
         console.print(f"  Total seen: [cyan]{result.total_seen:,}[/cyan]")
         console.print(f"  Added: [cyan]{len(result.added):,}[/cyan]")
         console.print(f"  Maintained: [cyan]{len(result.maintained):,}[/cyan]")
+        if result.updated:
+            console.print(f"  Updated (changed at source): [cyan]{len(result.updated):,}[/cyan]")
         console.print(f"  Removed: [cyan]{len(result.removed):,}[/cyan]")
         console.print()
 
+    def _run_all() -> None:
+        """Crawl MCF and Careers@Gov in parallel into one run."""
+        labels = {"mcf": "MyCareersFuture", "cag": "Careers@Gov"}
+        sources = [MCFJobSource(rate_limit=rate_limit), CareersGovJobSource(rate_limit=rate_limit)]
+        console.print(f"[bold]Crawling [magenta]{' + '.join(labels.values())}[/magenta] in parallel...[/bold]")
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("•"),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            tasks = {
+                s.source_id: progress.add_task(f"[cyan]Listing {labels[s.source_id]} jobs...", total=None)
+                for s in sources
+            }
+
+            def on_progress(source_id: str, p) -> None:
+                task = tasks[source_id]
+                if isinstance(p, int):  # Careers@Gov reports a running count
+                    progress.update(task, completed=p)
+                    return
+                progress.update(task, total=p.total_jobs, completed=p.fetched)
+                if p.current_category:
+                    progress.update(
+                        task,
+                        description=f"[cyan]{p.current_category}[/cyan] ({p.category_index}/{p.total_categories})",
+                    )
+
+            try:
+                results = run_multi_source_crawl(
+                    store=store,
+                    sources=sources,
+                    embedder=embedder,
+                    categories={"mcf": cats} if cats else None,
+                    limit=limit,
+                    on_progress=on_progress,
+                    concurrency=concurrency,
+                    delta=delta,
+                    resume_run_id=resume,
+                )
+            finally:
+                for s in sources:
+                    s.close()
+
+        console.print()
+        for result, s in zip(results, sources):
+            _print_result(labels[s.source_id], result)
+
     try:
         if source == "mcf":
             _run_source(MCFJobSource(rate_limit=rate_limit), "MyCareersFuture", cats_arg=cats)
         elif source == "cag":
             _run_source(CareersGovJobSource(rate_limit=rate_limit), "Careers@Gov")
         else:  # "all"
-            _run_source(MCFJobSource(rate_limit=rate_limit), "MyCareersFuture", cats_arg=cats)
-            _run_source(CareersGovJobSource(rate_limit=rate_limit), "Careers@Gov")
+            _run_all()
+    finally:
+        if hasattr(embedder, "close"):
+            embedder.close()
+        store.close()
+
+
+@app.command("plan-crawl-epoch")
+def plan_crawl_epoch(
+    shards: Annotated[
+        int,
+        typer.Option("--shards", "-n", help="Number of shards to split the full MCF crawl into"),
+    ],
+    db: Annotated[
+        Optional[Path],
+        typer.Option("--db", help="DuckDB file path (default: data/mcf.duckdb)"),
+    ] = None,
+    db_url: Annotated[
+        Optional[str],
+        typer.Option("--db-url", help="PostgreSQL connection URL (overrides --db)", envvar="DATABASE_URL"),
+    ] = None,
+    rate_limit: Annotated[
+        float,
+        typer.Option("--rate-limit", "-r", help="API requests per second"),
+    ] = 4.0,
+) -> None:
+    """Plan a full MCF crawl as balanced shards and start a crawl epoch.
+
+    Measures every category (splitting any over the search API's 10,000-result
+    cap by position level) and balances them by job count. Crawl each shard with
+    [bold]mcf crawl-incremental --epoch <id> --shard <n>[/bold]. The epoch ID is
+    also written to [bold]$GITHUB_OUTPUT[/bold] as [bold]epoch_id[/bold] when set.
+    """
+    store, db_display = _open_store(db, db_url)
+    console.print(f"[bold cyan]Planning crawl epoch[/bold cyan] ({db_display})")
+    try:
+        epoch_id, plan = start_crawl_epoch(store, shards=shards, rate_limit=rate_limit)
+    finally:
+        store.close()
+
+    for shard in plan:
+        console.print(
+            f"  Shard {shard.index}: [cyan]{shard.estimated_jobs:,}[/cyan] jobs, "
+            f"{len(shard.partitions)} partitions"
+        )
+    console.print(f"[bold green]Epoch:[/bold green] {epoch_id}")
+    github_output = os.getenv("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a", encoding="utf-8") as f:
+            f.write(f"epoch_id={epoch_id}\n")
+
+
+@app.command("crawl-daemon")
+def crawl_daemon(
+    db: Annotated[
+        Optional[Path],
+        typer.Option("--db", help="DuckDB file path (default: data/mcf.duckdb)"),
+    ] = None,
+    db_url: Annotated[
+        Optional[str],
+        typer.Option("--db-url", help="PostgreSQL connection URL (overrides --db)", envvar="DATABASE_URL"),
+    ] = None,
+    source: Annotated[
+        str,
+        typer.Option("--source", help="Job source(s) to poll: mcf | cag | all (default: all)"),
+    ] = "all",
+    interval: Annotated[
+        float,
+        typer.Option("--interval", "-i", help="Minutes between polling cycles"),
+    ] = 10.0,
+    full_sweep_hours: Annotated[
+        float,
+        typer.Option(
+            "--full-sweep-hours",
+            help="Run a full (non-delta) crawl this often to detect removals; 0 = never "
+            "(leave removals to the daily crawl)",
+        ),
+    ] = 0.0,
+    rate_limit: Annotated[
+        float,
+        typer.Option("--rate-limit", "-r", help="API requests per second"),
+    ] = 4.0,
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-c", help="Max job-detail requests in flight"),
+    ] = 8,
+) -> None:
+    """Continuously ingest new postings instead of waiting for the daily crawl.
+
+    Every [bold]--interval[/bold] minutes, runs a delta crawl per source: only the
+    newest listing pages are read, and new jobs are fetched, embedded, classified
+    and stored straight away. Stop with Ctrl-C or SIGTERM.
+    """
+    import signal
+    import threading
+
+    valid_sources = {"mcf", "cag", "all"}
+    if source not in valid_sources:
+        console.print(f"[red]Invalid --source '{source}'. Must be one of: {', '.join(sorted(valid_sources))}[/red]")
+        raise typer.Exit(1)
+
+    store, db_display = _open_store(db, db_url)
+    sources = []
+    if source in ("mcf", "all"):
+        sources.append(MCFJobSource(rate_limit=rate_limit))
+    if source in ("cag", "all"):
+        sources.append(CareersGovJobSource(rate_limit=rate_limit))
+
+    console.print("[bold cyan]Crawl Daemon[/bold cyan]")
+    console.print(f"  Sources: [magenta]{', '.join(s.source_id for s in sources)}[/magenta]")
+    console.print(f"  Storage: [green]{db_display}[/green]")
+    console.print(f"  Interval: [yellow]{interval:g}[/yellow] min")
+    console.print(
+        f"  Full sweep: [yellow]{f'every {full_sweep_hours:g} h' if full_sweep_hours > 0 else 'never'}[/yellow]"
+    )
+    console.print()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    def on_cycle(c: DaemonCycleResult) -> None:
+        kind = "full" if c.full_sweep else "delta"
+        if c.error is not None:
+            console.print(f"[red]{c.source_id} {kind} crawl failed after {c.elapsed:.0f}s:[/red] {c.error}")
+            return
+        assert c.result is not None
+        console.print(
+            f"{c.source_id} {kind}: seen {c.result.total_seen:,}, added [cyan]{len(c.result.added):,}[/cyan], "
+            f"removed {len(c.result.removed):,} ({c.elapsed:.0f}s)"
+        )
+
+    try:
+        embeddings_cache = (
+            EmbeddingsCache(store=store)
+            if os.getenv("ENABLE_EMBEDDINGS_CACHE", "1") in ("1", "true", "yes")
+            else None
+        )
+        embedder = get_embedder(embeddings_cache=embeddings_cache)
+        run_crawl_daemon(
+            store=store,
+            sources=sources,
+            embedder=embedder,
+            interval=interval * 60,
+            full_sweep_interval=full_sweep_hours * 3600 if full_sweep_hours > 0 else None,
+            concurrency=concurrency,
+            stop=stop,
+            on_cycle=on_cycle,
+        )
+    except KeyboardInterrupt:
+        console.print("[yellow]Stopping crawl daemon[/yellow]")
     finally:
+        for s in sources:
+            if hasattr(s, "close"):
+                s.close()
         store.close()
 
 
+@app.command("runs")
+def runs(
+    db: Annotated[
+        Optional[Path],
+        typer.Option("--db", help="DuckDB file path (default: data/mcf.duckdb)"),
+    ] = None,
+    db_url: Annotated[
+        Optional[str],
+        typer.Option("--db-url", help="PostgreSQL connection URL (overrides --db)", envvar="DATABASE_URL"),
+    ] = None,
+    limit: Annotated[
+        int,
+        typer.Option("--limit", "-n", help="Number of recent runs to show"),
+    ] = 10,
+    stats: Annotated[
+        bool,
+        typer.Option("--stats", help="Show per-phase telemetry (timings, fetch latency, throughput, HTTP)"),
+    ] = False,
+) -> None:
+    """List recent crawl runs, newest first.
+
+    With [bold]--stats[/bold], also show the telemetry stored with each run: phase
+    timings, detail-fetch latency, embedding throughput, retries, 403s and bytes.
+    """
+    from rich.table import Table
+
+    store, _ = _open_store(db, db_url)
+    try:
+        recent = store.get_recent_runs(limit=limit)
+    finally:
+        store.close()
+    if not recent:
+        console.print("No finished runs yet.")
+        return
+
+    table = Table(title="Crawl runs")
+    for column in ("Run", "Kind", "Seen", "Added", "Maint.", "Removed"):
+        table.add_column(column, justify="left" if column in ("Run", "Kind") else "right")
+    if stats:
+        for column in ("Wall s", "List s", "Embed/s", "Fetch p50/p95 ms", "DB s", "Req", "Retry", "403", "MB"):
+            table.add_column(column, justify="right")
+
+    for run in recent:
+        row = [
+            run["run_id"],
+            run.get("kind") or "",
+            f"{run['total_seen']:,}",
+            f"{run['added']:,}",
+            f"{run['maintained']:,}",
+            f"{run['removed']:,}",
+        ]
+        if stats:
+            row += _telemetry_cells(run.get("telemetry"))
+        table.add_row(*row)
+    console.print(table)
+
+
+def _telemetry_cells(telemetry: dict | None) -> list[str]:
+    if not telemetry:
+        return ["-"] * 9
+    phases = telemetry.get("phases", {})
+    fetch = telemetry.get("detail_fetch", {})
+    http = telemetry.get("http", {})
+
+    def _num(value, fmt: str = "{:,.1f}") -> str:
+        return "-" if value is None else fmt.format(value)
+
+    return [
+        _num(telemetry.get("wall_seconds")),
+        _num(phases.get("listing")),
+        _num(telemetry.get("embed", {}).get("texts_per_sec")),
+        f"{_num(fetch.get('p50_ms'), '{:,.0f}')}/{_num(fetch.get('p95_ms'), '{:,.0f}')}",
+        _num(phases.get("db_write")),
+        _num(http.get("requests"), "{:,}"),
+        _num(http.get("retries"), "{:,}"),
+        _num(http.get("status_403"), "{:,}"),
+        _num(http["bytes"] / 1e6 if "bytes" in http else None),
+    ]
+
+
 @app.command("backfill-rich-fields")
 def backfill_rich_fields(
     db: Annotated[
@@ -202,38 +584,45 @@ def backfill_rich_fields(
         typer.Option(
             "--limit",
             "-l",
-            help="Maximum number of jobs to backfill (for batched runs)",
+            help="Maximum number of jobs to backfill (ignored when resuming)",
         ),
     ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-c", help="Max job-detail requests in flight"),
+    ] = 8,
+    embed: Annotated[
+        bool,
+        typer.Option("--embed", help="Also re-embed and re-classify the jobs that get enriched"),
+    ] = False,
+    restart: Annotated[
+        bool,
+        typer.Option("--restart", help="Discard an unfinished backfill instead of resuming it"),
+    ] = False,
 ) -> None:
     """Backfill rich metadata (categories, employment type, salary, etc.) for existing MCF jobs.
 
-    Fetches job details from the MCF API and updates jobs that have NULL categories_json.
-    Run locally; large datasets may take hours. Use --limit for batched runs.
+    Fetches job details from the MCF API concurrently and bulk-updates jobs that
+    have NULL categories_json. Progress is checkpointed: if a backfill stops
+    early, running the command again continues it and skips the jobs already
+    done (use [bold]--restart[/bold] to start over).
     """
     store, db_display = _open_store(db, db_url)
 
     try:
-        job_uuids = store.get_job_uuids_needing_rich_backfill(limit=limit)
-        if not job_uuids:
-            console.print("[bold green]No jobs need backfill.[/bold green]")
-            return
-
+        resuming = not restart and store.get_crawl_checkpoint(BACKFILL_CHECKPOINT_KEY) is not None
         console.print(f"[bold cyan]Backfill Rich Fields[/bold cyan]")
         console.print(f"  Storage: [green]{db_display}[/green]")
-        console.print(f"  Jobs to backfill: [yellow]{len(job_uuids):,}[/yellow]")
         console.print(f"  Rate limit: [yellow]{rate_limit}[/yellow] req/s")
-        if limit:
+        console.print(f"  Concurrency: [yellow]{concurrency}[/yellow]")
+        if resuming:
+            console.print("  [yellow]Resuming an unfinished backfill[/yellow]")
+        elif limit:
             console.print(f"  Limit: [yellow]{limit}[/yellow] (batched run)")
+        if embed:
+            console.print("  Re-embedding and re-classifying updated jobs")
         console.print()
 
-        run = store.begin_run(kind="backfill", categories=None)
-        source = MCFJobSource(rate_limit=rate_limit)
-
-        ok = 0
-        failed = 0
-        skipped = 0
-
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -245,61 +634,261 @@ def backfill_rich_fields(
             TimeRemainingColumn(),
             console=console,
         ) as progress:
-            task = progress.add_task("[cyan]Backfilling...", total=len(job_uuids))
-
-            for job_uuid in job_uuids:
-                try:
-                    normalized = source.get_job_detail(job_uuid)
-                    store.upsert_new_job_detail(
-                        run_id=run.run_id,
-                        job_uuid=job_uuid,
-                        title=normalized.title,
-                        company_name=normalized.company_name,
-                        location=normalized.location,
-                        job_url=normalized.job_url,
-                        job_source=normalized.source_id,
-                        skills=normalized.skills or None,
-                        raw_json=None,
-                        categories=normalized.categories or None,
-                        employment_types=normalized.employment_types or None,
-                        position_levels=normalized.position_levels or None,
-                        salary_min=normalized.salary_min,
-                        salary_max=normalized.salary_max,
-                        posted_date=normalized.posted_date,
-                        expiry_date=normalized.expiry_date,
-                        min_years_experience=normalized.min_years_experience,
-                    )
-                    ok += 1
-                except MCFAPIError as e:
-                    if e.status_code == 404:
-                        skipped += 1  # Job removed from MCF
-                    else:
-                        failed += 1
-                        progress.console.print(f"[yellow]Warning: {job_uuid}: {e}[/yellow]")
-                except Exception as e:
-                    failed += 1
-                    progress.console.print(f"[yellow]Warning: {job_uuid}: {e}[/yellow]")
-
-                progress.advance(task)
-
-        store.update_daily_stats(run.run_id)
-        store.finish_run(
-            run.run_id,
-            total_seen=len(job_uuids),
-            added=ok,
-            maintained=0,
-            removed=skipped,
-        )
+            task = progress.add_task("[cyan]Backfilling...", total=None)
+
+            def on_progress(done: int, total: int) -> None:
+                progress.update(task, completed=done, total=total)
+
+            result = run_rich_backfill(
+                store=store,
+                rate_limit=rate_limit,
+                limit=limit,
+                concurrency=concurrency,
+                embed=embed,
+                restart=restart,
+                on_progress=on_progress,
+            )
+
+        if result.run is None:
+            console.print("[bold green]No jobs need backfill.[/bold green]")
+            return
 
         console.print()
         console.print("[bold green]Backfill complete[/bold green]")
-        console.print(f"  Updated: [cyan]{ok:,}[/cyan]")
-        console.print(f"  Skipped (404): [yellow]{skipped:,}[/yellow]")
-        console.print(f"  Failed: [red]{failed:,}[/red]")
+        console.print(f"  Jobs: [cyan]{result.total:,}[/cyan]")
+        if result.skipped:
+            console.print(f"  Already done: [cyan]{result.skipped:,}[/cyan]")
+        console.print(f"  Updated: [cyan]{result.updated:,}[/cyan]")
+        if embed or result.embedded:
+            console.print(f"  Re-embedded: [cyan]{result.embedded:,}[/cyan]")
+        console.print(f"  Skipped (404): [yellow]{result.not_found:,}[/yellow]")
+        console.print(f"  Failed: [red]{result.failed:,}[/red]")
+        if result.failed:
+            console.print("  Run the command again to retry the failed jobs.")
     finally:
         store.close()
 
 
+@app.command("reparse")
+def reparse(
+    db: Annotated[
+        Optional[Path],
+        typer.Option("--db", help="DuckDB file path (default: data/mcf.duckdb)"),
+    ] = None,
+    db_url: Annotated[
+        Optional[str],
+        typer.Option("--db-url", help="PostgreSQL connection URL (overrides --db)", envvar="DATABASE_URL"),
+    ] = None,
+    archive_dir: Annotated[
+        Optional[Path],
+        typer.Option("--archive-dir", help="Raw response archive directory", envvar=ARCHIVE_DIR_ENV),
+    ] = None,
+    source: Annotated[
+        str,
+        typer.Option("--source", help="Job source to reparse: mcf | cag | all (default: all)"),
+    ] = "all",
+    embed: Annotated[
+        bool,
+        typer.Option("--embed/--no-embed", help="Also re-embed and re-classify the reparsed jobs"),
+    ] = True,
+    limit: Annotated[
+        Optional[int],
+        typer.Option("--limit", "-l", help="Maximum number of jobs to reparse"),
+    ] = None,
+) -> None:
+    """Rebuild active jobs from the raw response archive (no API calls).
+
+    Re-runs the current normalizers over the newest archived response of each
+    active job, then (unless [bold]--no-embed[/bold]) re-embeds and re-classifies
+    them. Use after fixing a normalizer instead of refetching from the API.
+    Jobs are archived while crawling when MCF_RAW_ARCHIVE_DIR is set.
+    """
+    valid_sources = {"mcf", "cag", "all"}
+    if source not in valid_sources:
+        console.print(f"[red]Invalid --source '{source}'. Must be one of: {', '.join(sorted(valid_sources))}[/red]")
+        raise typer.Exit(1)
+    if archive_dir is None or not archive_dir.exists():
+        console.print(f"[red]No archive directory; pass --archive-dir or set {ARCHIVE_DIR_ENV}.[/red]")
+        raise typer.Exit(1)
+
+    store, db_display = _open_store(db, db_url)
+
+    console.print(f"[bold cyan]Reparse from Archive[/bold cyan]")
+    console.print(f"  Archive: [green]{archive_dir}[/green]")
+    console.print(f"  Storage: [green]{db_display}[/green]")
+    console.print(f"  Source: [magenta]{source}[/magenta]")
+    console.print()
+
+    archive = RawArchive(archive_dir)
+    sources = [MCFJobSource(archive=archive), CareersGovJobSource(archive=archive)]
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("•"),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("[cyan]Reparsing...", total=None)
+            result = run_reparse(
+                store=store,
+                archive=archive,
+                sources=sources,
+                source_id=None if source == "all" else source,
+                embed=embed,
+                limit=limit,
+                on_progress=lambda done, total: progress.update(task, completed=done, total=total),
+            )
+
+        console.print()
+        console.print("[bold green]Reparse complete[/bold green]")
+        console.print(f"  Reparsed: [cyan]{result.reparsed:,}[/cyan]")
+        if embed:
+            console.print(f"  Embedded: [cyan]{result.embedded:,}[/cyan]")
+        console.print(f"  Skipped (inactive or stale): [yellow]{result.skipped:,}[/yellow]")
+        console.print(f"  Failed: [red]{result.failed:,}[/red]")
+    finally:
+        store.close()
+
+
+def _replay_fixtures(archive_dir: Path | None, jobs: int, cag_jobs: int, seed: int):
+    from mcf.lib.replay import ReplayFixtures
+
+    if archive_dir is not None:
+        if not archive_dir.exists():
+            console.print(f"[red]Archive directory {archive_dir} does not exist.[/red]")
+            raise typer.Exit(1)
+        return ReplayFixtures.from_archive(RawArchive(archive_dir))
+    return ReplayFixtures.synthetic(mcf=jobs, cag=cag_jobs, seed=seed)
+
+
+@app.command("replay-server")
+def replay_server(
+    port: Annotated[int, typer.Option("--port", "-p", help="Port to listen on")] = 8765,
+    host: Annotated[str, typer.Option("--host", help="Interface to bind")] = "127.0.0.1",
+    archive_dir: Annotated[
+        Optional[Path],
+        typer.Option("--archive-dir", help="Serve jobs from this raw archive (default: synthetic jobs)"),
+    ] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-n", help="Synthetic MCF jobs")] = 2000,
+    cag_jobs: Annotated[int, typer.Option("--cag-jobs", help="Synthetic Careers@Gov jobs")] = 500,
+    latency_ms: Annotated[float, typer.Option("--latency-ms", help="Delay added to every response")] = 0.0,
+    jitter_ms: Annotated[float, typer.Option("--jitter-ms", help="Extra random delay, up to this much")] = 0.0,
+    error_403: Annotated[float, typer.Option("--error-403", help="Share of detail requests answered 403")] = 0.0,
+    error_5xx: Annotated[float, typer.Option("--error-5xx", help="Share of detail requests answered 503")] = 0.0,
+    seed: Annotated[int, typer.Option("--seed", help="Seed for synthetic jobs and fault injection")] = 0,
+) -> None:
+    """Serve recorded or synthetic MCF / Careers@Gov API responses locally.
+
+    Point a crawl at it with the printed [bold]MCF_API_BASE_URL[/bold] and
+    [bold]CAG_ALGOLIA_BASE_URL[/bold] to exercise the crawler without touching
+    the live APIs. Stop with Ctrl-C.
+    """
+    from mcf.lib.replay import ReplayConfig, ReplayServer
+
+    fixtures = _replay_fixtures(archive_dir, jobs, cag_jobs, seed)
+    config = ReplayConfig(
+        latency_ms=latency_ms, jitter_ms=jitter_ms, error_403_rate=error_403, error_5xx_rate=error_5xx, seed=seed
+    )
+    server = ReplayServer(fixtures, config, host=host, port=port)
+    console.print(f"[bold cyan]Replay server[/bold cyan] on {server.url}")
+    console.print(f"  MCF jobs: [cyan]{len(fixtures.mcf_jobs):,}[/cyan]  CAG jobs: [cyan]{len(fixtures.cag_objects):,}[/cyan]")
+    for name, value in server.environ().items():
+        console.print(f"  export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        console.print(f"Requests: {dict(server.stats)}")
+
+
+@app.command("benchmark-crawl")
+def benchmark_crawl(
+    source: Annotated[str, typer.Option("--source", help="Source to benchmark: mcf | cag")] = "mcf",
+    archive_dir: Annotated[
+        Optional[Path],
+        typer.Option("--archive-dir", help="Replay jobs from this raw archive (default: synthetic jobs)"),
+    ] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-n", help="Synthetic jobs to crawl")] = 2000,
+    latency_ms: Annotated[float, typer.Option("--latency-ms", help="Delay added to every response")] = 20.0,
+    jitter_ms: Annotated[float, typer.Option("--jitter-ms", help="Extra random delay, up to this much")] = 20.0,
+    error_403: Annotated[float, typer.Option("--error-403", help="Share of detail requests answered 403")] = 0.0,
+    error_5xx: Annotated[float, typer.Option("--error-5xx", help="Share of detail requests answered 503")] = 0.0,
+    concurrency: Annotated[int, typer.Option("--concurrency", "-c", help="Max detail requests in flight")] = 8,
+    rate_limit: Annotated[
+        Optional[float], typer.Option("--rate-limit", "-r", help="Requests per second (default: unlimited)")
+    ] = None,
+    detail_fetch: Annotated[
+        bool,
+        typer.Option("--detail-fetch", help="Fetch every job's detail instead of ingesting search results"),
+    ] = False,
+    model: Annotated[
+        bool,
+        typer.Option("--model", help="Embed with the real model instead of a hash (includes model time)"),
+    ] = False,
+    seed: Annotated[int, typer.Option("--seed", help="Seed for synthetic jobs and fault injection")] = 0,
+    as_json: Annotated[bool, typer.Option("--json", help="Print the result as JSON")] = False,
+    fail_below: Annotated[
+        Optional[float],
+        typer.Option("--fail-below", help="Exit 1 if overall jobs/sec is below this (for CI)"),
+    ] = None,
+) -> None:
+    """Benchmark a full incremental crawl against the local replay server.
+
+    Runs [bold]run_incremental_crawl[/bold] end to end into a scratch DuckDB and
+    reports jobs/sec overall and per phase, plus fetch latency and HTTP
+    counters. No live API, database or archive is touched.
+    """
+    import json
+    from dataclasses import asdict
+
+    from mcf.lib.replay import ReplayConfig, run_crawl_benchmark
+
+    if source not in ("mcf", "cag"):
+        console.print(f"[red]Invalid --source '{source}'. Must be one of: cag, mcf[/red]")
+        raise typer.Exit(1)
+    fixtures = _replay_fixtures(archive_dir, jobs if source == "mcf" else 0, jobs if source == "cag" else 0, seed)
+    config = ReplayConfig(
+        latency_ms=latency_ms, jitter_ms=jitter_ms, error_403_rate=error_403, error_5xx_rate=error_5xx, seed=seed
+    )
+    result = run_crawl_benchmark(
+        fixtures,
+        config=config,
+        source=source,
+        embedder=get_embedder() if model else None,
+        concurrency=concurrency,
+        rate_limit=rate_limit,
+        search_ingest=not detail_fetch,
+    )
+
+    if as_json:
+        print(json.dumps(asdict(result), indent=2))
+    else:
+        fetch = result.telemetry.get("detail_fetch", {})
+        http = result.telemetry.get("http", {})
+        console.print(f"[bold green]Crawl benchmark[/bold green] ({result.source_id})")
+        console.print(f"  Jobs: [cyan]{result.jobs:,}[/cyan] in [cyan]{result.wall_seconds:.1f}s[/cyan]")
+        for phase, rate in result.jobs_per_sec.items():
+            console.print(f"  {phase}: [cyan]{rate if rate is not None else '-'}[/cyan] jobs/s")
+        if fetch.get("calls"):
+            console.print(
+                f"  Detail fetch: {fetch['calls']:,} calls, p50 {fetch['p50_ms']} ms, p95 {fetch['p95_ms']} ms"
+            )
+        console.print(
+            f"  HTTP: {http.get('requests', 0):,} requests, {http.get('retries', 0):,} retries, "
+            f"{http.get('status_403', 0):,} 403s, {http.get('bytes', 0) / 1e6:.1f} MB"
+        )
+
+    overall = result.jobs_per_sec.get("overall") or 0.0
+    if fail_below is not None and overall < fail_below:
+        console.print(f"[red]Throughput {overall} jobs/s is below --fail-below {fail_below}[/red]")
+        raise typer.Exit(1)
+
+
 @app.command("backfill-job-daily-stats")
 def backfill_job_daily_stats(
     db: Annotated[
@@ -403,7 +992,7 @@ def process_resume(
         # BGE models expect a task prefix on the query (resume) side so that
         # the embedding space aligns correctly with passage (job) embeddings.
         console.print("[cyan]Generating embedding...[/cyan]")
-        embedder = Embedder(EmbedderConfig())
+        embedder = get_embedder()
         preprocessed = preprocess_resume_text(resume_text)
         embedding = embedder.embed_resume(preprocessed)
         store.upsert_candidate_embedding(
@@ -607,8 +1196,17 @@ def re_embed(
     ] = None,
     batch_size: Annotated[
         int,
-        typer.Option("--batch-size", "-b", help="Embedding batch size"),
+        typer.Option("--batch-size", "-b", help="Most texts per model batch (x workers per embedding call)"),
     ] = 32,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Embedding worker processes (each loads the model once; 1 = in-process)",
+            envvar=WORKERS_ENV,
+        ),
+    ] = 1,
 ) -> None:
     """Re-embed all jobs with the current model and structured text format.
 
@@ -640,10 +1238,20 @@ def re_embed(
         console.print(f"  Active jobs: [yellow]{len(all_jobs):,}[/yellow]")
         console.print(f"  Model: [green]{EmbedderConfig().model_name}[/green]")
         console.print(f"  Batch size: [yellow]{batch_size}[/yellow]")
+        if workers > 1:
+            console.print(f"  Workers: [yellow]{workers}[/yellow]")
         console.print()
 
         embeddings_cache = EmbeddingsCache(store=store) if os.getenv("ENABLE_EMBEDDINGS_CACHE", "1") in ("1", "true", "yes") else None
-        embedder = Embedder(EmbedderConfig(), embeddings_cache=embeddings_cache)
+        config = EmbedderConfig(batch_size=batch_size)
+        if workers > 1 and config.backend == "torch":
+            embedder = ProcessPoolEmbedder(config, embeddings_cache=embeddings_cache, workers=workers)
+        else:
+            # ONNX Runtime already spreads one batch over every core.
+            workers = 1
+            embedder = get_embedder(config, embeddings_cache=embeddings_cache)
+        # One embed_texts call per round keeps every worker busy.
+        flush_size = batch_size * workers
 
         with Progress(
             SpinnerColumn(),
@@ -674,7 +1282,7 @@ def re_embed(
                 texts.append(job_text)
                 uuids.append(job["job_uuid"])
 
-                if len(texts) >= batch_size:
+                if len(texts) >= flush_size:
                     embeddings = embedder.embed_texts(texts)
                     for uuid, emb in zip(uuids, embeddings):
                         store.upsert_embedding(
@@ -705,9 +1313,147 @@ def re_embed(
         console.print("[yellow]Tip:[/yellow] Run 'mcf process-resume' to update your resume "
                       "embedding with the new model.")
     finally:
+        if workers > 1 and "embedder" in locals():
+            embedder.close()
         store.close()
 
 
+def _read_texts(texts_file: Path | None) -> list[str] | None:
+    if texts_file is None:
+        return None
+    if not texts_file.exists():
+        console.print(f"[red]{texts_file} does not exist.[/red]")
+        raise typer.Exit(1)
+    return [line.strip() for line in texts_file.read_text().splitlines() if line.strip()]
+
+
+@app.command("export-onnx")
+def export_onnx_model(
+    model: Annotated[
+        Optional[str], typer.Option("--model", "-m", help="Sentence-transformers model (default: the configured one)")
+    ] = None,
+    out_dir: Annotated[
+        Optional[Path], typer.Option("--out-dir", "-o", help="Export directory (default: data/onnx/<model>)")
+    ] = None,
+    quantize: Annotated[
+        bool, typer.Option("--quantize/--no-quantize", help="Also write the int8 dynamically quantized graph")
+    ] = True,
+    parity: Annotated[
+        bool, typer.Option("--parity/--no-parity", help="Check the exported vectors against the PyTorch model")
+    ] = True,
+    texts_file: Annotated[
+        Optional[Path], typer.Option("--texts-file", help="Parity texts, one per line (default: built-in samples)")
+    ] = None,
+) -> None:
+    """Export the embedding model for the ONNX Runtime backend ([bold]EMBEDDER_BACKEND=onnx[/bold]).
+
+    Writes the ONNX graph (plus an int8 quantized copy), tokenizer and pooling
+    settings, then compares the vectors with the PyTorch model. Exits 1 if any
+    text's cosine similarity falls below the parity threshold.
+    """
+    from dataclasses import replace
+
+    from mcf.lib.embeddings.onnx_embedder import check_parity, export_onnx
+
+    config = EmbedderConfig()
+    if model:
+        config = replace(config, model_name=model)
+    console.print(f"[bold cyan]Exporting[/bold cyan] {config.model_name}")
+    directory = export_onnx(config.model_name, out_dir, quantize=quantize)
+    console.print(f"  Written to [green]{directory}[/green]")
+    if not parity:
+        return
+
+    texts = _read_texts(texts_file)
+    reference = get_embedder(replace(config, backend="torch"))
+    failed = False
+    for quantized in ([False, True] if quantize else [False]):
+        report = check_parity(
+            replace(config, backend="onnx", onnx_dir=str(directory), quantize=quantized),
+            texts,
+            reference=reference,
+        )
+        status = "[green]ok[/green]" if report.passed else "[red]FAILED[/red]"
+        console.print(
+            f"  Parity {'int8' if quantized else 'fp32'}: min cosine [cyan]{report.min_cosine}[/cyan], "
+            f"mean [cyan]{report.mean_cosine}[/cyan] over {report.texts} texts "
+            f"(threshold {report.threshold}) {status}"
+        )
+        failed = failed or not report.passed
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command("benchmark-embedder")
+def benchmark_embedder_cmd(
+    backends: Annotated[
+        str,
+        typer.Option("--backends", "-b", help="Comma-separated: torch, onnx, onnx-int8"),
+    ] = "torch,onnx-int8",
+    texts: Annotated[int, typer.Option("--texts", "-n", help="Number of sample texts to embed")] = 512,
+    texts_file: Annotated[
+        Optional[Path], typer.Option("--texts-file", help="Texts to embed, one per line (default: built-in samples)")
+    ] = None,
+    batch_size: Annotated[
+        Optional[int], typer.Option("--batch-size", help="Most texts per model batch (default: 32)")
+    ] = None,
+    max_batch_tokens: Annotated[
+        Optional[int],
+        typer.Option("--max-batch-tokens", help="Token budget per model batch, texts x padded length (default: 16384)"),
+    ] = None,
+    onnx_dir: Annotated[
+        Optional[Path], typer.Option("--onnx-dir", help="ONNX export directory (default: data/onnx/<model>)")
+    ] = None,
+    as_json: Annotated[bool, typer.Option("--json", help="Print the results as JSON")] = False,
+) -> None:
+    """Compare embedding throughput and memory of the embedder backends.
+
+    Each backend runs in a fresh process: texts/sec, ms per text, model load
+    time and peak resident memory. The onnx backends need [bold]mcf export-onnx[/bold] first.
+    """
+    import json
+    from dataclasses import asdict, replace
+
+    from rich.table import Table
+
+    from mcf.lib.embeddings.benchmark import benchmark_embedder, sample_texts
+
+    variants = {
+        "torch": {"backend": "torch"},
+        "onnx": {"backend": "onnx", "quantize": False},
+        "onnx-int8": {"backend": "onnx", "quantize": True},
+    }
+    labels = [b.strip() for b in backends.split(",") if b.strip()]
+    unknown = [b for b in labels if b not in variants]
+    if unknown:
+        console.print(f"[red]Unknown backend(s): {', '.join(unknown)}. Choose from: {', '.join(variants)}[/red]")
+        raise typer.Exit(1)
+
+    base = EmbedderConfig()
+    if batch_size:
+        base = replace(base, batch_size=batch_size)
+    if max_batch_tokens:
+        base = replace(base, max_batch_tokens=max_batch_tokens)
+    if onnx_dir:
+        base = replace(base, onnx_dir=str(onnx_dir))
+    sample = _read_texts(texts_file) or sample_texts(texts)
+
+    results = [benchmark_embedder(replace(base, **variants[label]), sample) for label in labels]
+    if as_json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return
+
+    table = Table(
+        title=f"Embedder benchmark ({base.model_name}, {len(sample):,} texts, "
+        f"batches of <= {base.batch_size} texts / {base.max_batch_tokens:,} tokens)"
+    )
+    for column in ("Backend", "Texts/s", "ms/text", "Load (s)", "Peak RSS (MB)"):
+        table.add_column(column, justify="left" if column == "Backend" else "right")
+    for r in results:
+        table.add_row(r.label, f"{r.texts_per_sec:,}", str(r.ms_per_text), str(r.load_seconds), f"{r.peak_rss_mb:,}")
+    console.print(table)
+
+
 @app.command("export-to-postgres")
 def export_to_postgres(
     db: Annotated[
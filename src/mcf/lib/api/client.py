@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 import time
 
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from mcf.lib.api.http_stats import HTTP_STATS
+from mcf.lib.api.rate_limit import AdaptiveTokenBucket, TokenBucket
 from mcf.lib.models.job_detail import JobDetail
 from mcf.lib.models.models import SearchResponse
 
@@ -14,8 +18,17 @@ BASE_URL = "https://api.mycareersfuture.gov.sg"
 SEARCH_URL = f"{BASE_URL}/v2/search"
 JOBS_URL = f"{BASE_URL}/v2/jobs"
 
+# Points the clients at another host, e.g. the offline replay server (mcf.lib.replay).
+BASE_URL_ENV = "MCF_API_BASE_URL"
+
 DEFAULT_RATE_LIMIT = 5.0
 
+# 403 (MCF's rate-limit / IP block response) and 429 are reported to the
+# limiter, which slows down or pauses every client sharing it.
+THROTTLE_STATUS_CODES = (403, 429)
+DEFAULT_MAX_THROTTLE_ATTEMPTS = 8
+_MAX_OTHER_RETRIES = 2
+
 DEFAULT_HEADERS = {
     "accept": "*/*",
     "accept-language": "en-GB,en;q=0.9",
@@ -38,18 +51,58 @@ class MCFAPIError(Exception):
         self.message = message
         super().__init__(f"API Error {status_code}: {message}")
 
+    @property
+    def throttled(self) -> bool:
+        """Whether the API refused the request for rate-limit reasons."""
+        return self.status_code in THROTTLE_STATUS_CODES
+
+
+def api_base_url() -> str:
+    """``$MCF_API_BASE_URL`` if set, else the live API (read per request)."""
+    return os.getenv(BASE_URL_ENV, BASE_URL).rstrip("/")
+
+
+def _retry_wait(attempt: int) -> float | None:
+    """Seconds to wait before retrying a non-throttle error (1-indexed), or None to give up.
+
+    Short exponential backoff, max 10 seconds (up to 3 attempts). Throttling
+    is not waited out here: the limiter holds requests back instead.
+    """
+    if attempt > _MAX_OTHER_RETRIES:
+        return None
+    return min(2**attempt, 10)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
 
 class MCFClient:
-    """Client for the MyCareersFuture Singapore API."""
+    """Client for the MyCareersFuture Singapore API.
+
+    The underlying ``httpx.Client`` keeps connections alive, so reuse one
+    instance for many calls. Pass a shared ``limiter`` to make several clients
+    draw from one request budget; otherwise the client gets its own bucket at
+    ``rate_limit`` req/s. Safe to share between threads.
+
+    Throttled requests (403/429) are reported to the limiter and retried once
+    it lets them through, up to ``max_throttle_attempts`` in total; then
+    :class:`MCFAPIError` is raised so callers can defer the work.
+    """
 
     def __init__(
         self,
         timeout: float = 30.0,
         rate_limit: float | None = DEFAULT_RATE_LIMIT,
+        limiter: TokenBucket | None = None,
+        max_throttle_attempts: int = DEFAULT_MAX_THROTTLE_ATTEMPTS,
     ) -> None:
         self._client = httpx.Client(headers=DEFAULT_HEADERS, timeout=timeout)
-        self._rate_limit = rate_limit
-        self._last_request_time: float = 0
+        self._limiter = limiter or AdaptiveTokenBucket(rate_limit)
+        self.max_throttle_attempts = max_throttle_attempts
 
     def __enter__(self) -> MCFClient:
         return self
@@ -61,49 +114,32 @@ class MCFClient:
         """Close the HTTP client."""
         self._client.close()
 
-    def _wait_for_rate_limit(self) -> None:
-        if self._rate_limit is None or self._rate_limit <= 0:
-            return
-        min_interval = 1.0 / self._rate_limit
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-
     def _request(self, method: str, url: str, **kwargs: object) -> httpx.Response:
-        """Make an HTTP request with retry logic for 403 errors."""
-        max_attempts = 5
+        """Make an HTTP request, feeding throttling back to the limiter."""
         attempt = 0
-        
-        while attempt < max_attempts:
-            self._wait_for_rate_limit()
-            self._last_request_time = time.monotonic()
+        throttled = 0
+
+        while True:
+            self._limiter.acquire()
             response = self._client.request(method, url, **kwargs)
-            
+            HTTP_STATS.record(response, retry=attempt > 0 or throttled > 0)
+
             if response.status_code < 400:
+                self._limiter.record_success()
                 return response
-            
-            # For 403 errors, wait longer before retrying (rate limit/IP block)
-            if response.status_code == 403:
-                attempt += 1
-                if attempt >= max_attempts:
+
+            if response.status_code in THROTTLE_STATUS_CODES:
+                self._limiter.record_throttle(_retry_after(response))
+                throttled += 1
+                if throttled >= self.max_throttle_attempts:
                     raise MCFAPIError(response.status_code, response.text)
-                # Wait progressively longer: 5 min, 10 min, 15 min, 20 min
-                wait_time = 5 * 60 * attempt  # Convert to seconds
-                time.sleep(wait_time)
-                continue
-            
-            # For other 4xx/5xx errors, use standard retry with exponential backoff
-            if attempt < 2:  # Retry up to 2 more times for non-403 errors
-                attempt += 1
-                wait_time = min(2 ** attempt, 10)  # Exponential backoff, max 10 seconds
-                time.sleep(wait_time)
                 continue
-            
-            # If we've exhausted retries, raise the error
-            raise MCFAPIError(response.status_code, response.text)
-        
-        # Should never reach here, but just in case
-        raise MCFAPIError(response.status_code, response.text)
+
+            attempt += 1
+            wait_time = _retry_wait(attempt)
+            if wait_time is None:
+                raise MCFAPIError(response.status_code, response.text)
+            time.sleep(wait_time)
 
     def search_jobs(
         self,
@@ -112,6 +148,7 @@ class MCFClient:
         page: int = 0,
         limit: int = 100,
         categories: list[str] | None = None,
+        position_levels: list[str] | None = None,
         sort_by_date: bool = True,
     ) -> SearchResponse:
         """Search for job postings."""
@@ -122,15 +159,89 @@ class MCFClient:
             body["search"] = keywords
         if categories:
             body["categories"] = categories
+        if position_levels:
+            body["positionLevels"] = position_levels
         if sort_by_date:
             body["sortBy"] = ["new_posting_date"]
 
-        response = self._request("POST", SEARCH_URL, params=params, json=body)
+        response = self._request("POST", f"{api_base_url()}/v2/search", params=params, json=body)
         return SearchResponse.model_validate(response.json())
 
     def get_job_detail(self, uuid: str) -> JobDetail:
         """Get job details by UUID."""
-        url = f"{JOBS_URL}/{uuid}"
+        url = f"{api_base_url()}/v2/jobs/{uuid}"
         params = {"updateApplicationCount": "true"}
         response = self._request("GET", url, params=params)
         return JobDetail.model_validate(response.json())
+
+
+class AsyncMCFClient:
+    """Async client for the MyCareersFuture API.
+
+    Lets many requests be in flight at once while still spacing request *starts*
+    through the token bucket, so network latency overlaps instead of adding up.
+    Must be used (and closed) within a single event loop.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        rate_limit: float | None = DEFAULT_RATE_LIMIT,
+        max_connections: int = 16,
+        limiter: TokenBucket | None = None,
+        max_throttle_attempts: int = DEFAULT_MAX_THROTTLE_ATTEMPTS,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._limiter = limiter or AdaptiveTokenBucket(rate_limit)
+        self.max_throttle_attempts = max_throttle_attempts
+
+    async def __aenter__(self) -> AsyncMCFClient:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self._client.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP client."""
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs: object) -> httpx.Response:
+        """Make an HTTP request with the same retry policy as :class:`MCFClient`."""
+        attempt = 0
+        throttled = 0
+
+        while True:
+            await self._limiter.acquire_async()
+            response = await self._client.request(method, url, **kwargs)
+            HTTP_STATS.record(response, retry=attempt > 0 or throttled > 0)
+
+            if response.status_code < 400:
+                self._limiter.record_success()
+                return response
+
+            if response.status_code in THROTTLE_STATUS_CODES:
+                self._limiter.record_throttle(_retry_after(response))
+                throttled += 1
+                if throttled >= self.max_throttle_attempts:
+                    raise MCFAPIError(response.status_code, response.text)
+                continue
+
+            attempt += 1
+            wait_time = _retry_wait(attempt)
+            if wait_time is None:
+                raise MCFAPIError(response.status_code, response.text)
+            await asyncio.sleep(wait_time)
+
+    async def get_job_detail(self, uuid: str) -> JobDetail:
+        """Get job details by UUID."""
+        url = f"{api_base_url()}/v2/jobs/{uuid}"
+        params = {"updateApplicationCount": "true"}
+        response = await self._request("GET", url, params=params)
+        return JobDetail.model_validate(response.json())
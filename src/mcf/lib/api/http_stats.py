@@ -0,0 +1,52 @@
+"""Process-wide HTTP counters for crawl telemetry.
+
+Every upstream response the API clients and sources receive is counted in
+:data:`HTTP_STATS`: requests, retries, throttles (403/429, with 403 — MCF's
+block response — counted separately), other errors and bytes downloaded. A
+crawl takes a :meth:`HttpStats.snapshot` when it starts and reports the
+difference when it finishes (see :mod:`mcf.lib.pipeline.telemetry`).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+import httpx
+
+COUNTERS = ("requests", "retries", "throttled", "status_403", "errors", "bytes")
+
+
+class HttpStats:
+    """Thread-safe response counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Counter[str] = Counter()
+
+    def record(self, response: httpx.Response, *, retry: bool = False) -> None:
+        """Count one response; ``retry`` marks a repeat of an earlier failed request."""
+        status = response.status_code
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["bytes"] += response.num_bytes_downloaded
+            if retry:
+                self._counts["retries"] += 1
+            if status == 403:
+                self._counts["status_403"] += 1
+            if status in (403, 429):
+                self._counts["throttled"] += 1
+            elif status >= 400:
+                self._counts["errors"] += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {name: self._counts[name] for name in COUNTERS}
+
+    def since(self, before: dict[str, int]) -> dict[str, int]:
+        """Counts accumulated since ``before`` (an earlier :meth:`snapshot`)."""
+        now = self.snapshot()
+        return {name: now[name] - before.get(name, 0) for name in COUNTERS}
+
+
+HTTP_STATS = HttpStats()
@@ -0,0 +1,241 @@
+"""Token-bucket rate limiting shared across clients, threads and processes.
+
+Every MCF client that holds the same :class:`TokenBucket` draws from one
+request budget, so the crawler, ``backfill-rich-fields`` and any concurrent
+workers together stay under the upstream limit.
+
+Cross-process sharing: give the bucket a ``state_path`` (or set the
+``MCF_RATE_LIMIT_FILE`` environment variable for :func:`shared_limiter`).
+The bucket state then lives in that file and is updated under an exclusive
+``flock``, so separate processes on the same machine coordinate too. File
+locking needs ``fcntl`` (POSIX); elsewhere the bucket is per-process only.
+
+:class:`AdaptiveTokenBucket` adds AIMD rate control and a circuit breaker:
+clients report successes and throttles (403/429), and the bucket halves its
+rate on throttling, stops all requests for a while when throttling persists,
+and creeps back up while requests succeed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows — no cross-process sharing
+    fcntl = None  # type: ignore[assignment]
+
+RATE_LIMIT_FILE_ENV = "MCF_RATE_LIMIT_FILE"
+
+
+class TokenBucket:
+    """Thread-safe token bucket; optionally shared across processes via a lock file.
+
+    Each request takes one token. Tokens refill at ``rate`` per second up to
+    ``burst``. Callers reserve a token and then sleep until it is due, so
+    concurrent callers queue up one interval apart instead of stampeding.
+    A ``rate`` of ``None`` or ``<= 0`` disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        *,
+        burst: float = 1.0,
+        state_path: str | Path | None = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.state_path = Path(state_path) if state_path and fcntl is not None else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate is not None and self.rate > 0
+
+    def acquire(self) -> None:
+        """Block until a request may be made."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Async variant of :meth:`acquire`."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            if self.state_path is None:
+                self._tokens, self._updated, wait = self._take(
+                    self._tokens, self._updated, time.monotonic()
+                )
+                return wait
+            with _locked_file(self.state_path) as f:
+                # Wall-clock time: monotonic clocks are not comparable across processes.
+                now = time.time()
+                try:
+                    state = json.loads(f.read() or "{}")
+                    tokens, updated = float(state["tokens"]), float(state["updated"])
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated = self.burst, now
+                tokens, updated, wait = self._take(tokens, updated, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated": updated}))
+                return wait
+
+    def record_success(self) -> None:
+        """Feedback hook: a request succeeded (no-op for a fixed-rate bucket)."""
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Feedback hook: the upstream throttled a request (no-op for a fixed-rate bucket)."""
+
+    def _take(self, tokens: float, updated: float, now: float) -> tuple[float, float, float]:
+        assert self.rate is not None
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1.0
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket whose rate tracks what the upstream tolerates (AIMD + circuit breaker).
+
+    - Additive increase: every ``success_window`` consecutive successes raise
+      the rate by ``increase`` req/s, up to the configured rate.
+    - Multiplicative decrease: a throttle multiplies the rate by ``decrease``
+      (at most once per ``1 / rate`` seconds, so a burst of in-flight failures
+      counts once), down to ``min_rate``.
+    - Circuit breaker: ``open_after`` consecutive throttles (or a
+      ``Retry-After``) stop all requests for ``open_for`` seconds, doubling on
+      each re-open up to ``max_open_for``. Requests then resume at
+      ``min_rate`` and ramp up again on success.
+
+    Controller state is per process; the token state itself is shared across
+    processes as for :class:`TokenBucket`.
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        *,
+        burst: float = 1.0,
+        state_path: str | Path | None = None,
+        min_rate: float = 0.5,
+        increase: float = 0.25,
+        success_window: int = 10,
+        decrease: float = 0.5,
+        open_after: int = 3,
+        open_for: float = 30.0,
+        max_open_for: float = 600.0,
+    ) -> None:
+        super().__init__(rate, burst=burst, state_path=state_path)
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate) if rate else min_rate
+        self.increase = increase
+        self.success_window = success_window
+        self.decrease = decrease
+        self.open_after = open_after
+        self.open_for = open_for
+        self.max_open_for = max_open_for
+        self._control_lock = threading.Lock()
+        self._successes = 0
+        self._throttles = 0
+        self._last_decrease = 0.0
+        self._open_until = 0.0
+        self._next_open_for = open_for
+
+    def acquire(self) -> None:
+        while (wait := self._circuit_wait()) > 0:
+            time.sleep(wait)
+        super().acquire()
+
+    async def acquire_async(self) -> None:
+        while (wait := self._circuit_wait()) > 0:
+            await asyncio.sleep(wait)
+        await super().acquire_async()
+
+    def _circuit_wait(self) -> float:
+        with self._control_lock:
+            return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        if not self.enabled:
+            return
+        with self._control_lock:
+            self._throttles = 0
+            self._next_open_for = self.open_for
+            self._successes += 1
+            if self._successes >= self.success_window:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        if not self.enabled:
+            return
+        with self._control_lock:
+            now = time.monotonic()
+            self._successes = 0
+            self._throttles += 1
+            if now - self._last_decrease >= 1.0 / self.rate:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._last_decrease = now
+            if now < self._open_until:
+                return  # already open; in-flight requests are still reporting back
+            if retry_after or self._throttles >= self.open_after:
+                pause = retry_after or self._next_open_for
+                self._open_until = now + pause
+                self._next_open_for = min(self.max_open_for, self._next_open_for * 2)
+                self._throttles = 0
+                self.rate = self.min_rate
+                print(f"Warning: upstream is throttling; pausing requests for {pause:.0f}s")
+
+
+@contextmanager
+def _locked_file(path: Path) -> Iterator:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+", encoding="utf-8") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            yield f
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+_shared: dict[str, AdaptiveTokenBucket] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(name: str, rate: float | None) -> AdaptiveTokenBucket:
+    """Return the process-wide adaptive bucket for *name*, creating it on first use.
+
+    The first caller's ``rate`` wins (as the ceiling); later callers share that
+    budget and its throttling feedback. When
+    ``MCF_RATE_LIMIT_FILE`` is set, the bucket state is kept in
+    ``{MCF_RATE_LIMIT_FILE}.{name}`` so other processes share it as well.
+    """
+    with _shared_lock:
+        bucket = _shared.get(name)
+        if bucket is None:
+            state_file = os.getenv(RATE_LIMIT_FILE_ENV)
+            bucket = AdaptiveTokenBucket(
+                rate,
+                state_path=f"{state_file}.{name}" if state_file else None,
+            )
+            _shared[name] = bucket
+        return bucket
@@ -0,0 +1,5 @@
+"""Raw API response archive for offline re-parsing."""
+
+from mcf.lib.archive.raw_archive import ArchiveRecord, RawArchive, default_archive
+
+__all__ = ["ArchiveRecord", "RawArchive", "default_archive"]
@@ -0,0 +1,254 @@
+"""Append-only archive of raw source responses for offline re-parsing.
+
+Every raw job detail (and complete search result) a source receives can be
+appended here, so normalizer fixes and backfills can be replayed from disk
+with ``mcf reparse`` instead of going back to the API.
+
+Layout under the archive root::
+
+    {source_id}/{YYYYMMDDTHHMMSS}-{pid}.jsonl.zst   segments: concatenated zstd frames of JSON lines
+    index.tsv                                      one "source_id, kind, job_uuid, key" line per record
+
+Records are keyed by job UUID and the source's ``updatedAt`` (or a hash of
+the payload when the source has no such field); a key already in the index is
+not written again. Buffered records are written as one zstd frame per flush,
+so a crash loses at most the unflushed buffer and never corrupts earlier
+frames. Each process writes its own segments, and index lines are appended
+under an exclusive ``flock`` on ``index.tsv``, so concurrent writers (parallel
+crawls, the daemon and ``mcf reparse``) never interleave. File locking needs
+``fcntl`` (POSIX); elsewhere only writers within one process are serialised.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+import zstandard
+
+try:
+    import fcntl
+except ImportError:  # Windows — no cross-process index locking
+    fcntl = None  # type: ignore[assignment]
+
+ARCHIVE_DIR_ENV = "MCF_RAW_ARCHIVE_DIR"
+
+KIND_DETAIL = "detail"
+KIND_SEARCH = "search"
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    """One archived raw response."""
+
+    source_id: str
+    job_uuid: str
+    kind: str
+    """``"detail"`` or ``"search"``."""
+    updated_at: str | None
+    fetched_at: str
+    raw: dict
+
+
+def _record_key(updated_at: str | None, raw: dict) -> str:
+    if updated_at:
+        return updated_at
+    return "sha1:" + hashlib.sha1(json.dumps(raw, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class RawArchive:
+    """Thread-safe writer and reader for a raw-response archive directory."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        flush_every: int = 200,
+        segment_bytes: int = 64 * 1024 * 1024,
+        level: int = 10,
+    ) -> None:
+        self.root = Path(root)
+        self.flush_every = flush_every
+        self.segment_bytes = segment_bytes
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._lock = threading.Lock()
+        self._keys: set[tuple[str, str, str, str]] | None = None  # loaded lazily from index.tsv
+        self._buffers: dict[str, list[tuple[bytes, tuple[str, str, str, str]]]] = {}
+        self._segments: dict[str, Path] = {}
+
+    # --- writing ---
+
+    def contains(
+        self,
+        source_id: str,
+        job_uuid: str,
+        updated_at: str | None,
+        kind: str = KIND_DETAIL,
+        *,
+        raw: dict | None = None,
+    ) -> bool:
+        """Whether this version of the job is archived (a detail also covers its search result).
+
+        Sources without an ``updatedAt`` pass the payload as ``raw``; the
+        version is then its hash. Without either the answer is False.
+        """
+        if not updated_at and raw is None:
+            return False
+        version = _record_key(updated_at, raw or {})
+        with self._lock:
+            keys = self._load_keys()
+            if (source_id, KIND_DETAIL, job_uuid, version) in keys:
+                return True
+            return (source_id, kind, job_uuid, version) in keys
+
+    def append(
+        self,
+        *,
+        source_id: str,
+        job_uuid: str,
+        kind: str,
+        raw: dict,
+        updated_at: str | None = None,
+    ) -> bool:
+        """Buffer a raw response; return False if this version is already archived."""
+        key = (source_id, kind, job_uuid, _record_key(updated_at, raw))
+        with self._lock:
+            keys = self._load_keys()
+            if key in keys or (source_id, KIND_DETAIL, job_uuid, key[3]) in keys:
+                return False
+            keys.add(key)
+            line = json.dumps(
+                {
+                    "source_id": source_id,
+                    "job_uuid": job_uuid,
+                    "kind": kind,
+                    "updated_at": updated_at,
+                    "fetched_at": datetime.now(timezone.utc).isoformat(),
+                    "raw": raw,
+                },
+                separators=(",", ":"),
+            ).encode("utf-8")
+            buffer = self._buffers.setdefault(source_id, [])
+            buffer.append((line + b"\n", key))
+            if len(buffer) >= self.flush_every:
+                self._flush_source(source_id)
+        return True
+
+    def flush(self) -> None:
+        """Write all buffered records to disk."""
+        with self._lock:
+            for source_id in list(self._buffers):
+                self._flush_source(source_id)
+
+    close = flush
+
+    def _flush_source(self, source_id: str) -> None:
+        buffer = self._buffers.pop(source_id, [])
+        if not buffer:
+            return
+        segment = self._segment_for(source_id)
+        frame = self._compressor.compress(b"".join(line for line, _ in buffer))
+        with open(segment, "ab") as f:
+            f.write(frame)
+        # Index after the data, so the index never names a record that is not on disk.
+        with open(self.root / "index.tsv", "a", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)  # other processes append to the same index
+            try:
+                f.write("".join("\t".join(key) + "\n" for _, key in buffer))
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _segment_for(self, source_id: str) -> Path:
+        segment = self._segments.get(source_id)
+        if segment is None or (segment.exists() and segment.stat().st_size >= self.segment_bytes):
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            segment = self.root / source_id / f"{stamp}-{os.getpid()}.jsonl.zst"
+            segment.parent.mkdir(parents=True, exist_ok=True)
+            self._segments[source_id] = segment
+        return segment
+
+    def _load_keys(self) -> set[tuple[str, str, str, str]]:
+        if self._keys is None:
+            self._keys = set()
+            index = self.root / "index.tsv"
+            if index.exists():
+                with open(index, encoding="utf-8") as f:
+                    for line in f:
+                        parts = line.rstrip("\n").split("\t")
+                        if len(parts) == 4:
+                            self._keys.add(tuple(parts))  # type: ignore[arg-type]
+        return self._keys
+
+    # --- reading ---
+
+    def iter_records(self, source_id: str | None = None) -> Iterator[ArchiveRecord]:
+        """Yield every archived record, oldest segment first."""
+        source_dirs = [self.root / source_id] if source_id else sorted(p for p in self.root.glob("*") if p.is_dir())
+        for source_dir in source_dirs:
+            for segment in sorted(source_dir.glob("*.jsonl.zst")):
+                yield from _read_segment(segment)
+
+    def latest(self, source_id: str | None = None) -> dict[str, ArchiveRecord]:
+        """Return the newest record per job UUID (a detail wins over a search result of the same version)."""
+        latest: dict[str, ArchiveRecord] = {}
+        for record in self.iter_records(source_id):
+            current = latest.get(record.job_uuid)
+            if current is None or _recency(record) >= _recency(current):
+                latest[record.job_uuid] = record
+        return latest
+
+
+def _recency(record: ArchiveRecord) -> tuple[str, bool, str]:
+    return (record.updated_at or "", record.kind == KIND_DETAIL, record.fetched_at)
+
+
+def _read_segment(segment: Path) -> Iterator[ArchiveRecord]:
+    with open(segment, "rb") as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        try:
+            for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                if not line.strip():
+                    continue
+                d = json.loads(line)
+                yield ArchiveRecord(
+                    source_id=d["source_id"],
+                    job_uuid=d["job_uuid"],
+                    kind=d["kind"],
+                    updated_at=d.get("updated_at"),
+                    fetched_at=d["fetched_at"],
+                    raw=d["raw"],
+                )
+        except (zstandard.ZstdError, json.JSONDecodeError) as e:
+            # A frame cut short by a crash; everything before it is intact.
+            print(f"Warning: stopped reading truncated archive segment {segment}: {e}")
+
+
+_default: RawArchive | None = None
+_default_lock = threading.Lock()
+
+
+def default_archive() -> RawArchive | None:
+    """Return the process-wide archive at ``$MCF_RAW_ARCHIVE_DIR``, or None if unset.
+
+    Buffered records are flushed at interpreter exit.
+    """
+    global _default
+    root = os.getenv(ARCHIVE_DIR_ENV)
+    if not root:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = RawArchive(root)
+            atexit.register(_default.flush)
+        return _default
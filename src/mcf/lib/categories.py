@@ -45,3 +45,17 @@ CATEGORIES: list[str] = [
     "Travel / Tourism",
     "Wholesale Trade",
 ]
+
+# Position levels (the ``positionLevels`` search filter); used to split a
+# category whose listing would exceed the search API's 10,000-result cap.
+POSITION_LEVELS: list[str] = [
+    "Fresh/entry level",
+    "Non-executive",
+    "Junior Executive",
+    "Executive",
+    "Senior Executive",
+    "Manager",
+    "Middle Management",
+    "Senior Management",
+    "Professional",
+]
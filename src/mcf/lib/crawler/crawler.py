@@ -1,11 +1,15 @@
 """Crawler for listing job UUIDs from MyCareersFuture."""
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Protocol, Sequence
 
 from mcf.lib.api.client import MCFClient
+from mcf.lib.api.rate_limit import TokenBucket
 from mcf.lib.categories import CATEGORIES
+from mcf.lib.models.models import Job
 
 
 @dataclass
@@ -59,6 +63,44 @@ class CrawlProgress:
 
 type ProgressCallback = Callable[[CrawlProgress], None]
 
+SEARCH_RESULT_CAP = 10000
+"""The search API never pages past this many results for one query."""
+
+PARTITION_SEP = "|"
+"""Separates category and position level in a partition (``"Engineering|Manager"``)."""
+
+
+def split_partition(partition: str) -> tuple[str, str | None]:
+    """Split ``"Category"`` or ``"Category|Position level"`` into (category, level or None)."""
+    category, _, level = partition.partition(PARTITION_SEP)
+    return category, level or None
+
+
+class ListingCheckpoint(Protocol):
+    """Persisted listing progress, so an interrupted listing can resume."""
+
+    def listed(self) -> dict[str, str | None]:
+        """UUIDs already listed by earlier attempts, with their ``updatedAt`` watermark."""
+        ...
+
+    def category_cursor(self, category: str) -> tuple[int, bool]:
+        """Return ``(next_page, done)`` for a category (``(0, False)`` if never started)."""
+        ...
+
+    def record_page(
+        self, category: str, next_page: int, done: bool, new_ids: Sequence[tuple[str, str | None]]
+    ) -> None:
+        """Record a completed page and the ``(uuid, watermark)`` pairs it newly contributed."""
+        ...
+
+    def truncated(self) -> set[str]:
+        """Categories an earlier attempt found over ``SEARCH_RESULT_CAP``."""
+        ...
+
+    def record_truncated(self, category: str) -> None:
+        """Remember that ``category`` cannot be listed completely."""
+        ...
+
 
 @dataclass
 class Crawler:
@@ -67,89 +109,155 @@ class Crawler:
     rate_limit: float = 5.0
     """API requests per second."""
 
+    limiter: TokenBucket | None = None
+    """Shared rate limiter; overrides ``rate_limit`` when set."""
+
+    max_workers: int = 4
+    """Categories paged concurrently (all share one rate budget)."""
+
     def list_job_uuids_all_categories(
         self,
         *,
         categories: list[str] | None = None,
         limit: int | None = None,
         on_progress: ProgressCallback | None = None,
+        known: set[str] | None = None,
+        checkpoint: ListingCheckpoint | None = None,
+        watermarks: dict[str, str] | None = None,
+        on_results: Callable[[list[Job]], None] | None = None,
+        truncated: set[str] | None = None,
     ) -> list[str]:
         """List job UUIDs without fetching job detail.
 
         This is the key primitive for incremental crawling: we can diff UUID sets
         against a database to decide which jobs need `get_job_detail()`.
+
+        Up to ``max_workers`` categories are paged at once. Each category's total
+        comes from its first real page, so there is no separate counting pass;
+        the progress total grows as categories report in.
+
+        Delta mode: when ``known`` is given, a category stops paging at the first
+        page whose UUIDs are all in ``known``. Results are sorted by posting date,
+        so everything after that page is already known too. The returned list is
+        then only the head of each category, not the full universe.
+
+        With a ``checkpoint``, every completed page is recorded and paging
+        resumes from the saved per-category cursor; finished categories are
+        skipped. An interrupt (Ctrl-C) is re-raised rather than returning a
+        partial list that would look like the full universe.
+
+        If ``watermarks`` is given it is filled with ``uuid -> metadata.updatedAt``
+        from the search results, so callers can spot jobs edited since their
+        last fetch without requesting the detail.
+
+        ``on_results`` receives each page's newly seen search results (full
+        ``Job`` models), e.g. to ingest them without a detail call per job.
+
+        ``categories`` may also hold partitions, ``"Category|Position level"``
+        (see :mod:`mcf.lib.crawler.shards`). A category or partition with more
+        than ``SEARCH_RESULT_CAP`` results cannot be listed completely; it is
+        reported with a warning and, if ``truncated`` is given, added to it.
+        The checkpoint keeps these too, so categories an earlier attempt
+        finished are still reported as truncated on resume.
         """
-        fetched_count = 0
+        cats = categories if categories is not None else CATEGORIES
         start_time = time.monotonic()
-        uuids: list[str] = []
-        seen: set[str] = set()
+        listed_before = checkpoint.listed() if checkpoint else {}
+        uuids: list[str] = list(listed_before)
+        seen: set[str] = set(uuids)
+        if watermarks is not None:
+            watermarks.update((u, w) for u, w in listed_before.items() if w)
+        if truncated is not None and checkpoint:
+            truncated.update(checkpoint.truncated())
+        category_totals: dict[str, int] = {}
+        lock = threading.Lock()
+        stop = threading.Event()
+        client = MCFClient(rate_limit=self.rate_limit, limiter=self.limiter)
 
-        try:
-            client = MCFClient(rate_limit=self.rate_limit)
-
-            # If categories are provided, list within them; else list across all categories
-            cats = categories if categories is not None else CATEGORIES
-
-            # Estimate total (sum of per-category totals) for progress/ETA.
-            category_counts: list[tuple[str, int]] = []
-            for cat in cats:
-                resp = client.search_jobs(limit=1, categories=[cat])
-                category_counts.append((cat, resp.total))
-            estimated_total = sum(c for _, c in category_counts)
-            if limit:
-                estimated_total = min(estimated_total, limit)
-
-            total_categories = len(category_counts)
-            for cat_idx, (category, cat_total) in enumerate(category_counts, 1):
-                if cat_total == 0:
-                    continue
-                page = 0
-                page_size = 100
-                cat_fetched = 0
-                while True:
-                    resp = client.search_jobs(
-                        page=page,
-                        limit=page_size,
-                        categories=[category],
-                        sort_by_date=True,
-                    )
-                    if not resp.results:
-                        break
+        def _estimated_total() -> int:
+            total = sum(category_totals.values())
+            return min(total, limit) if limit else total
+
+        def _list_category(cat_idx: int, category: str) -> None:
+            page, done = checkpoint.category_cursor(category) if checkpoint else (0, False)
+            if done:
+                return
+            page_size = 100
+            cat_fetched = 0
+            search_category, position_level = split_partition(category)
+            while not stop.is_set():
+                resp = client.search_jobs(
+                    page=page,
+                    limit=page_size,
+                    categories=[search_category],
+                    position_levels=[position_level] if position_level else None,
+                    sort_by_date=True,
+                )
+                with lock:
+                    if category not in category_totals and resp.total > SEARCH_RESULT_CAP and known is None:
+                        print(
+                            f"Warning: {category!r} has {resp.total:,} jobs; only the newest "
+                            f"{SEARCH_RESULT_CAP:,} can be listed (plan shards to split it)"
+                        )
+                        if truncated is not None:
+                            truncated.add(category)
+                        if checkpoint:
+                            checkpoint.record_truncated(category)
+                    category_totals[category] = resp.total
+                    new_ids: list[tuple[str, str | None]] = []
+                    new_jobs: list[Job] = []
                     for job in resp.results:
                         if job.uuid in seen:
                             continue
                         seen.add(job.uuid)
                         uuids.append(job.uuid)
-                        fetched_count += 1
+                        updated_at = job.metadata.updatedAt if job.metadata else None
+                        if watermarks is not None and updated_at:
+                            watermarks[job.uuid] = updated_at
+                        new_ids.append((job.uuid, updated_at))
+                        new_jobs.append(job)
                         cat_fetched += 1
 
                         if on_progress:
-                            elapsed = time.monotonic() - start_time
                             on_progress(
                                 CrawlProgress(
-                                    total_jobs=estimated_total,
-                                    fetched=fetched_count,
-                                    elapsed=elapsed,
+                                    total_jobs=_estimated_total(),
+                                    fetched=len(uuids),
+                                    elapsed=time.monotonic() - start_time,
                                     current_category=category,
                                     category_index=cat_idx,
-                                    total_categories=total_categories,
+                                    total_categories=len(cats),
                                     category_fetched=cat_fetched,
-                                    category_total=cat_total,
+                                    category_total=resp.total,
                                 )
                             )
-                        if limit and fetched_count >= limit:
+                        if limit and len(uuids) >= limit:
+                            stop.set()
                             break
-                    if limit and fetched_count >= limit:
-                        break
-                    if (page + 1) * page_size >= resp.total:
-                        break
-                    if (page + 1) * page_size >= 10000:
-                        break
-                    page += 1
-                if limit and fetched_count >= limit:
+                    last_page = (
+                        not resp.results
+                        or (known is not None and all(job.uuid in known for job in resp.results))
+                        or (page + 1) * page_size >= resp.total
+                        or (page + 1) * page_size >= SEARCH_RESULT_CAP
+                    )
+                    if on_results and new_jobs:
+                        on_results(new_jobs)
+                    if checkpoint:
+                        checkpoint.record_page(category, page + 1, last_page, new_ids)
+                if last_page:
                     break
-            client.close()
-            return uuids
-        except KeyboardInterrupt:
-            return uuids
+                page += 1
 
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="list")
+        try:
+            futures = [
+                executor.submit(_list_category, cat_idx, category)
+                for cat_idx, category in enumerate(cats, 1)
+            ]
+            for future in as_completed(futures):
+                future.result()
+            return uuids[:limit] if limit else uuids
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            client.close()
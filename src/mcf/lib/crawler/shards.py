@@ -0,0 +1,81 @@
+"""Balanced shard plans for splitting one full MCF crawl across runners.
+
+A full crawl can be split into N shards that run in parallel (e.g. a GitHub
+Actions matrix). Splitting the category list by count leaves shards very
+uneven, because a few categories hold most of the jobs. Instead
+:func:`partition_totals` asks the search API for the size of every category
+(one ``limit=1`` request each) and :func:`plan_shards` assigns them greedily,
+largest first, to the lightest shard.
+
+A category above the search API's 10,000-result cap cannot be listed in one
+query, so it is split into one partition per position level
+(``"Category|Position level"``, understood by the crawler). Such a split
+category is never proven complete: a job may carry several levels (so the level
+totals over-count) or none (so no partition lists it), and a level can itself
+exceed the cap. Its jobs therefore cannot be told apart from removed ones, and
+an epoch only removes jobs that belong to at least one category listed unsplit.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Mapping, Sequence
+
+from mcf.lib.api.client import MCFClient
+from mcf.lib.categories import CATEGORIES, POSITION_LEVELS
+from mcf.lib.crawler.crawler import PARTITION_SEP, SEARCH_RESULT_CAP
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One shard of a crawl plan: the partitions one runner lists."""
+
+    index: int
+    partitions: tuple[str, ...]
+    estimated_jobs: int
+
+
+@dataclass(frozen=True)
+class PartitionTotals:
+    """Job count per listable partition, as measured by :func:`partition_totals`."""
+
+    totals: dict[str, int]
+    split: list[str] = field(default_factory=list)
+    """Categories over the cap, listed by position level instead (see module docstring)."""
+
+
+def partition_totals(
+    client: MCFClient,
+    categories: Sequence[str] | None = None,
+    *,
+    cap: int = SEARCH_RESULT_CAP,
+) -> PartitionTotals:
+    """Measure every category, splitting those over ``cap`` by position level."""
+    totals: dict[str, int] = {}
+    split: list[str] = []
+    for category in categories or CATEGORIES:
+        total = client.search_jobs(limit=1, categories=[category]).total
+        if total <= cap:
+            totals[category] = total
+            continue
+        split.append(category)
+        for level in POSITION_LEVELS:
+            partition = f"{category}{PARTITION_SEP}{level}"
+            level_total = client.search_jobs(limit=1, categories=[category], position_levels=[level]).total
+            if level_total:
+                totals[partition] = level_total
+    return PartitionTotals(totals=totals, split=split)
+
+
+def plan_shards(totals: Mapping[str, int], n: int) -> list[Shard]:
+    """Assign partitions to ``n`` shards with balanced job counts (largest first)."""
+    n = max(1, n)
+    heap = [(0, i) for i in range(n)]
+    assigned: list[list[str]] = [[] for _ in range(n)]
+    for partition, total in sorted(totals.items(), key=lambda kv: (-kv[1], kv[0])):
+        load, i = heapq.heappop(heap)
+        assigned[i].append(partition)
+        heapq.heappush(heap, (load + total, i))
+    loads = dict((i, load) for load, i in heap)
+    return [Shard(index=i, partitions=tuple(assigned[i]), estimated_jobs=loads[i]) for i in range(n)]
@@ -1,6 +1,7 @@
 """Embeddings and matching utilities."""
 
 from mcf.lib.embeddings.base import EmbedderProtocol
-from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig
+from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig, create_embedder
+from mcf.lib.embeddings.registry import get_embedder
 
-__all__ = ["EmbedderProtocol", "Embedder", "EmbedderConfig"]
+__all__ = ["EmbedderProtocol", "Embedder", "EmbedderConfig", "create_embedder", "get_embedder"]
@@ -0,0 +1,95 @@
+"""Embedding throughput and memory benchmark across embedder backends.
+
+:func:`benchmark_embedder` loads one :class:`EmbedderConfig` in a fresh
+(spawned) process, encodes the texts once to warm up and once timed, and
+reports texts/sec, ms per text, model load time and the process's peak
+resident memory. A fresh process per backend keeps the memory numbers honest:
+the onnx backend never imports torch. Used by ``mcf benchmark-embedder``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence
+
+from mcf.lib.embeddings.embedder import EmbedderConfig, create_embedder
+
+SAMPLE_TEXTS = (
+    "Software Engineer (Backend). Design, build and operate Python and Go services "
+    "behind our payments platform. Requirements: 3+ years with PostgreSQL, Kafka, "
+    "Kubernetes and AWS; experience with observability and on-call rotations.",
+    "Staff Nurse, Emergency Department. Provide direct patient care, triage walk-in "
+    "and ambulance cases and support doctors during resuscitations. Registered with "
+    "the Singapore Nursing Board, BCLS and ACLS certified, rotating shifts.",
+    "Accounts Executive. Full set of accounts, monthly closing, GST filing, bank "
+    "reconciliation and audit schedules. Diploma in Accountancy, Xero or SAP B1.",
+    "Retail Assistant. Serve customers, handle the cashier and keep the shop tidy. "
+    "Weekend and public holiday shifts; no experience needed, training provided.",
+    "Data Scientist. Build demand-forecasting and pricing models, run A/B tests and "
+    "present findings to product teams. Python, SQL, scikit-learn, PyTorch; a "
+    "master's degree in a quantitative field preferred. "
+    + "You will own models end to end, from feature pipelines and offline evaluation "
+    "to deployment, monitoring and retraining, and mentor junior analysts. " * 12,
+    "Site Supervisor (Civil & Structural). Supervise subcontractors, enforce WSH "
+    "requirements, prepare daily reports and coordinate inspections with the QP.",
+)
+
+
+def sample_texts(n: int) -> list[str]:
+    """``n`` job-like texts of mixed length (the samples, numbered so none repeat)."""
+    return [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} (posting {i})" for i in range(n)]
+
+
+def backend_label(config: EmbedderConfig) -> str:
+    """``torch``, ``onnx`` or ``onnx-int8``."""
+    return "onnx-int8" if config.backend == "onnx" and config.quantize else config.backend
+
+
+@dataclass(frozen=True)
+class EmbedderBenchmarkResult:
+    label: str
+    texts: int
+    load_seconds: float
+    seconds: float
+    texts_per_sec: float
+    ms_per_text: float
+    peak_rss_mb: float
+    """Peak resident memory of the benchmark process (model loaded and used)."""
+
+
+def benchmark_embedder(config: EmbedderConfig, texts: Sequence[str]) -> EmbedderBenchmarkResult:
+    """Benchmark ``config`` on ``texts`` in a fresh process (no embeddings cache)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_run_benchmark, config, list(texts)).result()
+
+
+def _run_benchmark(config: EmbedderConfig, texts: list[str]) -> EmbedderBenchmarkResult:
+    start = time.perf_counter()
+    embedder = create_embedder(config)
+    load_seconds = time.perf_counter() - start
+
+    embedder._encode(texts[: config.batch_size])  # warm-up (lazy init, allocator)
+    start = time.perf_counter()
+    embedder._encode(texts)
+    seconds = time.perf_counter() - start
+    return EmbedderBenchmarkResult(
+        label=backend_label(config),
+        texts=len(texts),
+        load_seconds=round(load_seconds, 2),
+        seconds=round(seconds, 3),
+        texts_per_sec=round(len(texts) / seconds, 1) if seconds else 0.0,
+        ms_per_text=round(seconds * 1000 / len(texts), 2) if texts else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def _peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import copy
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Sequence
 
 import numpy as np
 
@@ -15,6 +18,11 @@ if TYPE_CHECKING:
 # do NOT get this prefix.  See: https://huggingface.co/BAAI/bge-small-en-v1.5
 _BGE_QUERY_PREFIX = "Represent this resume for job search: "
 
+BACKEND_ENV = "EMBEDDER_BACKEND"
+ONNX_DIR_ENV = "EMBEDDER_ONNX_DIR"
+ONNX_QUANTIZE_ENV = "EMBEDDER_ONNX_QUANTIZE"
+BACKENDS = ("torch", "onnx")
+
 
 @dataclass(frozen=True)
 class EmbedderConfig:
@@ -24,7 +32,67 @@ class EmbedderConfig:
     #   • asymmetric query/passage design  → better for job matching
     #   • MTEB retrieval NDCG@10: 53.3 vs 51.7 for small (~3% improvement)
     model_name: str = "BAAI/bge-base-en-v1.5"
+    # Most texts per model batch.
     batch_size: int = 32
+    # Token budget per model batch (rows x padded length). Texts are sorted by
+    # token length and packed up to this budget (and batch_size), so short texts
+    # run in large batches and are not padded to a long neighbour.
+    # Default: batch_size x 512.
+    max_batch_tokens: int = 16384
+    # "torch" runs the model with sentence-transformers; "onnx" runs a graph
+    # exported by `mcf export-onnx` on ONNX Runtime (no torch import, several
+    # times less memory). Default: $EMBEDDER_BACKEND, else "torch".
+    backend: str = field(default_factory=lambda: os.getenv(BACKEND_ENV, "torch"))
+    # Export directory for the onnx backend (default: data/onnx/<model>).
+    onnx_dir: str | None = field(default_factory=lambda: os.getenv(ONNX_DIR_ENV) or None)
+    # Use the int8 dynamically quantized graph (onnx backend only).
+    quantize: bool = field(
+        default_factory=lambda: os.getenv(ONNX_QUANTIZE_ENV, "1") in ("1", "true", "yes")
+    )
+
+
+def token_budget_batches(
+    lengths: Sequence[int], max_tokens: int, max_texts: int | None = None
+) -> list[list[int]]:
+    """Group indices of texts with token ``lengths`` into batches, longest first.
+
+    Each batch holds texts of similar length, at most ``max_tokens`` tokens
+    once padded to its longest text and at most ``max_texts`` texts (but
+    always at least one text).
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches: list[list[int]] = []
+    current: list[int] = []
+    for i in order:
+        # Sorted longest first, so the batch's first text sets its padded length.
+        full = max_texts is not None and len(current) >= max_texts
+        if current and (full or (len(current) + 1) * max(lengths[current[0]], 1) > max_tokens):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def estimate_token_length(text: str, max_length: int = 512) -> int:
+    """Rough token count (~4 characters per token, plus special tokens) when no tokenizer is loaded."""
+    return min(max_length, len(text) // 4 + 2)
+
+
+def create_embedder(
+    config: EmbedderConfig | None = None,
+    embeddings_cache: EmbeddingsCache | None = None,
+) -> Embedder:
+    """Embedder for ``config.backend``: :class:`Embedder` or :class:`~mcf.lib.embeddings.onnx_embedder.OnnxEmbedder`."""
+    config = config or EmbedderConfig()
+    if config.backend == "onnx":
+        from mcf.lib.embeddings.onnx_embedder import OnnxEmbedder
+
+        return OnnxEmbedder(config, embeddings_cache=embeddings_cache)
+    if config.backend != "torch":
+        raise ValueError(f"Unknown embedder backend {config.backend!r} (expected one of {', '.join(BACKENDS)})")
+    return Embedder(config, embeddings_cache=embeddings_cache)
 
 
 class Embedder:
@@ -45,6 +113,7 @@ class Embedder:
     ) -> None:
         self.config = config or EmbedderConfig()
         self._embeddings_cache = embeddings_cache
+        self._encode_lock = threading.Lock()
         # Import lazily so the base crawler can run without embedding deps installed.
         from sentence_transformers import SentenceTransformer  # type: ignore
 
@@ -54,45 +123,82 @@ class Embedder:
     def model_name(self) -> str:
         return self.config.model_name
 
+    def with_cache(self, embeddings_cache: EmbeddingsCache | None) -> Embedder:
+        """This embedder, sharing its loaded model, reading and writing ``embeddings_cache``."""
+        bound = copy.copy(self)
+        bound._embeddings_cache = embeddings_cache
+        return bound
+
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         """Embed a list of passage texts (job descriptions).  No prefix added."""
         cache = self._embeddings_cache
         model = self.model_name
 
         if not cache:
-            vectors = self._model.encode(
-                texts,
-                batch_size=self.config.batch_size,
-                normalize_embeddings=True,
-                show_progress_bar=False,
-            )
-            return [v.tolist() for v in vectors]
+            return self._encode(texts)
 
-        out: list[list[float]] = []
-        to_compute: list[tuple[int, str]] = []
-        for i, text in enumerate(texts):
-            cached = cache.get(text, model, "passage")
-            if cached is not None:
-                out.append(cached)
-            else:
-                out.append([])  # placeholder
-                to_compute.append((i, text))
+        cached = cache.get_many(texts, model, "passage")
+        to_compute = [i for i, emb in enumerate(cached) if emb is None]
+        out: list[list[float]] = [emb if emb is not None else [] for emb in cached]
 
         if to_compute:
-            compute_texts = [t for _, t in to_compute]
-            vectors = self._model.encode(
-                compute_texts,
-                batch_size=self.config.batch_size,
-                normalize_embeddings=True,
-                show_progress_bar=False,
-            )
-            for (idx, text), vec in zip(to_compute, vectors):
-                emb = vec.tolist()
-                cache.set(text, model, "passage", emb)
-                out[idx] = emb
+            vectors = self._encode([texts[i] for i in to_compute])
+            for i, emb in zip(to_compute, vectors):
+                out[i] = emb
+            cache.set_many([(texts[i], out[i]) for i in to_compute], model, "passage")
+
+        return out
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        """Run the model on ``texts`` (no cache, no prefix).
 
+        Texts are encoded in token-budget batches of similar length (see
+        :func:`token_budget_batches`) and returned in input order. One call runs
+        at a time per model (and its :meth:`with_cache` views): the fast
+        tokenizers are not safe to drive from several threads, and a forward
+        pass already uses every core.
+        """
+        if not texts:
+            return []
+        with self._encode_lock:
+            batches = token_budget_batches(
+                self._token_lengths(texts), self.config.max_batch_tokens, self._max_batch_texts(len(texts))
+            )
+            encoded = self._encode_batches([[texts[i] for i in b] for b in batches])
+        out: list[list[float]] = [[] for _ in texts]
+        for batch, vectors in zip(batches, encoded):
+            for i, vector in zip(batch, vectors):
+                out[i] = vector
         return out
 
+    def _max_batch_texts(self, n_texts: int) -> int:
+        """Most texts per model batch when encoding ``n_texts`` texts."""
+        return max(1, self.config.batch_size)
+
+    def _encode_batches(self, batches: list[list[str]]) -> list[list[list[float]]]:
+        return [self._encode_batch(batch).tolist() for batch in batches]
+
+    def _token_lengths(self, texts: list[str]) -> list[int]:
+        """Token count of each text after truncation, including special tokens."""
+        encoded = self._model.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self._model.max_seq_length,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        """Encode one batch of similar-length texts as L2-normalised vectors."""
+        return self._model.encode(
+            texts,
+            batch_size=len(texts),
+            normalize_embeddings=True,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
+
     def embed_text(self, text: str) -> list[float]:
         """Embed a single passage text (job description side)."""
         return self.embed_texts([text])[0]
@@ -104,27 +210,32 @@ class Embedder:
         instruction prefix while passages do not.  Using this method for resumes
         and ``embed_text`` for job descriptions gives the best retrieval quality.
         """
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embed query texts as one batch: one cache lookup, one encode for the misses."""
         cache = self._embeddings_cache
         model = self.model_name
-        if cache:
-            cached = cache.get(text, model, "query")
-            if cached is not None:
-                return cached
+        cached = cache.get_many(texts, model, "query") if cache else [None] * len(texts)
+        to_compute = [i for i, emb in enumerate(cached) if emb is None]
+        out: list[list[float]] = [emb if emb is not None else [] for emb in cached]
 
-        is_bge = "bge" in model.lower()
-        query = (_BGE_QUERY_PREFIX + text) if is_bge else text
-        result = self.embed_texts([query])[0]
-
-        if cache:
-            cache.set(text, model, "query", result)
-        return result
+        if to_compute:
+            prefix = _BGE_QUERY_PREFIX if "bge" in model.lower() else ""
+            vectors = self._encode([prefix + texts[i] for i in to_compute])
+            for i, emb in zip(to_compute, vectors):
+                out[i] = emb
+            if cache:
+                cache.set_many([(texts[i], out[i]) for i in to_compute], model, "query")
+        return out
 
     def embed_resume(self, text: str, chunk_size: int = 400, overlap: int = 80) -> list[float]:
         """Embed resume text, chunking if long to avoid BGE 512-token truncation.
 
-        For short resumes (≤ chunk_size tokens approx) this is a single embed_query.
-        For longer resumes, splits into overlapping chunks, embeds each, then
-        L2-normalizes the mean of chunk embeddings.
+        Resumes of at most ``chunk_size`` tokens are a single embed_query. Longer
+        ones are split into windows of ``chunk_size`` tokens overlapping by
+        ``overlap`` (see :meth:`resume_chunks`), embedded in one batch, and the
+        L2-normalized mean of the chunk embeddings is returned.
         """
         cache = self._embeddings_cache
         model = self.model_name
@@ -133,34 +244,59 @@ class Embedder:
             if cached is not None:
                 return cached
 
-        words = text.split()
-        # ~0.75 words per token; chunk_size tokens ≈ chunk_size * 4/3 words
-        max_words = int(chunk_size * 4 / 3)
-        overlap_words = int(overlap * 4 / 3)
-
-        if len(words) <= max_words:
-            result = self.embed_query(text)
-            if cache:
-                cache.set(text, model, "resume", result)
-            return result
-
-        chunks: list[str] = []
-        start = 0
-        while start < len(words):
-            end = min(start + max_words, len(words))
-            chunks.append(" ".join(words[start:end]))
-            if end >= len(words):
-                break
-            start = end - overlap_words
-
-        embeddings = [self.embed_query(c) for c in chunks]
-        mean_vec = np.array(embeddings, dtype=np.float32).mean(axis=0)
-        norm = float(np.linalg.norm(mean_vec))
-        if norm > 0:
-            mean_vec = mean_vec / norm
-        result = mean_vec.tolist()
+        chunks = self.resume_chunks(text, chunk_size, overlap)
+        embeddings = self.embed_queries(chunks)
+        if len(embeddings) == 1:
+            result = embeddings[0]
+        else:
+            mean_vec = np.array(embeddings, dtype=np.float32).mean(axis=0)
+            norm = float(np.linalg.norm(mean_vec))
+            if norm > 0:
+                mean_vec = mean_vec / norm
+            result = mean_vec.tolist()
 
         if cache:
             cache.set(text, model, "resume", result)
         return result
 
+    def resume_chunks(self, text: str, chunk_size: int = 400, overlap: int = 80) -> list[str]:
+        """Split ``text`` into windows of ``chunk_size`` model tokens overlapping by ``overlap``.
+
+        Chunks are slices of ``text`` cut at token boundaries, so they keep its
+        formatting. Without a tokenizer (:meth:`_token_offsets` returns None)
+        the sizes are estimated from words (~0.75 words per token).
+        """
+        step = max(1, chunk_size - overlap)
+        offsets = self._token_offsets(text)
+        if offsets is None:
+            words = text.split()
+            max_words = int(chunk_size * 4 / 3)
+            step_words = max(1, max_words - int(overlap * 4 / 3))
+            if len(words) <= max_words:
+                return [text]
+            return [
+                " ".join(words[start : start + max_words])
+                for start in range(0, len(words) - max_words + step_words, step_words)
+            ]
+
+        if len(offsets) <= chunk_size:
+            return [text]
+        return [
+            text[offsets[start][0] : offsets[min(start + chunk_size, len(offsets)) - 1][1]]
+            for start in range(0, len(offsets) - chunk_size + step, step)
+        ]
+
+    def _token_offsets(self, text: str) -> list[tuple[int, int]] | None:
+        """Character span of each model token in ``text`` (no special tokens, no truncation)."""
+        with self._encode_lock:  # the fast tokenizer's truncation setting is shared state
+            encoded = self._model.tokenizer(
+                text,
+                add_special_tokens=False,
+                truncation=False,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                return_token_type_ids=False,
+                verbose=False,
+            )
+        return [tuple(span) for span in encoded["offset_mapping"]]
+
@@ -4,6 +4,7 @@ Cache key: content_hash(text) + model_name + embed_type (query|passage|resume).
 TTL: indefinite (embeddings are deterministic for same input).
 
 Backends: in-memory LRU (default) or embeddings_cache DB table.
+Batches go through get_many/set_many: one DB query per batch, not per text.
 """
 
 from __future__ import annotations
@@ -11,7 +12,7 @@ from __future__ import annotations
 import hashlib
 import logging
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Sequence
 
 if TYPE_CHECKING:
     from mcf.lib.storage.base import Storage
@@ -88,6 +89,62 @@ class EmbeddingsCache:
             except Exception as e:
                 logger.warning("embeddings_cache DB set failed: %s", e)
 
+    def get_many(
+        self, texts: Sequence[str], model_name: str, embed_type: str
+    ) -> list[list[float] | None]:
+        """Cached embedding (or None) for each text; LRU misses share one DB query."""
+        hashes = [content_hash(text) for text in texts]
+        out: list[list[float] | None] = [None] * len(texts)
+        misses: list[int] = []
+        for i, ch in enumerate(hashes):
+            key = _cache_key(ch, model_name, embed_type)
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                out[i] = self._lru[key]
+            else:
+                misses.append(i)
+
+        if misses and self._store:
+            if hasattr(self._store, "get_embeddings_by_content_hashes"):
+                try:
+                    found = self._store.get_embeddings_by_content_hashes(
+                        [hashes[i] for i in misses],
+                        model_name=model_name,
+                        embed_type=embed_type,
+                    )
+                except Exception as e:
+                    logger.warning("embeddings_cache DB get_many failed: %s", e)
+                    found = {}
+                for i in misses:
+                    emb = found.get(hashes[i])
+                    if emb is not None:
+                        self._set_lru(_cache_key(hashes[i], model_name, embed_type), emb)
+                        out[i] = emb
+            else:
+                for i in misses:
+                    out[i] = self.get(texts[i], model_name, embed_type)
+        return out
+
+    def set_many(
+        self, items: Sequence[tuple[str, list[float]]], model_name: str, embed_type: str
+    ) -> None:
+        """Store ``(text, embedding)`` pairs; one DB write for the batch."""
+        if not items:
+            return
+        if self._store and not hasattr(self._store, "upsert_embeddings_cache"):
+            for text, embedding in items:
+                self.set(text, model_name, embed_type, embedding)
+            return
+
+        hashed = [(content_hash(text), embedding) for text, embedding in items]
+        for ch, embedding in hashed:
+            self._set_lru(_cache_key(ch, model_name, embed_type), embedding)
+        if self._store:
+            try:
+                self._store.upsert_embeddings_cache(hashed, model_name=model_name, embed_type=embed_type)
+            except Exception as e:
+                logger.warning("embeddings_cache DB set_many failed: %s", e)
+
     def _set_lru(self, key: str, embedding: list[float]) -> None:
         if key in self._lru:
             self._lru.move_to_end(key)
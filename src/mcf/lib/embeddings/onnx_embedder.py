@@ -0,0 +1,253 @@
+"""ONNX Runtime embedder backend (``EmbedderConfig(backend="onnx")``).
+
+:func:`export_onnx` (``mcf export-onnx``) exports the sentence-transformers
+model's transformer to an ONNX graph once, next to its fast tokenizer and the
+pooling settings, and adds an int8 dynamically quantized copy.
+:class:`OnnxEmbedder` then embeds with ONNX Runtime and ``tokenizers`` only:
+torch is never imported, so the API and crawl processes load in a fraction of
+the memory, and the quantized graph encodes several times faster on CPU.
+
+Vectors stay comparable with the PyTorch ones, so they are stored under the
+same ``model_name`` and existing embeddings need no re-embed.
+:func:`check_parity` measures that (cosine similarity against the PyTorch
+model on sample texts) and ``mcf export-onnx`` refuses an export that falls
+below :data:`PARITY_THRESHOLD`.
+
+Needs the ``onnx`` extra (``onnxruntime``, ``onnx``); exporting also needs
+torch, which the default install already has.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig
+
+if TYPE_CHECKING:
+    from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
+
+DEFAULT_ONNX_ROOT = Path("data/onnx")
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+METADATA_FILE = "mcf_onnx.json"
+
+PARITY_THRESHOLD = 0.99
+"""Minimum per-text cosine similarity between ONNX and PyTorch vectors."""
+
+
+def default_onnx_dir(model_name: str) -> Path:
+    """``data/onnx/<model>`` with ``/`` in the model name replaced by ``--``."""
+    return DEFAULT_ONNX_ROOT / model_name.replace("/", "--")
+
+
+def onnx_dir_for(config: EmbedderConfig) -> Path:
+    return Path(config.onnx_dir) if config.onnx_dir else default_onnx_dir(config.model_name)
+
+
+class OnnxEmbedder(Embedder):
+    """:class:`Embedder` that runs an exported ONNX graph on ONNX Runtime.
+
+    Same interface, query prefix, resume chunking and cache behaviour as
+    :class:`Embedder`; only the encoding differs.
+    """
+
+    def __init__(
+        self,
+        config: EmbedderConfig | None = None,
+        embeddings_cache: EmbeddingsCache | None = None,
+    ) -> None:
+        self.config = config or EmbedderConfig(backend="onnx")
+        self._embeddings_cache = embeddings_cache
+        self._encode_lock = threading.Lock()
+        import onnxruntime as ort  # type: ignore
+        from tokenizers import Tokenizer  # type: ignore
+
+        model_dir = onnx_dir_for(self.config)
+        metadata_path = model_dir / METADATA_FILE
+        if not metadata_path.exists():
+            raise FileNotFoundError(
+                f"No ONNX export in {model_dir}; run `mcf export-onnx --model {self.config.model_name}`"
+            )
+        self.metadata = json.loads(metadata_path.read_text())
+        if self.metadata["model_name"] != self.config.model_name:
+            raise ValueError(
+                f"{model_dir} holds an export of {self.metadata['model_name']!r}, not {self.config.model_name!r}"
+            )
+        model_path = model_dir / (QUANTIZED_MODEL_FILE if self.config.quantize else MODEL_FILE)
+        if not model_path.exists():
+            raise FileNotFoundError(f"{model_path} not found; re-run `mcf export-onnx`")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+        # Untruncated, unpadded copy for sizing resume chunks.
+        self._chunk_tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self._chunk_tokenizer.no_truncation()
+        self._chunk_tokenizer.no_padding()
+        self._tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self._tokenizer.enable_truncation(max_length=self.metadata["max_seq_length"])
+        self._tokenizer.enable_padding(
+            pad_id=self.metadata["pad_token_id"], pad_token=self.metadata["pad_token"]
+        )
+
+    def _token_lengths(self, texts: list[str]) -> list[int]:
+        # The tokenizer pads to the longest text; the attention mask counts the real tokens.
+        return [sum(e.attention_mask) for e in self._tokenizer.encode_batch(texts)]
+
+    def _token_offsets(self, text: str) -> list[tuple[int, int]]:
+        return list(self._chunk_tokenizer.encode(text, add_special_tokens=False).offsets)
+
+    def _encode_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+        }
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        hidden = self._session.run(None, feeds)[0]  # (batch, tokens, dims)
+
+        if self.metadata["pooling"] == "cls":
+            pooled = hidden[:, 0]
+        else:  # mean over real tokens
+            weights = mask[:, :, None].astype(hidden.dtype)
+            pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled / np.clip(norms, 1e-12, None)
+
+
+def export_onnx(
+    model_name: str,
+    out_dir: Path | None = None,
+    *,
+    quantize: bool = True,
+    opset: int = 17,
+) -> Path:
+    """Export ``model_name`` for :class:`OnnxEmbedder` and return the directory.
+
+    Writes the fp32 graph, the fast tokenizer and the pooling metadata, plus an
+    int8 dynamically quantized graph unless ``quantize=False``.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    out_dir = Path(out_dir) if out_dir else default_onnx_dir(model_name)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    pooling = _pooling_mode(model)
+    if pooling not in ("cls", "mean"):
+        raise ValueError(f"Unsupported pooling {pooling!r} for {model_name} (only cls and mean)")
+
+    sample = tokenizer(["An example job description."], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self) -> None:
+            super().__init__()
+            self.model = transformer
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    dynamic = {0: "batch", 1: "tokens"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(),
+            tuple(sample[name] for name in input_names),
+            str(out_dir / MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: dynamic for name in [*input_names, "last_hidden_state"]},
+            opset_version=opset,
+            external_data=False,
+        )
+    tokenizer.backend_tokenizer.save(str(out_dir / TOKENIZER_FILE))
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+        quantize_dynamic(
+            str(out_dir / MODEL_FILE),
+            str(out_dir / QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+
+    (out_dir / METADATA_FILE).write_text(
+        json.dumps(
+            {
+                "model_name": model_name,
+                "pooling": pooling,
+                "max_seq_length": model.max_seq_length or tokenizer.model_max_length,
+                "pad_token": tokenizer.pad_token,
+                "pad_token_id": tokenizer.pad_token_id,
+                "dims": model.get_sentence_embedding_dimension(),
+                "quantized": quantize,
+            },
+            indent=2,
+        )
+    )
+    return out_dir
+
+
+def _pooling_mode(model) -> str:
+    """Pooling of a SentenceTransformer (``pooling_mode`` on v5+, ``get_pooling_mode_str()`` before)."""
+    for module in model:
+        if hasattr(module, "get_pooling_mode_str"):
+            return module.get_pooling_mode_str()
+        mode = getattr(module, "pooling_mode", None)
+        if mode is not None:
+            return mode if isinstance(mode, str) else "+".join(mode)
+    return "mean"
+
+
+@dataclass(frozen=True)
+class ParityReport:
+    texts: int
+    min_cosine: float
+    mean_cosine: float
+    threshold: float
+
+    @property
+    def passed(self) -> bool:
+        return self.min_cosine >= self.threshold
+
+
+def check_parity(
+    config: EmbedderConfig,
+    texts: Sequence[str] | None = None,
+    *,
+    reference: Embedder | None = None,
+    threshold: float = PARITY_THRESHOLD,
+) -> ParityReport:
+    """Compare :class:`OnnxEmbedder` vectors for ``config`` with the PyTorch model's.
+
+    ``texts`` defaults to :func:`~mcf.lib.embeddings.benchmark.sample_texts`.
+    Pass ``reference`` to reuse an already loaded PyTorch :class:`Embedder`.
+    """
+    from mcf.lib.embeddings.benchmark import sample_texts
+
+    texts = list(texts) if texts else sample_texts(64)
+    reference = reference or Embedder(replace(config, backend="torch"))
+    expected = np.asarray(reference._encode(texts), dtype=np.float32)
+    actual = np.asarray(OnnxEmbedder(replace(config, backend="onnx"))._encode(texts), dtype=np.float32)
+    # Both sides are L2-normalised, so the row-wise dot product is the cosine.
+    cosines = (expected * actual).sum(axis=1)
+    return ParityReport(
+        texts=len(texts),
+        min_cosine=round(float(cosines.min()), 5),
+        mean_cosine=round(float(cosines.mean()), 5),
+        threshold=threshold,
+    )
@@ -0,0 +1,115 @@
+"""Multi-process embedder for bulk CPU encoding (crawl, re-embed).
+
+A single SentenceTransformer process leaves most cores of a CPU-only runner
+idle. :class:`ProcessPoolEmbedder` shards each ``embed_texts`` call into at
+least ``workers`` token-budget batches of similar length (lengths estimated, as
+the parent loads no tokenizer) and encodes them on ``workers`` processes, each
+of which loads the model once and uses its share of the cores. Results come
+back in input order.
+
+The embeddings cache is consulted and filled in the parent process, so only
+cache misses are sent to the workers and the store is never touched from a
+worker. Workers are started on first use (``spawn``, so a parent that already
+imported torch is safe) and stopped by :meth:`ProcessPoolEmbedder.close`.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig, estimate_token_length
+
+if TYPE_CHECKING:
+    from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
+
+WORKERS_ENV = "EMBED_WORKERS"
+
+_worker_model = None
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    global _worker_model
+    import torch
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
+    torch.set_num_threads(threads)
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_chunk(texts: list[str]) -> list[list[float]]:
+    """Encode one token-budget batch as a single model batch."""
+    vectors = _worker_model.encode(  # type: ignore[union-attr]
+        texts,
+        batch_size=len(texts),
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return [v.tolist() for v in vectors]
+
+
+def embed_workers_from_env() -> int:
+    """Worker count from ``$EMBED_WORKERS`` (default 1, i.e. no pool)."""
+    try:
+        return max(1, int(os.getenv(WORKERS_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+class ProcessPoolEmbedder(Embedder):
+    """:class:`Embedder` that encodes on a pool of worker processes.
+
+    Same interface and cache behaviour as :class:`Embedder`. Callers that batch
+    their own input should pass ``batch_size * workers`` texts per
+    ``embed_texts`` call to keep every worker busy (see :attr:`workers`).
+    """
+
+    def __init__(
+        self,
+        config: EmbedderConfig | None = None,
+        embeddings_cache: EmbeddingsCache | None = None,
+        *,
+        workers: int | None = None,
+    ) -> None:
+        # No model in the parent: only the workers load it.
+        self.config = config or EmbedderConfig()
+        self._embeddings_cache = embeddings_cache
+        self._encode_lock = threading.Lock()
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _token_lengths(self, texts: list[str]) -> list[int]:
+        return [estimate_token_length(text) for text in texts]
+
+    def _token_offsets(self, text: str) -> None:
+        return None  # no tokenizer in the parent: resume chunks are sized from words
+
+    def _max_batch_texts(self, n_texts: int) -> int:
+        # Enough batches for every worker, even when the token budget would fit them in one.
+        return max(1, min(self.config.batch_size, n_texts // self.workers))
+
+    def _encode_batches(self, batches: list[list[str]]) -> list[list[list[float]]]:
+        if self._executor is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.config.model_name, threads),
+            )
+        return list(self._executor.map(_encode_chunk, batches))
+
+    def close(self) -> None:
+        """Stop the worker processes (they are restarted on next use)."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> ProcessPoolEmbedder:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
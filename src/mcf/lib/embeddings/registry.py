@@ -0,0 +1,62 @@
+"""Process-wide registry of loaded embedding models.
+
+Loading a model costs seconds and hundreds of MB, so the API and the CLI
+borrow embedders from here instead of building one per request or command:
+:func:`get_embedder` loads each :class:`EmbedderConfig` once (the first caller
+loads it, concurrent callers for the same config wait for that load) and
+returns the shared instance, bound to the caller's embeddings cache if one is
+given. The API warms the default model from its ``lifespan`` with
+:func:`preload_embedder`.
+
+Shared embedders run one encode at a time (see ``Embedder._encode``); a
+forward pass already uses every core.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig, create_embedder
+
+if TYPE_CHECKING:
+    from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
+
+_lock = threading.Lock()
+_embedders: dict[EmbedderConfig, Embedder] = {}
+_load_locks: dict[EmbedderConfig, threading.Lock] = {}
+
+
+def get_embedder(
+    config: EmbedderConfig | None = None,
+    embeddings_cache: EmbeddingsCache | None = None,
+) -> Embedder:
+    """Shared embedder for ``config`` (default :class:`EmbedderConfig`), loaded on first use.
+
+    With ``embeddings_cache`` the result is a lightweight view of the shared
+    embedder that reads and writes that cache; the model itself is not copied.
+    """
+    config = config or EmbedderConfig()
+    embedder = _embedders.get(config)
+    if embedder is None:
+        with _lock:
+            load_lock = _load_locks.setdefault(config, threading.Lock())
+        # Per-config lock: loading one model does not block callers of another.
+        with load_lock:
+            embedder = _embedders.get(config)
+            if embedder is None:
+                embedder = create_embedder(config)
+                _embedders[config] = embedder
+    return embedder.with_cache(embeddings_cache) if embeddings_cache is not None else embedder
+
+
+def preload_embedder(config: EmbedderConfig | None = None) -> Embedder:
+    """Load ``config``'s model now so the first request does not pay for it."""
+    return get_embedder(config)
+
+
+def clear_embedders() -> None:
+    """Drop every loaded model (they are reloaded on next use)."""
+    with _lock:
+        _embedders.clear()
+        _load_locks.clear()
@@ -133,6 +133,7 @@ class Job(_Base):
     address: Address | None = None
     salary: Salary | None = None
     positionLevels: list[PositionLevel] = []
+    minimumYearsExperience: int | None = None
     status: JobStatus | None = None
 
 
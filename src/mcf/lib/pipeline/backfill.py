@@ -0,0 +1,229 @@
+"""Backfill rich metadata (categories, salary, employment type, ...) for existing MCF jobs.
+
+Rows stored before the crawler kept these fields have no ``categories_json``.
+:func:`run_rich_backfill` refetches their details concurrently (see
+:mod:`mcf.lib.pipeline.detail_fetch`), writes them back in bulk
+(``upsert_job_details``) and, with ``embed=True``, re-embeds and re-classifies
+the enriched jobs.
+
+Progress is checkpointed under the fixed key :data:`BACKFILL_CHECKPOINT_KEY`, so
+a backfill that crashed or hit a CI timeout is continued by the next
+invocation: jobs already written (including 404s and jobs MCF has no
+categories for, which the backfill query would return again) are skipped, and
+only failed or unfetched ones are retried. The checkpoint is deleted once every
+job is done; ``restart=True`` discards it and starts over.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from mcf.lib.embeddings.job_text import build_job_text_from_normalized
+from mcf.lib.pipeline.checkpoint import (
+    STAGE_CLASSIFIED,
+    STAGE_EMBEDDED,
+    STAGE_FETCHED,
+    STAGE_LISTED,
+    CrawlCheckpoint,
+)
+from mcf.lib.pipeline.detail_fetch import DEFAULT_CONCURRENCY, iter_job_details
+from mcf.lib.pipeline.incremental_crawl import (
+    classify_and_store,
+    default_embedder,
+    embed_and_store,
+    embed_batch_size,
+    job_detail_fields,
+)
+from mcf.lib.pipeline.telemetry import PHASE_DB_WRITE, CrawlTelemetry
+from mcf.lib.sources.mcf_source import MCFJobSource
+from mcf.lib.storage.base import RunStats
+
+if TYPE_CHECKING:
+    from mcf.lib.embeddings.base import EmbedderProtocol
+    from mcf.lib.sources.base import JobSource
+    from mcf.lib.storage.base import Storage
+
+BACKFILL_CHECKPOINT_KEY = "backfill-rich-fields"
+
+# Fetched jobs are upserted and checkpointed in batches of this size.
+_UPSERT_BATCH_SIZE = 200
+
+
+@dataclass(frozen=True)
+class RichBackfillResult:
+    run: RunStats | None
+    """This invocation's run; None when no job needed a backfill."""
+    total: int
+    """Jobs in the backfill, including those an earlier attempt finished."""
+    updated: int
+    not_found: int
+    """Jobs MCF answered 404 for (removed upstream)."""
+    failed: int
+    """Jobs that failed this time; the next invocation retries them."""
+    skipped: int
+    """Jobs already done by an earlier attempt."""
+    embedded: int
+    resumed: bool
+
+
+def run_rich_backfill(
+    *,
+    store: Storage,
+    source: JobSource | None = None,
+    rate_limit: float = 4.0,
+    limit: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    embed: bool = False,
+    embedder: EmbedderProtocol | None = None,
+    restart: bool = False,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> RichBackfillResult:
+    """Refetch and store rich fields for jobs from ``get_job_uuids_needing_rich_backfill``.
+
+    An unfinished backfill is resumed with its original job list (``limit`` is
+    then ignored). ``embed=True`` also re-embeds and re-classifies every job
+    the backfill updates; it applies to jobs an earlier attempt fetched too.
+    ``on_progress(done, total)`` is called as jobs complete.
+    """
+    store.check_crawl_schema()
+    if restart:
+        store.delete_crawl_checkpoint(BACKFILL_CHECKPOINT_KEY)
+    checkpoint = CrawlCheckpoint.load(store, BACKFILL_CHECKPOINT_KEY)
+    resumed = checkpoint is not None
+    if checkpoint is not None:
+        job_uuids = sorted(checkpoint.items(STAGE_LISTED))
+        embed = embed or checkpoint.state.get("embed", False)
+    else:
+        job_uuids = store.get_job_uuids_needing_rich_backfill(limit=limit)
+        if not job_uuids:
+            return RichBackfillResult(
+                run=None, total=0, updated=0, not_found=0, failed=0, skipped=0, embedded=0, resumed=False
+            )
+        checkpoint = CrawlCheckpoint(store, BACKFILL_CHECKPOINT_KEY, {})
+        checkpoint.mark(STAGE_LISTED, job_uuids)
+    # Every invocation is its own run; the checkpoint only carries the job list and progress.
+    run = store.begin_run(kind="backfill", categories=None)
+    checkpoint.state.update(run_id=run.run_id, embed=embed)
+    checkpoint.save()
+
+    job_source = source or MCFJobSource(rate_limit=rate_limit)
+    telemetry = CrawlTelemetry()
+    fetched_before = checkpoint.items(STAGE_FETCHED)  # job_uuid -> job_text (None: 404 or no text)
+    to_fetch = [job_uuid for job_uuid in job_uuids if job_uuid not in fetched_before]
+    skipped = len(job_uuids) - len(to_fetch)
+
+    updated = not_found = failed = 0
+    pending_upsert: list[dict] = []
+    pending_marks: list[tuple[str, str | None]] = []
+    pending_embed: list[tuple[str, str]] = []  # (job_uuid, job_text)
+    embedded_count = 0
+    _embedder = None
+    if embed:
+        _embedder = embedder if embedder is not None else default_embedder(store)
+        embedded_before = set(checkpoint.items(STAGE_EMBEDDED))
+        classified_before = set(checkpoint.items(STAGE_CLASSIFIED))
+        pending_embed = [
+            (job_uuid, job_text)
+            for job_uuid, job_text in fetched_before.items()
+            if job_text and job_uuid not in embedded_before
+        ]
+
+    def _finish(run_telemetry: dict) -> None:
+        store.finish_run(
+            run.run_id,
+            total_seen=len(job_uuids),
+            added=updated,
+            maintained=0,
+            removed=not_found,
+            telemetry=run_telemetry,
+        )
+
+    def _classify(batch: list[tuple[str, list[float]]]) -> None:
+        if batch and classify_and_store(store, batch, telemetry=telemetry):
+            checkpoint.mark(STAGE_CLASSIFIED, [job_uuid for job_uuid, _ in batch])
+
+    def _flush() -> None:
+        nonlocal pending_upsert, pending_marks
+        with telemetry.phase(PHASE_DB_WRITE):
+            store.upsert_job_details(run.run_id, pending_upsert)
+            # Marked only after the upsert, so a crash in between refetches rather than skips.
+            checkpoint.mark_with_payload(STAGE_FETCHED, pending_marks)
+        pending_upsert, pending_marks = [], []
+
+    def _embed_pending() -> None:
+        nonlocal pending_embed, embedded_count
+        _flush()
+        batch, pending_embed = pending_embed, []
+        embedded = embed_and_store(
+            store,
+            _embedder,
+            batch,
+            on_batch=lambda uuids: checkpoint.mark(STAGE_EMBEDDED, uuids),
+            telemetry=telemetry,
+        )
+        embedded_count += len(embedded)
+        _classify(embedded)
+
+    try:
+        if embed:
+            # Jobs an earlier attempt embedded but did not classify.
+            _classify(store.get_job_embeddings_for_uuids(sorted(embedded_before - classified_before)))
+        embed_size = embed_batch_size(_embedder) if embed else 0
+        done = skipped
+        for fetched in iter_job_details(
+            job_source, to_fetch, concurrency=concurrency, on_latency=telemetry.record_fetch
+        ):
+            done += 1
+            if fetched.job is None:
+                if getattr(fetched.error, "status_code", None) == 404:
+                    not_found += 1
+                    pending_marks.append((fetched.job_id, None))
+                else:
+                    failed += 1
+                    print(f"Warning: Failed to fetch job {fetched.job_id}: {fetched.error}")
+            else:
+                job_text = build_job_text_from_normalized(fetched.job) or None
+                pending_upsert.append(job_detail_fields(fetched.job))
+                pending_marks.append((fetched.job.job_uuid, job_text))
+                if embed and job_text:
+                    pending_embed.append((fetched.job.job_uuid, job_text))
+                updated += 1
+            if embed and len(pending_embed) >= embed_size:
+                _embed_pending()
+            elif len(pending_marks) >= _UPSERT_BATCH_SIZE:
+                _flush()
+            if on_progress:
+                on_progress(done, len(job_uuids))
+        if embed and pending_embed:
+            _embed_pending()
+        else:
+            _flush()
+    except BaseException as e:
+        # Each invocation is a separate run, so close this one; the checkpoint carries the progress.
+        try:
+            _finish({**telemetry.to_dict(), "error": f"{type(e).__name__}: {e}"})
+        except Exception as finish_error:
+            print(f"Warning: could not close backfill run {run.run_id}: {finish_error}")
+        print(f"Backfill run {run.run_id} interrupted; run the backfill again to continue it")
+        raise
+    finally:
+        if source is None:
+            job_source.close()
+        if embedder is None and _embedder is not None and hasattr(_embedder, "close"):
+            _embedder.close()
+
+    store.update_daily_stats(run.run_id)
+    _finish(telemetry.to_dict())
+    if not failed:
+        checkpoint.delete()
+    return RichBackfillResult(
+        run=run,
+        total=len(job_uuids),
+        updated=updated,
+        not_found=not_found,
+        failed=failed,
+        skipped=skipped,
+        embedded=embedded_count,
+        resumed=resumed,
+    )
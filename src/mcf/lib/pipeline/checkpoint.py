@@ -0,0 +1,134 @@
+"""Persisted crawl progress so an interrupted run can be resumed.
+
+A checkpoint is keyed by the crawl run ID and has two parts:
+
+- a small JSON state: the run parameters, the current phase, a per-category
+  listing cursor (next page to request, whether the category is finished) and
+  the categories found over the search result cap
+- per-job items by stage: ``listed`` (payload is the source's ``updatedAt``
+  watermark) -> ``added`` / ``changed`` -> ``fetched`` (payload is the embedding
+  text, so resumed runs need not refetch) -> ``embedded`` -> ``classified``
+
+``run_incremental_crawl(resume_run_id=...)`` skips whatever a previous attempt
+already finished. The checkpoint is deleted when the run completes.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+if TYPE_CHECKING:
+    from mcf.lib.storage.base import Storage
+
+PHASE_LISTING = "listing"
+PHASE_DIFFED = "diffed"
+
+STAGE_LISTED = "listed"
+STAGE_ADDED = "added"
+STAGE_CHANGED = "changed"
+STAGE_MAINTAINED = "maintained"
+STAGE_REMOVED = "removed"
+STAGE_FETCHED = "fetched"
+STAGE_EMBEDDED = "embedded"
+STAGE_CLASSIFIED = "classified"
+
+
+class CrawlCheckpoint:
+    """Read/write view of one run's checkpoint in the store.
+
+    Also implements the crawler's ``ListingCheckpoint`` protocol, so listing
+    resumes from the last completed page of each category.
+    """
+
+    def __init__(self, store: Storage, run_id: str, state: dict) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.state = state
+
+    @classmethod
+    def start(
+        cls,
+        store: Storage,
+        run_id: str,
+        *,
+        source_id: str,
+        started_at: str,
+        categories: Sequence[str] | None,
+        limit: int | None,
+        delta: bool,
+        epoch_id: str | None = None,
+        shard: int | None = None,
+    ) -> CrawlCheckpoint:
+        checkpoint = cls(
+            store,
+            run_id,
+            {
+                "source_id": source_id,
+                "started_at": started_at,
+                "categories": list(categories) if categories else None,
+                "limit": limit,
+                "delta": delta,
+                "epoch_id": epoch_id,
+                "shard": shard,
+                "phase": PHASE_LISTING,
+                "cursors": {},
+                "truncated": [],
+            },
+        )
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, store: Storage, run_id: str) -> CrawlCheckpoint | None:
+        state = store.get_crawl_checkpoint(run_id)
+        return cls(store, run_id, state) if state is not None else None
+
+    @property
+    def phase(self) -> str:
+        return self.state["phase"]
+
+    def save(self) -> None:
+        self.store.save_crawl_checkpoint(self.run_id, self.state)
+
+    def advance(self, phase: str, **fields) -> None:
+        """Move to ``phase`` and persist any extra state fields with it."""
+        self.state.update(fields, phase=phase)
+        self.save()
+
+    def mark(self, stage: str, job_uuids: Iterable[str]) -> None:
+        self.store.add_crawl_checkpoint_items(self.run_id, stage, ((u, None) for u in job_uuids))
+
+    def mark_with_payload(self, stage: str, items: Iterable[tuple[str, str | None]]) -> None:
+        self.store.add_crawl_checkpoint_items(self.run_id, stage, items)
+
+    def items(self, stage: str) -> dict[str, str | None]:
+        return self.store.get_crawl_checkpoint_items(self.run_id, stage)
+
+    def delete(self) -> None:
+        self.store.delete_crawl_checkpoint(self.run_id)
+
+    # --- ListingCheckpoint ---
+
+    def listed(self) -> dict[str, str | None]:
+        return self.items(STAGE_LISTED)
+
+    def category_cursor(self, category: str) -> tuple[int, bool]:
+        next_page, done = self.state["cursors"].get(category, (0, False))
+        return next_page, done
+
+    def record_page(
+        self, category: str, next_page: int, done: bool, new_ids: Sequence[tuple[str, str | None]]
+    ) -> None:
+        # Items first: a crash in between re-lists one page rather than losing it.
+        self.mark_with_payload(STAGE_LISTED, new_ids)
+        self.state["cursors"][category] = [next_page, done]
+        self.save()
+
+    def truncated(self) -> set[str]:
+        return set(self.state.get("truncated") or [])
+
+    def record_truncated(self, category: str) -> None:
+        truncated = self.truncated()
+        if category not in truncated:
+            self.state["truncated"] = sorted(truncated | {category})
+            self.save()
@@ -0,0 +1,109 @@
+"""Continuous ingestion: poll sources for new postings on a fixed interval.
+
+Each cycle runs a delta crawl (see ``run_incremental_crawl(delta=True)``) for
+every source, so new jobs are fetched, embedded, classified and stored within
+minutes of being posted. Optionally a full (non-delta) crawl runs every
+``full_sweep_interval`` seconds to pick up removals; otherwise leave that to
+the daily crawl workflow.
+
+Checkpoints of crawls that failed and were never resumed (the daemon always
+starts fresh runs) are dropped once they are ``checkpoint_max_age`` seconds old.
+
+The embedder is loaded once and reused across cycles.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from mcf.lib.pipeline.detail_fetch import DEFAULT_CONCURRENCY
+from mcf.lib.pipeline.incremental_crawl import IncrementalCrawlResult, run_incremental_crawl
+
+if TYPE_CHECKING:
+    from mcf.lib.embeddings.base import EmbedderProtocol
+    from mcf.lib.sources.base import JobSource
+    from mcf.lib.storage.base import Storage
+
+# Checkpoints untouched for this long are treated as abandoned.
+CHECKPOINT_MAX_AGE = 7 * 24 * 3600.0
+
+
+@dataclass(frozen=True)
+class DaemonCycleResult:
+    """Outcome of one source's crawl within a daemon cycle."""
+
+    source_id: str
+    full_sweep: bool
+    elapsed: float
+    result: IncrementalCrawlResult | None = None
+    error: Exception | None = None
+
+
+def run_crawl_daemon(
+    *,
+    store: Storage,
+    sources: Sequence[JobSource],
+    embedder: EmbedderProtocol,
+    interval: float = 600.0,
+    full_sweep_interval: float | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    stop: threading.Event | None = None,
+    on_cycle: Callable[[DaemonCycleResult], None] | None = None,
+    checkpoint_max_age: float | None = CHECKPOINT_MAX_AGE,
+) -> None:
+    """Poll ``sources`` every ``interval`` seconds until ``stop`` is set.
+
+    A failing source is reported through ``on_cycle`` and retried next cycle;
+    it never stops the daemon. Each cycle first drops checkpoints older than
+    ``checkpoint_max_age`` seconds (None keeps them).
+    """
+    stop = stop or threading.Event()
+    started = time.monotonic()
+    # The first full sweep is due one full_sweep_interval after start, so the
+    # daemon begins with cheap delta cycles.
+    last_full_sweep: dict[str, float] = {}
+
+    while not stop.is_set():
+        cycle_started = time.monotonic()
+        if checkpoint_max_age is not None:
+            _drop_stale_checkpoints(store, checkpoint_max_age)
+        for source in sources:
+            if stop.is_set():
+                break
+            source_id = source.source_id
+            now = time.monotonic()
+            full_sweep = full_sweep_interval is not None and (
+                now - last_full_sweep.get(source_id, started) >= full_sweep_interval
+            )
+            try:
+                result = run_incremental_crawl(
+                    store=store,
+                    source=source,
+                    embedder=embedder,
+                    concurrency=concurrency,
+                    delta=not full_sweep,
+                )
+                if full_sweep:
+                    last_full_sweep[source_id] = now
+                cycle = DaemonCycleResult(source_id, full_sweep, time.monotonic() - now, result=result)
+            except Exception as e:
+                cycle = DaemonCycleResult(source_id, full_sweep, time.monotonic() - now, error=e)
+            if on_cycle:
+                on_cycle(cycle)
+
+        stop.wait(max(0.0, interval - (time.monotonic() - cycle_started)))
+
+
+def _drop_stale_checkpoints(store: Storage, max_age: float) -> None:
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age)
+    try:
+        dropped = store.delete_stale_crawl_checkpoints(cutoff)
+    except Exception as e:
+        print(f"Warning: could not drop stale crawl checkpoints: {e}")
+        return
+    if dropped:
+        print(f"Dropped {dropped} crawl checkpoint(s) not updated since {cutoff:%Y-%m-%d %H:%M} UTC")
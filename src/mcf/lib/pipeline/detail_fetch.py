@@ -0,0 +1,216 @@
+"""Concurrent job-detail fetching for the incremental crawl.
+
+Sources are fetched through the cheapest method they implement (see the
+optional protocols in :mod:`mcf.lib.sources.base`), in this order:
+
+1. ``async def aget_job_details(job_uuids)``: ``batch_size`` IDs per call, up
+   to ``concurrency`` calls in flight on a background event loop
+2. ``get_job_details(job_uuids)``: ``batch_size`` IDs per call, one at a time
+   (e.g. the Algolia multi-get of Careers@Gov)
+3. ``async def aget_job_detail(job_uuid)``: up to ``concurrency`` requests in
+   flight on a background event loop
+4. ``get_job_detail(job_uuid)``: one at a time
+
+Either way the caller consumes results from a plain iterator, so parsing,
+embedding and DB writes overlap with network latency.
+
+Results wait in a queue of at most ``buffer`` entries. When the consumer falls
+behind (e.g. while it embeds a batch), fetching pauses instead of piling up
+responses in memory.
+
+The fetcher runs in its own thread, so this works the same whether the caller
+is the sync CLI or code already running inside an event loop.
+
+Throttled fetches (HTTP 403/429) are not reported straight away: the job goes
+to a deferred queue and is retried after the rest of the batch, by which time
+the source's adaptive limiter has slowed down. Only after ``deferred_rounds``
+such retries is the throttle error returned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterator, Sequence
+
+if TYPE_CHECKING:
+    from mcf.lib.sources.base import JobSource, NormalizedJob
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DEFERRED_ROUNDS = 2
+DEFAULT_BUFFER = 256
+DEFAULT_BATCH_SIZE = 1000
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class DetailResult:
+    """Outcome of fetching one job: either ``job`` or ``error`` is set."""
+
+    job_id: str
+    job: NormalizedJob | None = None
+    error: Exception | None = None
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Whether a fetch error is the upstream rate-limiting us (HTTP 403/429)."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code in (403, 429)
+
+
+def iter_job_details(
+    source: JobSource,
+    job_ids: Sequence[str],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    deferred_rounds: int = DEFAULT_DEFERRED_ROUNDS,
+    buffer: int = DEFAULT_BUFFER,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_latency: Callable[[float], None] | None = None,
+) -> Iterator[DetailResult]:
+    """Yield a :class:`DetailResult` per job ID, in completion order.
+
+    Fetch errors are returned as results rather than raised so one bad job does
+    not abort the whole batch. The source's own rate limiter still applies;
+    ``concurrency`` only bounds how many requests may be waiting on the network.
+    Throttled jobs are retried in up to ``deferred_rounds`` later rounds. At most
+    ``buffer`` results are held for a slow consumer before fetching pauses.
+    Batch-capable sources get ``batch_size`` IDs per call; a job the batch call
+    returns ``None`` for is reported as a ``LookupError``. ``on_latency`` is
+    called (on the fetcher thread) with the seconds each source call took.
+    """
+    if not job_ids:
+        return
+
+    results: queue.Queue = queue.Queue(maxsize=max(1, buffer))
+    stop = threading.Event()
+    running: dict[str, object] = {}
+
+    if hasattr(source, "aget_job_details"):
+        use_async, unit_size = True, batch_size
+    elif hasattr(source, "get_job_details"):
+        use_async, unit_size = False, batch_size
+    else:
+        use_async, unit_size = concurrency > 1 and hasattr(source, "aget_job_detail"), 1
+
+    # A "unit" is the IDs passed to one source call: a batch, or a single job.
+    def _units(pending: list[str]) -> Iterator[list[str]]:
+        for i in range(0, len(pending), unit_size):
+            yield pending[i : i + unit_size]
+
+    def _put_results(unit: list[str], jobs: Sequence[NormalizedJob | None]) -> None:
+        for job_id, job in zip(unit, jobs):
+            if job is None:
+                results.put(DetailResult(job_id, error=LookupError(f"job {job_id} not found")))
+            else:
+                results.put(DetailResult(job_id, job=job))
+
+    def _put_error(unit: list[str], error: Exception, deferred: list[str] | None) -> None:
+        if deferred is not None and is_throttled(error):
+            deferred.extend(unit)
+        else:
+            for job_id in unit:
+                results.put(DetailResult(job_id, error=error))
+
+    def _fetch_sync() -> None:
+        pending = list(job_ids)
+        for round_no in range(deferred_rounds + 1):
+            deferred: list[str] | None = [] if round_no < deferred_rounds else None
+            for unit in _units(pending):
+                if stop.is_set():
+                    return
+                start = time.perf_counter()
+                try:
+                    if unit_size > 1:
+                        jobs = source.get_job_details(unit)  # type: ignore[attr-defined]
+                    else:
+                        jobs = [source.get_job_detail(unit[0])]
+                except Exception as e:
+                    _put_error(unit, e, deferred)
+                    continue
+                finally:
+                    if on_latency:
+                        on_latency(time.perf_counter() - start)
+                _put_results(unit, jobs)
+            if not deferred:
+                break
+            pending = deferred
+
+    async def _worker(units: Iterator[list[str]], deferred: list[str] | None) -> None:
+        for unit in units:
+            start = time.perf_counter()
+            try:
+                if unit_size > 1:
+                    jobs = await source.aget_job_details(unit)  # type: ignore[attr-defined]
+                else:
+                    jobs = [await source.aget_job_detail(unit[0])]  # type: ignore[attr-defined]
+            except Exception as e:
+                _put_error(unit, e, deferred)
+                continue
+            finally:
+                if on_latency:
+                    on_latency(time.perf_counter() - start)
+            # Blocks the loop (and so every worker) while the buffer is full.
+            _put_results(unit, jobs)
+
+    async def _fetch_async() -> None:
+        running["loop"] = asyncio.get_running_loop()
+        running["task"] = asyncio.current_task()
+        pending = list(job_ids)
+        try:
+            for round_no in range(deferred_rounds + 1):
+                deferred: list[str] | None = [] if round_no < deferred_rounds else None
+                # Workers share one iterator, so each unit is fetched exactly once per round.
+                units = _units(pending)
+                workers = min(concurrency, -(-len(pending) // unit_size))
+                await asyncio.gather(*(_worker(units, deferred) for _ in range(max(1, workers))))
+                if not deferred:
+                    break
+                pending = deferred
+        finally:
+            if hasattr(source, "aclose"):
+                await source.aclose()
+
+    def _thread_main() -> None:
+        try:
+            if use_async:
+                asyncio.run(_fetch_async())
+            else:
+                _fetch_sync()
+        except BaseException as e:  # surface fetcher failures to the consumer
+            results.put(e)
+        finally:
+            results.put(_DONE)
+
+    thread = threading.Thread(target=_thread_main, name="detail-fetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Consumer stopped early (error / Ctrl-C): cancel in-flight requests
+        # rather than waiting out their retries.
+        stop.set()
+        if thread.is_alive() and "task" in running:
+            try:
+                running["loop"].call_soon_threadsafe(running["task"].cancel)  # type: ignore[attr-defined]
+            except RuntimeError:
+                pass  # loop already closed
+        # Keep draining so a fetcher blocked on a full buffer can see the stop.
+        while thread.is_alive():
+            try:
+                results.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
@@ -2,16 +2,51 @@
 
 from __future__ import annotations
 
+import json
 import os
+import threading
+import time
 import urllib.request
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Mapping, Sequence
+
+from mcf.lib.api.client import MCFClient
+from mcf.lib.api.rate_limit import shared_limiter
+from mcf.lib.crawler.crawler import PARTITION_SEP
+from mcf.lib.crawler.shards import Shard, partition_totals, plan_shards
+from mcf.lib.embeddings.base import EmbedderProtocol
+from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig
+from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
+from mcf.lib.embeddings.job_text import build_job_text_from_normalized
+from mcf.lib.embeddings.process_pool import ProcessPoolEmbedder, embed_workers_from_env
+from mcf.lib.embeddings.registry import get_embedder
+from mcf.lib.pipeline.checkpoint import (
+    PHASE_DIFFED,
+    PHASE_LISTING,
+    STAGE_ADDED,
+    STAGE_CHANGED,
+    STAGE_CLASSIFIED,
+    STAGE_EMBEDDED,
+    STAGE_FETCHED,
+    STAGE_MAINTAINED,
+    STAGE_REMOVED,
+    CrawlCheckpoint,
+)
+from mcf.lib.pipeline.detail_fetch import DEFAULT_CONCURRENCY, iter_job_details
+from mcf.lib.pipeline.telemetry import PHASE_CLASSIFY, PHASE_DB_WRITE, CrawlTelemetry
+from mcf.lib.pipeline.telemetry import PHASE_LISTING as TELEMETRY_PHASE_LISTING
+from mcf.lib.sources.base import NormalizedJob
+from mcf.lib.sources.mcf_source import MCFJobSource
+from mcf.lib.storage.base import RunStats, Storage
+
+if TYPE_CHECKING:
+    from mcf.lib.sources.base import JobSource
 
 
 def _notify_crawl_complete() -> None:
     """Call Next.js webhook to invalidate caches (dashboard, matches, pool, job)."""
-    import time
-
     webhook_url = os.getenv("CRAWL_WEBHOOK_URL") or os.getenv("NEXT_PUBLIC_VERCEL_URL")
     if not webhook_url:
         return
@@ -41,16 +76,36 @@ def _notify_crawl_complete() -> None:
                 time.sleep(2**attempt)
     print(f"Warning: crawl webhook failed after 3 attempts: {last_err}")
 
-from mcf.lib.embeddings.base import EmbedderProtocol
-from mcf.lib.embeddings.embedder import Embedder, EmbedderConfig
-from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache
-from mcf.lib.embeddings.job_text import build_job_text_from_normalized
-from mcf.lib.sources.base import NormalizedJob
-from mcf.lib.sources.mcf_source import MCFJobSource
-from mcf.lib.storage.base import RunStats, Storage
 
-if TYPE_CHECKING:
-    from mcf.lib.sources.base import JobSource
+def _notify_jobs_added(job_uuids: list[str]) -> None:
+    """Ask the FastAPI server to add new jobs to its warm active jobs pool.
+
+    Used after delta crawls instead of the full crawl-complete webhook, so the
+    API keeps its pool (and other caches) and only grows by the new jobs.
+    Requires CRAWL_API_URL (FastAPI base URL) and CRON_SECRET.
+    """
+    api_url = os.getenv("CRAWL_API_URL")
+    secret = os.getenv("CRON_SECRET") or os.getenv("REVALIDATE_SECRET")
+    if not api_url or not secret or not job_uuids:
+        return
+    if not api_url.startswith("http"):
+        api_url = f"https://{api_url}"
+    req = urllib.request.Request(
+        f"{api_url.rstrip('/')}/api/admin/pool/add-jobs",
+        method="POST",
+        data=json.dumps({"job_uuids": job_uuids}).encode("utf-8"),
+        headers={"X-Crawl-Secret": secret, "Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            if resp.status >= 400:
+                print(f"Warning: pool add-jobs returned {resp.status}")
+    except Exception as e:
+        print(f"Warning: pool add-jobs failed: {e}")
+
+
+# Fetched jobs are checkpointed in batches of this size.
+_CHECKPOINT_FLUSH_SIZE = 50
 
 
 @dataclass(frozen=True)
@@ -60,6 +115,136 @@ class IncrementalCrawlResult:
     added: list[str]
     maintained: list[str]
     removed: list[str]
+    updated: list[str] = field(default_factory=list)
+    """Maintained jobs refetched because their source watermark moved."""
+
+
+def default_embedder(store: Storage, *, workers: int | None = None) -> Embedder:
+    """Embedder for job embeddings, backed by the store's embeddings cache unless disabled.
+
+    The backend follows :class:`EmbedderConfig` (``$EMBEDDER_BACKEND``). With
+    ``workers`` > 1 (default: ``$EMBED_WORKERS``) the torch backend runs as a
+    :class:`ProcessPoolEmbedder`; call its ``close()`` when done. ONNX Runtime
+    already uses every core, so the onnx backend ignores ``workers``.
+    """
+    embeddings_cache = (
+        EmbeddingsCache(store=store)
+        if os.getenv("ENABLE_EMBEDDINGS_CACHE", "1") in ("1", "true", "yes")
+        else None
+    )
+    config = EmbedderConfig()
+    workers = workers if workers is not None else embed_workers_from_env()
+    if workers > 1 and config.backend == "torch":
+        return ProcessPoolEmbedder(config, embeddings_cache=embeddings_cache, workers=workers)
+    return get_embedder(config, embeddings_cache=embeddings_cache)
+
+
+def embed_batch_size(embedder: EmbedderProtocol) -> int:
+    """Texts per ``embed_texts`` call: the model batch size, times the worker count for a pool."""
+    cfg = getattr(embedder, "config", None)
+    batch_size = cfg.batch_size if cfg and hasattr(cfg, "batch_size") else 32
+    return batch_size * getattr(embedder, "workers", 1)
+
+
+def job_detail_fields(normalized: NormalizedJob) -> dict:
+    """A normalized job as ``upsert_new_job_detail`` / ``upsert_job_details`` keyword arguments."""
+    return {
+        "job_uuid": normalized.job_uuid,
+        "title": normalized.title,
+        "company_name": normalized.company_name,
+        "location": normalized.location,
+        "job_url": normalized.job_url,
+        "job_source": normalized.source_id,
+        "skills": normalized.skills or None,
+        "raw_json": None,
+        "categories": normalized.categories or None,
+        "employment_types": normalized.employment_types or None,
+        "position_levels": normalized.position_levels or None,
+        "salary_min": normalized.salary_min,
+        "salary_max": normalized.salary_max,
+        "posted_date": normalized.posted_date,
+        "expiry_date": normalized.expiry_date,
+        "min_years_experience": normalized.min_years_experience,
+    }
+
+
+def upsert_normalized_job(store: Storage, run_id: str, normalized: NormalizedJob) -> None:
+    """Write a normalized job's fields to the jobs table (marks it active and seen in ``run_id``)."""
+    store.upsert_new_job_detail(run_id=run_id, **job_detail_fields(normalized))
+
+
+def embed_and_store(
+    store: Storage,
+    embedder: EmbedderProtocol,
+    jobs: Sequence[tuple[str, str]],
+    *,
+    on_batch: Callable[[list[str]], None] | None = None,
+    telemetry: CrawlTelemetry | None = None,
+) -> list[tuple[str, list[float]]]:
+    """Embed ``(job_uuid, job_text)`` pairs in batches and store the embeddings.
+
+    A failing batch is reported and skipped. ``on_batch`` receives the job UUIDs
+    of every stored batch. Returns the ``(job_uuid, embedding)`` pairs stored.
+    """
+    telemetry = telemetry or CrawlTelemetry()
+    batch_size = embed_batch_size(embedder)
+    embedded: list[tuple[str, list[float]]] = []
+    for i in range(0, len(jobs), batch_size):
+        batch = jobs[i : i + batch_size]
+        texts = [jt for _, jt in batch]
+        try:
+            start = time.perf_counter()
+            embeddings = embedder.embed_texts(texts)
+            telemetry.record_embed(len(texts), time.perf_counter() - start)
+            with telemetry.phase(PHASE_DB_WRITE):
+                for (job_uuid, _), emb in zip(batch, embeddings):
+                    store.upsert_embedding(
+                        job_uuid=job_uuid,
+                        model_name=embedder.model_name,
+                        embedding=emb,
+                    )
+                    embedded.append((job_uuid, emb))
+            if on_batch:
+                on_batch([job_uuid for job_uuid, _ in batch])
+        except Exception as e:
+            for job_uuid, _ in batch:
+                print(f"Warning: Failed to generate embedding for job {job_uuid}: {e}")
+    return embedded
+
+
+def classify_and_store(
+    store: Storage,
+    embedded: Sequence[tuple[str, list[float]]],
+    *,
+    telemetry: CrawlTelemetry | None = None,
+) -> bool:
+    """Classify embedded jobs (role cluster + experience tier + multi-label) and store the labels.
+
+    Returns False (after printing a warning) if classification failed.
+    """
+    telemetry = telemetry or CrawlTelemetry()
+    try:
+        import numpy as np
+        from mcf.lib.classifiers import classify_jobs, classify_jobs_multilabel
+
+        with telemetry.phase(PHASE_CLASSIFY):
+            emb_matrix = np.array([e for _, e in embedded], dtype=np.float32)
+            classifications_raw = classify_jobs(emb_matrix)
+            multi_labels = classify_jobs_multilabel(emb_matrix)
+        classifications = [
+            (job_uuid, role_cluster, predicted_tier)
+            for (job_uuid, _), (role_cluster, predicted_tier)
+            in zip(embedded, classifications_raw)
+        ]
+        with telemetry.phase(PHASE_DB_WRITE):
+            store.batch_upsert_job_classifications(classifications)
+            store.batch_upsert_multi_label_clusters(
+                [(job_uuid, clusters) for (job_uuid, _), clusters in zip(embedded, multi_labels)]
+            )
+        return True
+    except Exception as e:
+        print(f"Warning: job classification failed, skipping: {e}")
+        return False
 
 
 def run_incremental_crawl(
@@ -71,178 +256,622 @@ def run_incremental_crawl(
     categories: Sequence[str] | None = None,
     limit: int | None = None,
     on_progress=None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    delta: bool = False,
+    resume_run_id: str | None = None,
+    epoch_id: str | None = None,
+    shard: int | None = None,
 ) -> IncrementalCrawlResult:
     """Run an incremental crawl.
 
     - Lists job IDs from the source (cheap)
     - Diffs against DB to compute added/maintained/removed
-    - Fetches job detail only for newly added jobs
+    - Fetches job detail only for newly added jobs, with up to ``concurrency``
+      requests in flight (still bounded by the source's ``rate_limit``)
+    - Embeds, classifies and stores fetched jobs one embedder batch at a time
+      while the next details are still being fetched
+
+    With ``delta=True`` the source only lists new postings (see ``known_ids`` on
+    :meth:`JobSource.list_job_ids`), and only the added jobs are committed:
+    nothing is marked maintained or removed. A regular full crawl still has to
+    run periodically to pick up removals.
+
+    Change detection: sources with ``listed_watermarks()`` report each listed
+    job's last-modified time (MCF ``metadata.updatedAt``). Maintained jobs whose
+    watermark differs from the one stored at their last fetch are refetched,
+    re-embedded and re-classified along with the added jobs. A job seen with a
+    watermark for the first time just has it recorded as the baseline.
+
+    Progress is checkpointed in the store as the run goes (see
+    :mod:`mcf.lib.pipeline.checkpoint`). Pass ``resume_run_id`` to continue an
+    interrupted run with its original parameters: listing resumes from the
+    saved per-category cursor and jobs already fetched, embedded or classified
+    are not redone.
+
+    With ``epoch_id`` and ``shard`` the run crawls one shard of a crawl epoch
+    (see :func:`start_crawl_epoch`): its categories come from the epoch plan,
+    and the shard that finishes the epoch infers removals from everything the
+    epoch's shards listed.
+
+    Per-phase timings, detail-fetch latencies and HTTP counters are stored
+    with the run (see :mod:`mcf.lib.pipeline.telemetry`).
     """
     job_source = source or MCFJobSource(rate_limit=rate_limit)
+    telemetry = CrawlTelemetry()
+    store.check_crawl_schema()
+
+    if resume_run_id:
+        checkpoint = _load_checkpoint(store, resume_run_id, job_source.source_id)
+        run = _resumed_run(resume_run_id, checkpoint.state)
+    elif epoch_id is not None:
+        if delta or limit:
+            raise ValueError("An epoch shard is a full listing; it cannot use delta or limit")
+        categories = _epoch_shard_partitions(store, epoch_id, shard, job_source.source_id)
+        run = store.begin_run(kind="incremental", categories=categories)
+        checkpoint = CrawlCheckpoint.start(
+            store,
+            run.run_id,
+            source_id=job_source.source_id,
+            started_at=run.started_at.isoformat(),
+            categories=categories,
+            limit=None,
+            delta=False,
+            epoch_id=epoch_id,
+            shard=shard,
+        )
+    else:
+        run = store.begin_run(
+            kind="delta" if delta else "incremental",
+            categories=list(categories) if categories else None,
+        )
+        checkpoint = CrawlCheckpoint.start(
+            store,
+            run.run_id,
+            source_id=job_source.source_id,
+            started_at=run.started_at.isoformat(),
+            categories=categories,
+            limit=limit,
+            delta=delta,
+        )
 
     try:
-        run = store.begin_run(kind="incremental", categories=list(categories) if categories else None)
+        result, embedded = _crawl_source(
+            store=store,
+            run=run,
+            job_source=job_source,
+            checkpoint=checkpoint,
+            embedder=embedder,
+            on_progress=on_progress,
+            concurrency=concurrency,
+            telemetry=telemetry,
+        )
+        if checkpoint.state.get("epoch_id"):
+            with telemetry.phase(PHASE_DB_WRITE):
+                result = _finish_epoch_shard(store, run, checkpoint.state, result)
+        final_run = _finish_run(store, run, [result], telemetry)
+        checkpoint.delete()
+        _after_crawl(store, delta=checkpoint.state["delta"], embedded=embedded)
+        return replace(result, run=final_run)
+    except BaseException:
+        print(f"Crawl run {run.run_id} interrupted; continue it with --resume {run.run_id}")
+        raise
+
+
+def run_multi_source_crawl(
+    *,
+    store: Storage,
+    sources: Sequence[JobSource],
+    embedder: EmbedderProtocol | None = None,
+    categories: Mapping[str, Sequence[str]] | None = None,
+    limit: int | None = None,
+    on_progress: Callable[[str, object], None] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    delta: bool = False,
+    resume_run_id: str | None = None,
+) -> list[IncrementalCrawlResult]:
+    """Crawl several sources in parallel into a single run.
+
+    Each source is listed, diffed, fetched, embedded and classified on its own
+    thread, against its own upstream and rate limiter, exactly as
+    :func:`run_incremental_crawl` would; removals are inferred per source. All
+    store and embedder calls are serialized behind one lock, so wall-clock time
+    approaches that of the slowest source rather than the sum of all.
+
+    ``categories`` maps a source ID to the categories to crawl (other sources
+    crawl everything). ``on_progress(source_id, progress)`` receives each
+    source's listing progress. Returns one result per source, in ``sources``
+    order; the run records their totals.
+
+    Each source is checkpointed under ``"{run_id}:{source_id}"``; pass
+    ``resume_run_id`` (with the same sources) to continue an interrupted run.
+    If a source fails, the others still finish, then the first error is
+    raised and the run is left resumable.
+    """
+    store.check_crawl_schema()
+    lock = threading.RLock()
+    locked_store: Storage = _Serialized(store, lock)  # type: ignore[assignment]
+    # One embedder for all sources (loading it per source would double the memory).
+    own_embedder = embedder is None
+    _embedder = embedder if embedder is not None else default_embedder(locked_store)
+    locked_embedder: EmbedderProtocol = _Serialized(_embedder, lock)  # type: ignore[assignment]
+    source_ids = [source.source_id for source in sources]
+    telemetry = CrawlTelemetry()
+
+    if resume_run_id:
+        state = store.get_crawl_checkpoint(resume_run_id)
+        if state is None or "source_ids" not in state:
+            raise ValueError(f"No multi-source checkpoint for run {resume_run_id}")
+        if sorted(state["source_ids"]) != sorted(source_ids):
+            raise ValueError(f"Run {resume_run_id} crawled sources {state['source_ids']}, not {source_ids}")
+        delta = state["delta"]
+        run = _resumed_run(resume_run_id, state)
+        checkpoints = [
+            _load_checkpoint(store, f"{run.run_id}:{source_id}", source_id) for source_id in source_ids
+        ]
+    else:
+        run = store.begin_run(kind="delta" if delta else "incremental", categories=None)
+        store.save_crawl_checkpoint(
+            run.run_id,
+            {"source_ids": source_ids, "started_at": run.started_at.isoformat(), "delta": delta},
+        )
+        checkpoints = [
+            CrawlCheckpoint.start(
+                store,
+                f"{run.run_id}:{source_id}",
+                source_id=source_id,
+                started_at=run.started_at.isoformat(),
+                categories=(categories or {}).get(source_id),
+                limit=limit,
+                delta=delta,
+            )
+            for source_id in source_ids
+        ]
+    # Checkpoint writes from the source threads go through the lock too.
+    for checkpoint in checkpoints:
+        checkpoint.store = locked_store
+
+    def _progress_for(source_id: str):
+        if on_progress is None:
+            return None
+        return lambda progress: on_progress(source_id, progress)
 
+    try:
+        with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="crawl") as executor:
+            futures = [
+                executor.submit(
+                    _crawl_source,
+                    store=locked_store,
+                    run=run,
+                    job_source=source,
+                    checkpoint=checkpoint,
+                    embedder=locked_embedder,
+                    on_progress=_progress_for(source.source_id),
+                    concurrency=concurrency,
+                    telemetry=telemetry,
+                )
+                for source, checkpoint in zip(sources, checkpoints)
+            ]
+            wait(futures)
+        for future in futures:
+            future.result()  # the first failure aborts the run (still resumable)
+
+        outcomes = [future.result() for future in futures]
+        results = [result for result, _ in outcomes]
+        final_run = _finish_run(store, run, results, telemetry)
+        for checkpoint in checkpoints:
+            checkpoint.delete()
+        store.delete_crawl_checkpoint(run.run_id)
+        _after_crawl(store, delta=delta, embedded=[pair for _, embedded in outcomes for pair in embedded])
+        return [replace(result, run=final_run) for result in results]
+    except BaseException:
+        print(f"Crawl run {run.run_id} interrupted; continue it with --resume {run.run_id}")
+        raise
+    finally:
+        if own_embedder and hasattr(_embedder, "close"):
+            _embedder.close()
+
+
+class _Serialized:
+    """Proxy that makes every method call on ``target`` under ``lock``.
+
+    Lets several source threads share one store (e.g. DuckDB's single
+    connection) and one embedder (and its cache) safely.
+    """
+
+    def __init__(self, target: object, lock: threading.RLock) -> None:
+        self._target = target
+        self._lock = lock
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+
+        return call
+
+
+def _load_checkpoint(store: Storage, key: str, source_id: str) -> CrawlCheckpoint:
+    checkpoint = CrawlCheckpoint.load(store, key)
+    if checkpoint is None:
+        raise ValueError(f"No checkpoint for run {key} (finished, or never checkpointed)")
+    if checkpoint.state["source_id"] != source_id:
+        raise ValueError(f"Run {key} crawled source {checkpoint.state['source_id']!r}, not {source_id!r}")
+    return checkpoint
+
+
+def _resumed_run(run_id: str, state: dict) -> RunStats:
+    return RunStats(
+        run_id=run_id,
+        started_at=datetime.fromisoformat(state["started_at"]),
+        finished_at=None,
+        total_seen=0,
+        added=0,
+        maintained=0,
+        removed=0,
+    )
+
+
+def _crawl_source(
+    *,
+    store: Storage,
+    run: RunStats,
+    job_source: JobSource,
+    checkpoint: CrawlCheckpoint,
+    embedder: EmbedderProtocol | None,
+    on_progress,
+    concurrency: int,
+    telemetry: CrawlTelemetry,
+) -> tuple[IncrementalCrawlResult, list[tuple[str, list[float]]]]:
+    """List, diff, fetch, embed and classify one source within ``run``.
+
+    The run parameters (categories, limit, delta) come from the checkpoint, so
+    a resumed source keeps its original ones. Returns the source's result and,
+    for delta runs, the new ``(job_uuid, embedding)`` pairs.
+    """
+    categories = checkpoint.state["categories"]
+    limit = checkpoint.state["limit"]
+    delta = checkpoint.state["delta"]
+
+    if checkpoint.phase == PHASE_LISTING:
+        listing_start = time.perf_counter()
+        existing = store.existing_job_uuids()
         seen = job_source.list_job_ids(
             categories=list(categories) if categories else None,
             limit=limit,
             on_progress=on_progress,
+            known_ids=existing if delta else None,
+            checkpoint=checkpoint,
         )
         seen_set = set(seen)
-        existing = store.existing_job_uuids()
         active = store.active_job_uuids()
+        if checkpoint.state.get("epoch_id"):
+            store.add_crawl_epoch_seen(checkpoint.state["epoch_id"], seen_set)
 
         added = sorted(seen_set - existing)
-        maintained = sorted(seen_set & existing)
+        # A delta listing is truncated, so "seen" is not the live universe.
+        maintained = sorted(seen_set & existing) if not delta else []
         # Only a *full crawl* can reliably infer removals. For multi-source, only
         # remove jobs from this source that are no longer listed.
-        is_full_universe = (categories is None) and (limit is None)
+        is_full_universe = (categories is None) and (limit is None) and not delta
         if is_full_universe and hasattr(store, "active_job_uuids_for_source"):
             active_for_source = store.active_job_uuids_for_source(job_source.source_id)
             removed = sorted(active_for_source - seen_set)
         else:
             removed = sorted(active - seen_set) if is_full_universe else []
 
-        store.record_statuses(run.run_id, added=added, maintained=maintained, removed=removed)
-        store.touch_jobs(run_id=run.run_id, job_uuids=maintained)
-        if removed:
-            store.deactivate_jobs(run_id=run.run_id, job_uuids=removed)
+        telemetry.add_time(TELEMETRY_PHASE_LISTING, time.perf_counter() - listing_start)
+        with telemetry.phase(PHASE_DB_WRITE):
+            store.record_statuses(run.run_id, added=added, maintained=maintained, removed=removed)
+            store.touch_jobs(run_id=run.run_id, job_uuids=maintained)
+            if removed:
+                store.deactivate_jobs(run_id=run.run_id, job_uuids=removed)
 
-        if added:
-            _embeddings_cache = (
-                EmbeddingsCache(store=store)
-                if os.getenv("ENABLE_EMBEDDINGS_CACHE", "1") in ("1", "true", "yes")
-                else None
+        listed_watermarks = (
+            job_source.listed_watermarks() if hasattr(job_source, "listed_watermarks") else {}
+        )
+        changed: list[str] = []
+        if listed_watermarks and maintained:
+            stored_watermarks = store.job_watermarks()
+            changed = [
+                job_uuid
+                for job_uuid in maintained
+                if job_uuid in listed_watermarks
+                and job_uuid in stored_watermarks
+                and listed_watermarks[job_uuid] != stored_watermarks[job_uuid]
+            ]
+            store.set_job_watermarks(
+                (job_uuid, listed_watermarks[job_uuid])
+                for job_uuid in maintained
+                if job_uuid not in stored_watermarks and job_uuid in listed_watermarks
             )
-            _embedder: EmbedderProtocol = (
-                embedder
-                if embedder is not None
-                else Embedder(EmbedderConfig(), embeddings_cache=_embeddings_cache)
+
+        if hasattr(job_source, "retain_listed"):
+            # Listed search results are only needed for the jobs fetched below.
+            job_source.retain_listed([*added, *changed])
+
+        # The watermark rides along as payload and is stored once the job is fetched.
+        checkpoint.mark_with_payload(STAGE_ADDED, ((u, listed_watermarks.get(u)) for u in added))
+        checkpoint.mark_with_payload(STAGE_CHANGED, ((u, listed_watermarks.get(u)) for u in changed))
+        checkpoint.mark(STAGE_MAINTAINED, maintained)
+        checkpoint.mark(STAGE_REMOVED, removed)
+        checkpoint.advance(PHASE_DIFFED, total_seen=len(seen_set))
+        total_seen = len(seen_set)
+    else:
+        # The diff was already applied; only the per-job work is left.
+        total_seen = checkpoint.state["total_seen"]
+        listed_watermarks = {
+            job_uuid: watermark
+            for stage in (STAGE_ADDED, STAGE_CHANGED)
+            for job_uuid, watermark in checkpoint.items(stage).items()
+            if watermark
+        }
+        added = sorted(checkpoint.items(STAGE_ADDED))
+        changed = sorted(checkpoint.items(STAGE_CHANGED))
+        maintained = sorted(checkpoint.items(STAGE_MAINTAINED))
+        removed = sorted(checkpoint.items(STAGE_REMOVED))
+
+    # Only delta runs keep embeddings around (for the warm pool update);
+    # otherwise each batch is dropped once stored, so memory stays bounded.
+    embedded: list[tuple[str, list[float]]] = []  # (job_uuid, embedding)
+    if added or changed:
+        _embedder = embedder if embedder is not None else default_embedder(store)
+        batch_size = embed_batch_size(_embedder)
+
+        fetched_before = checkpoint.items(STAGE_FETCHED)  # job_uuid -> job_text
+        embedded_before = set(checkpoint.items(STAGE_EMBEDDED))
+        classified_before = set(checkpoint.items(STAGE_CLASSIFIED))
+
+        def _classify(batch: list[tuple[str, list[float]]]) -> None:
+            if batch and classify_and_store(store, batch, telemetry=telemetry):
+                checkpoint.mark(STAGE_CLASSIFIED, [job_uuid for job_uuid, _ in batch])
+            if delta:
+                embedded.extend(batch)
+
+        # Jobs a previous attempt embedded but did not classify (embeddings are already stored).
+        _classify(store.get_job_embeddings_for_uuids(sorted(embedded_before - classified_before)))
+
+        # Jobs a previous attempt fetched but did not get to embed.
+        pending_embed: list[tuple[str, str]] = [  # (job_uuid, job_text)
+            (job_uuid, job_text)
+            for job_uuid, job_text in fetched_before.items()
+            if job_text and job_uuid not in embedded_before
+        ]
+        fetched_marks: list[tuple[str, str | None]] = []
+        watermark_marks: list[tuple[str, str]] = []
+
+        def _flush_fetched() -> None:
+            nonlocal fetched_marks, watermark_marks
+            store.set_job_watermarks(watermark_marks)
+            checkpoint.mark_with_payload(STAGE_FETCHED, fetched_marks)
+            fetched_marks, watermark_marks = [], []
+
+        def _embed_pending() -> None:
+            nonlocal pending_embed
+            # A job is only checkpointed as embedded after it is checkpointed as fetched.
+            _flush_fetched()
+            batch, pending_embed = pending_embed, []
+            _classify(
+                embed_and_store(
+                    store,
+                    _embedder,
+                    batch,
+                    on_batch=lambda job_uuids: checkpoint.mark(STAGE_EMBEDDED, job_uuids),
+                    telemetry=telemetry,
+                )
             )
-            cfg = getattr(_embedder, "config", None)
-            batch_size = cfg.batch_size if cfg and hasattr(cfg, "batch_size") else 32
 
-            # Phase 1: Fetch job details and upsert (no embeddings yet)
-            jobs_to_embed: list[tuple[NormalizedJob, str]] = []  # (normalized, job_text)
-            for external_id in added:
-                normalized = job_source.get_job_detail(external_id)
+        # Fetch, embed, classify and store as overlapping stages: details keep
+        # arriving on the fetcher thread (bounded by its buffer) while each full
+        # batch is embedded, classified and written here.
+        to_fetch = [job_uuid for job_uuid in added + changed if job_uuid not in fetched_before]
+        try:
+            for fetched in iter_job_details(
+                job_source, to_fetch, concurrency=concurrency, on_latency=telemetry.record_fetch
+            ):
+                if fetched.job is None:
+                    print(f"Warning: Failed to fetch job {fetched.job_id}: {fetched.error}")
+                    continue
+                normalized = fetched.job
                 job_uuid = normalized.job_uuid
                 job_text = build_job_text_from_normalized(normalized)
 
-                store.upsert_new_job_detail(
-                    run_id=run.run_id,
-                    job_uuid=job_uuid,
-                    title=normalized.title,
-                    company_name=normalized.company_name,
-                    location=normalized.location,
-                    job_url=normalized.job_url,
-                    job_source=normalized.source_id,
-                    skills=normalized.skills or None,
-                    raw_json=None,
-                    categories=normalized.categories or None,
-                    employment_types=normalized.employment_types or None,
-                    position_levels=normalized.position_levels or None,
-                    salary_min=normalized.salary_min,
-                    salary_max=normalized.salary_max,
-                    posted_date=normalized.posted_date,
-                    expiry_date=normalized.expiry_date,
-                    min_years_experience=normalized.min_years_experience,
-                )
+                with telemetry.phase(PHASE_DB_WRITE):
+                    upsert_normalized_job(store, run.run_id, normalized)
 
+                fetched_marks.append((job_uuid, job_text or None))
+                if job_uuid in listed_watermarks:
+                    watermark_marks.append((job_uuid, listed_watermarks[job_uuid]))
                 if job_text:
-                    jobs_to_embed.append((normalized, job_text))
-
-            # Phase 2: Batch embed and upsert (10–30x faster than one-by-one with GPU)
-            embedded: list[tuple[str, list[float]]] = []  # (job_uuid, embedding)
-            for i in range(0, len(jobs_to_embed), batch_size):
-                batch = jobs_to_embed[i : i + batch_size]
-                texts = [jt for _, jt in batch]
-                try:
-                    embeddings = _embedder.embed_texts(texts)
-                    for (normalized, _), emb in zip(batch, embeddings):
-                        store.upsert_embedding(
-                            job_uuid=normalized.job_uuid,
-                            model_name=_embedder.model_name,
-                            embedding=emb,
-                        )
-                        embedded.append((normalized.job_uuid, emb))
-                except Exception as e:
-                    for normalized, _ in batch:
-                        print(f"Warning: Failed to generate embedding for job {normalized.job_uuid}: {e}")
-
-            # Phase 3: Classify all new jobs in one batch (role cluster + experience tier + multi-label)
-            if embedded:
-                try:
-                    import numpy as np
-                    from mcf.lib.classifiers import classify_jobs, classify_jobs_multilabel
-
-                    emb_matrix = np.array([e for _, e in embedded], dtype=np.float32)
-                    classifications_raw = classify_jobs(emb_matrix)
-                    classifications = [
-                        (job_uuid, role_cluster, predicted_tier)
-                        for (job_uuid, _), (role_cluster, predicted_tier)
-                        in zip(embedded, classifications_raw)
-                    ]
-                    store.batch_upsert_job_classifications(classifications)
-
-                    multi_labels = classify_jobs_multilabel(emb_matrix)
-                    store.batch_upsert_multi_label_clusters(
-                        [(job_uuid, clusters) for (job_uuid, _), clusters in zip(embedded, multi_labels)]
-                    )
-                except Exception as e:
-                    print(f"Warning: job classification failed, skipping: {e}")
+                    pending_embed.append((job_uuid, job_text))
+                if len(pending_embed) >= batch_size:
+                    _embed_pending()
+                elif len(fetched_marks) >= _CHECKPOINT_FLUSH_SIZE:
+                    _flush_fetched()
+            _embed_pending()
+        finally:
+            if embedder is None and hasattr(_embedder, "close"):
+                _embedder.close()  # worker processes of a default ProcessPoolEmbedder
+
+    result = IncrementalCrawlResult(
+        run=run,
+        total_seen=total_seen,
+        added=added,
+        maintained=maintained,
+        removed=removed,
+        updated=changed,
+    )
+    return result, embedded
 
-        store.update_daily_stats(run.run_id)
-        store.delete_inactive_job_embeddings()
-        store.finish_run(
-            run.run_id,
-            total_seen=len(seen_set),
-            added=len(added),
-            maintained=len(maintained),
-            removed=len(removed),
-        )
 
-        # Refresh dashboard materialized views (Postgres only)
-        if hasattr(store, "refresh_dashboard_materialized_views"):
-            try:
-                store.refresh_dashboard_materialized_views()
-            except Exception:
-                pass  # Non-fatal; dashboard may use fallback queries
+def start_crawl_epoch(
+    store: Storage,
+    *,
+    shards: int,
+    rate_limit: float = 4.0,
+) -> tuple[str, list[Shard]]:
+    """Plan a full MCF crawl split into ``shards`` balanced shards and store it as an epoch.
 
-        # Invalidate active jobs pool cache when same process runs API + crawl
-        try:
-            from mcf.api.active_jobs_pool_cache import invalidate
+    Each shard is then crawled with ``run_incremental_crawl(epoch_id=...,
+    shard=...)``, in any order and in parallel. Returns the epoch ID and plan.
+    An epoch always covers every category: the shard that finishes it removes
+    any active MCF job no shard listed.
+    """
+    client = MCFClient(rate_limit=rate_limit, limiter=shared_limiter("mcf", rate_limit))
+    try:
+        measured = partition_totals(client)
+    finally:
+        client.close()
+    plan = plan_shards(measured.totals, shards)
+    epoch_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    store.create_crawl_epoch(
+        epoch_id,
+        "mcf",
+        {
+            "shards": [list(shard.partitions) for shard in plan],
+            "estimated_jobs": [shard.estimated_jobs for shard in plan],
+            "split": measured.split,
+        },
+    )
+    return epoch_id, plan
 
-            invalidate()
-        except ImportError:
-            pass
 
-        # Notify Next.js + FastAPI to invalidate caches (webhook)
-        _notify_crawl_complete()
+def _epoch_shard_partitions(store: Storage, epoch_id: str, shard: int | None, source_id: str) -> list[str]:
+    epoch = store.get_crawl_epoch(epoch_id)
+    if epoch is None:
+        raise ValueError(f"No crawl epoch {epoch_id}")
+    if epoch["source_id"] != source_id:
+        raise ValueError(f"Epoch {epoch_id} is for source {epoch['source_id']!r}, not {source_id!r}")
+    plan_shards_ = epoch["plan"]["shards"]
+    if shard is None or not 0 <= shard < len(plan_shards_):
+        raise ValueError(f"Epoch {epoch_id} has shards 0..{len(plan_shards_) - 1}; got {shard}")
+    return plan_shards_[shard]
+
+
+def _finish_epoch_shard(
+    store: Storage, run: RunStats, state: dict, result: IncrementalCrawlResult
+) -> IncrementalCrawlResult:
+    """Record a finished epoch shard; the last one to finish applies the epoch's removals.
+
+    A job is removed when it is active for the source but no shard listed it
+    (and no other run saw it since the epoch began). Skipped when any listing
+    was truncated by the search cap, since missing jobs may still be live.
+    When the plan split categories by position level, only jobs stored with a
+    category that was listed unsplit are removed (see :mod:`mcf.lib.crawler.shards`).
+    """
+    epoch_id, shard = state["epoch_id"], state["shard"]
+    truncated = state.get("truncated") or []
+    store.finish_crawl_epoch_shard(epoch_id, shard, run_id=run.run_id, truncated=bool(truncated))
+    epoch = store.get_crawl_epoch(epoch_id)
+    n_shards = len(epoch["plan"]["shards"])
+    if len(epoch["shards"]) < n_shards:
+        print(f"Epoch {epoch_id}: {len(epoch['shards'])} of {n_shards} shards finished")
+        return result
+    if not store.claim_crawl_epoch_finish(epoch_id):
+        return result  # another shard finished the epoch
+
+    incomplete = list(epoch["plan"].get("incomplete") or [])
+    incomplete += [f"shard {k}" for k, info in sorted(epoch["shards"].items()) if info["truncated"]]
+    if incomplete:
+        print(f"Warning: epoch {epoch_id} did not list every job ({', '.join(incomplete)}); removals skipped")
+        return result
+
+    source_id = epoch["source_id"]
+    if hasattr(store, "active_job_uuids_for_source"):
+        active = store.active_job_uuids_for_source(source_id)
+    else:
+        active = store.active_job_uuids()
+    removed = sorted(active - store.get_crawl_epoch_seen(epoch_id))
+    split = epoch["plan"].get("split") or []
+    if split and removed:
+        listed_whole = {p for partitions in epoch["plan"]["shards"] for p in partitions if PARTITION_SEP not in p}
+        job_categories = store.get_job_categories(removed)
+        kept = [u for u in removed if not listed_whole.intersection(job_categories.get(u) or [])]
+        if kept:
+            print(
+                f"Epoch {epoch_id}: keeping {len(kept)} unlisted jobs that may belong to categories "
+                f"listed by position level ({', '.join(split)})"
+            )
+            removed = sorted(set(removed) - set(kept))
+    if removed:
+        store.record_statuses(run.run_id, added=[], maintained=[], removed=removed)
+        store.deactivate_jobs(run_id=run.run_id, job_uuids=removed)
+    print(f"Epoch {epoch_id} finished: {len(removed)} jobs removed")
+    return replace(result, removed=sorted(set(result.removed) | set(removed)))
+
 
-        # Update DB cache timestamp (Postgres only)
-        if hasattr(store, "update_crawl_completed_timestamp"):
+def _finish_run(
+    store: Storage,
+    run: RunStats,
+    results: Sequence[IncrementalCrawlResult],
+    telemetry: CrawlTelemetry | None = None,
+) -> RunStats:
+    """Record the totals (and telemetry) of every source crawled in ``run`` and close it."""
+    total_seen = sum(r.total_seen for r in results)
+    added = sum(len(r.added) for r in results)
+    maintained = sum(len(r.maintained) for r in results)
+    removed = sum(len(r.removed) for r in results)
+    store.update_daily_stats(run.run_id)
+    store.delete_inactive_job_embeddings()
+    store.finish_run(
+        run.run_id,
+        total_seen=total_seen,
+        added=added,
+        maintained=maintained,
+        removed=removed,
+        telemetry=telemetry.to_dict() if telemetry else None,
+    )
+    return RunStats(
+        run_id=run.run_id,
+        started_at=run.started_at,
+        finished_at=None,
+        total_seen=total_seen,
+        added=added,
+        maintained=maintained,
+        removed=removed,
+    )
+
+
+def _after_crawl(store: Storage, *, delta: bool, embedded: Sequence[tuple[str, list[float]]]) -> None:
+    """Refresh or grow the caches that depend on the jobs table."""
+    if delta:
+        # Delta runs only add jobs: grow the warm pools in place and leave the
+        # dashboard views and other caches to the next full crawl.
+        if embedded:
+            now = datetime.now(timezone.utc)
             try:
-                store.update_crawl_completed_timestamp()
-            except Exception:
+                from mcf.api.active_jobs_pool_cache import add_jobs
+
+                add_jobs([(job_uuid, emb, now) for job_uuid, emb in embedded])
+            except ImportError:
                 pass
+            _notify_jobs_added([job_uuid for job_uuid, _ in embedded])
+        return
 
-        final_run = RunStats(
-            run_id=run.run_id,
-            started_at=run.started_at,
-            finished_at=None,
-            total_seen=len(seen_set),
-            added=len(added),
-            maintained=len(maintained),
-            removed=len(removed),
-        )
-        return IncrementalCrawlResult(
-            run=final_run,
-            total_seen=len(seen_set),
-            added=added,
-            maintained=maintained,
-            removed=removed,
-        )
-    finally:
-        pass  # Store cleanup handled by caller
+    # Refresh dashboard materialized views (Postgres only)
+    if hasattr(store, "refresh_dashboard_materialized_views"):
+        try:
+            store.refresh_dashboard_materialized_views()
+        except Exception:
+            pass  # Non-fatal; dashboard may use fallback queries
+
+    # Invalidate active jobs pool cache when same process runs API + crawl
+    try:
+        from mcf.api.active_jobs_pool_cache import invalidate
 
+        invalidate()
+    except ImportError:
+        pass
+
+    # Notify Next.js + FastAPI to invalidate caches (webhook)
+    _notify_crawl_complete()
+
+    # Update DB cache timestamp (Postgres only)
+    if hasattr(store, "update_crawl_completed_timestamp"):
+        try:
+            store.update_crawl_completed_timestamp()
+        except Exception:
+            pass
@@ -0,0 +1,134 @@
+"""Rebuild job rows, embeddings and classifications from the raw archive.
+
+Replays the newest archived response of every active job through the current
+source normalizers (``normalize_raw``), so a normalizer fix reaches the whole
+database at disk speed with no API calls. Rows are rewritten with
+``update_job_details``, which leaves ``last_seen_*`` alone: a reparse is not a
+sighting, so it cannot keep a job that disappeared upstream from being
+removed. Jobs are written, embedded and classified in batches; embeddings go
+through the usual embeddings cache, so jobs whose text did not change are not
+re-encoded.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from mcf.lib.embeddings.job_text import build_job_text_from_normalized
+from mcf.lib.pipeline.incremental_crawl import (
+    classify_and_store,
+    default_embedder,
+    embed_and_store,
+    embed_batch_size,
+    job_detail_fields,
+)
+from mcf.lib.storage.base import RunStats
+
+if TYPE_CHECKING:
+    from mcf.lib.archive.raw_archive import RawArchive
+    from mcf.lib.embeddings.base import EmbedderProtocol
+    from mcf.lib.storage.base import Storage
+
+# Reparsed jobs are written (and embedded) in batches of at least this size.
+_BATCH_SIZE = 200
+
+@dataclass(frozen=True)
+class ReparseResult:
+    run: RunStats
+    reparsed: int
+    skipped: int
+    """Archived jobs not reparsed: inactive, unknown source, or older than the stored row."""
+    failed: int
+    embedded: int
+
+
+def run_reparse(
+    *,
+    store: Storage,
+    archive: RawArchive,
+    sources: Sequence,
+    embedder: EmbedderProtocol | None = None,
+    source_id: str | None = None,
+    embed: bool = True,
+    limit: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> ReparseResult:
+    """Re-normalize active jobs from ``archive`` and write them back to ``store``.
+
+    ``sources`` supply ``normalize_raw(raw, job_uuid)`` per ``source_id``.
+    Restrict to one source with ``source_id``. With ``embed=False`` only the
+    job rows are rebuilt. ``on_progress(done, total)`` is called per job.
+    """
+    normalizers = {source.source_id: source for source in sources}
+    active = store.active_job_uuids()
+    stored_watermarks = store.job_watermarks()
+
+    latest = archive.latest(source_id)
+    records = [
+        record
+        for record in latest.values()
+        if record.job_uuid in active
+        and record.source_id in normalizers
+        # Never replace a row with an older version of the job.
+        and not (
+            record.updated_at
+            and record.job_uuid in stored_watermarks
+            and record.updated_at < stored_watermarks[record.job_uuid]
+        )
+    ]
+    records.sort(key=lambda record: record.job_uuid)
+    if limit:
+        records = records[:limit]
+
+    run = store.begin_run(kind="reparse", categories=None)
+    _embedder = (embedder or default_embedder(store)) if embed else None
+    batch_size = max(_BATCH_SIZE, embed_batch_size(_embedder)) if _embedder is not None else _BATCH_SIZE
+    pending_details: list[dict] = []
+    pending_watermarks: list[tuple[str, str]] = []
+    pending_embed: list[tuple[str, str]] = []  # (job_uuid, job_text)
+    failed = embedded_count = 0
+
+    def _flush() -> None:
+        nonlocal pending_details, pending_watermarks, pending_embed, embedded_count
+        store.update_job_details(pending_details)
+        store.set_job_watermarks(pending_watermarks)
+        batch, pending_details, pending_watermarks, pending_embed = pending_embed, [], [], []
+        if batch:
+            embedded = embed_and_store(store, _embedder, batch)
+            embedded_count += len(embedded)
+            if embedded:
+                classify_and_store(store, embedded)
+
+    try:
+        for i, record in enumerate(records, 1):
+            try:
+                normalized = normalizers[record.source_id].normalize_raw(record.raw, record.job_uuid)
+            except Exception as e:
+                failed += 1
+                print(f"Warning: Failed to reparse job {record.job_uuid}: {e}")
+                continue
+            pending_details.append(job_detail_fields(normalized))
+            if record.updated_at:
+                pending_watermarks.append((record.job_uuid, record.updated_at))
+            job_text = build_job_text_from_normalized(normalized)
+            if _embedder is not None and job_text:
+                pending_embed.append((record.job_uuid, job_text))
+            if len(pending_details) >= batch_size:
+                _flush()
+            if on_progress:
+                on_progress(i, len(records))
+        _flush()
+    finally:
+        if embedder is None and _embedder is not None and hasattr(_embedder, "close"):
+            _embedder.close()
+
+    reparsed = len(records) - failed
+    store.finish_run(run.run_id, total_seen=len(records), added=0, maintained=reparsed, removed=0)
+    return ReparseResult(
+        run=run,
+        reparsed=reparsed,
+        skipped=len(latest) - len(records),
+        failed=failed,
+        embedded=embedded_count,
+    )
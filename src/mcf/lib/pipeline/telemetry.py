@@ -0,0 +1,110 @@
+"""Per-run crawl telemetry, stored with the run by ``finish_run``.
+
+A :class:`CrawlTelemetry` collects, for one crawl run:
+
+- wall time per phase: ``listing`` (list + diff), ``embed``, ``classify`` and
+  ``db_write`` (job, embedding, classification and status writes)
+- detail-fetch latency per source call (including rate-limiter waits), as a
+  histogram plus p50/p95/max
+- embedding throughput (texts and texts/sec)
+- HTTP counters since the run started (requests, retries, 403s and other
+  throttles, errors, bytes downloaded; see :mod:`mcf.lib.api.http_stats`)
+
+``mcf runs --stats`` and ``GET /api/admin/crawl-runs`` read it back, so
+throughput can be compared between daily runs. Multi-source runs share one
+instance, so phase times there are summed over the sources. A resumed run
+only reports the attempt that finished it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+from mcf.lib.api.http_stats import HTTP_STATS
+
+PHASE_LISTING = "listing"
+PHASE_EMBED = "embed"
+PHASE_CLASSIFY = "classify"
+PHASE_DB_WRITE = "db_write"
+
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+"""Upper bounds of the detail-fetch latency histogram buckets (plus one overflow bucket)."""
+
+
+class CrawlTelemetry:
+    """Thread-safe timings and counters for one crawl run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._http_before = HTTP_STATS.snapshot()
+        self._phases: dict[str, float] = defaultdict(float)
+        self._latencies: list[float] = []
+        self._embedded = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the time spent in the ``with`` block to phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._phases[name] += seconds
+
+    def record_fetch(self, seconds: float) -> None:
+        """Record the latency of one detail-fetch source call."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def record_embed(self, texts: int, seconds: float) -> None:
+        with self._lock:
+            self._embedded += texts
+            self._phases[PHASE_EMBED] += seconds
+
+    def to_dict(self) -> dict:
+        """JSON-ready summary of the run so far."""
+        with self._lock:
+            phases = {name: round(seconds, 3) for name, seconds in self._phases.items()}
+            latencies_ms = sorted(seconds * 1000 for seconds in self._latencies)
+            embedded = self._embedded
+            embed_seconds = self._phases.get(PHASE_EMBED, 0.0)
+        return {
+            "wall_seconds": round(time.monotonic() - self._started, 3),
+            "phases": phases,
+            "detail_fetch": _latency_summary(latencies_ms),
+            "embed": {
+                "texts": embedded,
+                "seconds": round(embed_seconds, 3),
+                "texts_per_sec": round(embedded / embed_seconds, 1) if embed_seconds > 0 else None,
+            },
+            "http": HTTP_STATS.since(self._http_before),
+        }
+
+
+def _latency_summary(latencies_ms: list[float]) -> dict:
+    histogram = {f"<={bound}": 0 for bound in LATENCY_BUCKETS_MS}
+    histogram[f">{LATENCY_BUCKETS_MS[-1]}"] = 0
+    for ms in latencies_ms:
+        bound = next((b for b in LATENCY_BUCKETS_MS if ms <= b), None)
+        histogram[f"<={bound}" if bound is not None else f">{LATENCY_BUCKETS_MS[-1]}"] += 1
+
+    def _pct(p: float) -> float | None:
+        if not latencies_ms:
+            return None
+        return round(latencies_ms[min(len(latencies_ms) - 1, int(p * len(latencies_ms)))], 1)
+
+    return {
+        "calls": len(latencies_ms),
+        "p50_ms": _pct(0.5),
+        "p95_ms": _pct(0.95),
+        "max_ms": round(latencies_ms[-1], 1) if latencies_ms else None,
+        "histogram_ms": histogram,
+    }
@@ -0,0 +1,13 @@
+"""Offline replay of the MCF and Careers@Gov APIs for crawl benchmarks."""
+
+from mcf.lib.replay.benchmark import CrawlBenchmarkResult, HashEmbedder, run_crawl_benchmark
+from mcf.lib.replay.server import ReplayConfig, ReplayFixtures, ReplayServer
+
+__all__ = [
+    "CrawlBenchmarkResult",
+    "HashEmbedder",
+    "ReplayConfig",
+    "ReplayFixtures",
+    "ReplayServer",
+    "run_crawl_benchmark",
+]
@@ -0,0 +1,139 @@
+"""End-to-end crawl throughput benchmark against the replay server.
+
+:func:`run_crawl_benchmark` starts a :class:`ReplayServer`, points the clients
+at it, runs :func:`run_incremental_crawl` into a scratch DuckDB and reports
+jobs/sec overall and per phase from the run's telemetry (see
+:mod:`mcf.lib.pipeline.telemetry`). Nothing touches the live APIs, the real
+database or the raw archive, so results are comparable between commits.
+
+By default jobs are embedded with :class:`HashEmbedder`, which costs almost
+nothing, so the numbers measure the crawler; pass a real embedder to include
+model time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from mcf.lib.api.rate_limit import AdaptiveTokenBucket
+from mcf.lib.archive.raw_archive import ARCHIVE_DIR_ENV
+from mcf.lib.embeddings.base import EmbedderProtocol
+from mcf.lib.pipeline.incremental_crawl import run_incremental_crawl
+from mcf.lib.replay.server import ReplayConfig, ReplayFixtures, ReplayServer
+from mcf.lib.sources.cag_source import CareersGovJobSource
+from mcf.lib.sources.mcf_source import MCFJobSource
+from mcf.lib.storage.duckdb_store import DuckDBStore
+
+
+class HashEmbedder:
+    """Deterministic, model-free embedder (unit vectors from a hash of the text)."""
+
+    model_name = "hash-benchmark"
+
+    def __init__(self, dims: int = 768) -> None:
+        self.dims = dims
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_text(text) for text in texts]
+
+    def embed_text(self, text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        raw = [digest[i % len(digest)] - 127.5 for i in range(self.dims)]
+        norm = sum(x * x for x in raw) ** 0.5
+        return [x / norm for x in raw]
+
+    def embed_query(self, query: str) -> list[float]:
+        return self.embed_text(query)
+
+    def embed_resume(self, text: str, chunk_size: int = 400, overlap: int = 80) -> list[float]:
+        return self.embed_text(text)
+
+
+@dataclass(frozen=True)
+class CrawlBenchmarkResult:
+    source_id: str
+    jobs: int
+    """Jobs ingested (added) by the benchmark run."""
+    wall_seconds: float
+    jobs_per_sec: dict[str, float | None]
+    """``overall`` plus one entry per telemetry phase (None when the phase took no time)."""
+    telemetry: dict
+    server_stats: dict[str, int]
+
+
+def run_crawl_benchmark(
+    fixtures: ReplayFixtures,
+    *,
+    config: ReplayConfig | None = None,
+    source: str = "mcf",
+    embedder: EmbedderProtocol | None = None,
+    concurrency: int = 8,
+    rate_limit: float | None = None,
+    search_ingest: bool = True,
+) -> CrawlBenchmarkResult:
+    """Crawl ``fixtures`` from a local replay server and measure throughput.
+
+    ``source`` is ``"mcf"`` or ``"cag"``. ``rate_limit`` (req/s) defaults to
+    unlimited. With ``search_ingest=False`` every job needs a detail request,
+    which is the path most sensitive to latency and faults.
+    """
+    with ReplayServer(fixtures, config) as server, tempfile.TemporaryDirectory() as tmp:
+        with _environ(server.environ(), unset=(ARCHIVE_DIR_ENV,)):
+            if source == "mcf":
+                job_source = MCFJobSource(
+                    limiter=AdaptiveTokenBucket(rate_limit),
+                    search_ingest=search_ingest,
+                )
+            elif source == "cag":
+                job_source = CareersGovJobSource(rate_limit=rate_limit or 0, search_ingest=search_ingest)
+            else:
+                raise ValueError(f"Unknown source {source!r} (expected 'mcf' or 'cag')")
+
+            store = DuckDBStore(str(Path(tmp) / "benchmark.duckdb"))
+            try:
+                result = run_incremental_crawl(
+                    store=store,
+                    source=job_source,
+                    embedder=embedder or HashEmbedder(),
+                    concurrency=concurrency,
+                )
+                telemetry = store.get_recent_runs(limit=1)[0]["telemetry"] or {}
+            finally:
+                job_source.close()
+                store.close()
+
+    jobs = len(result.added)
+    wall = telemetry.get("wall_seconds") or 0.0
+    rates: dict[str, float | None] = {"overall": round(jobs / wall, 1) if wall else None}
+    for phase, seconds in sorted(telemetry.get("phases", {}).items()):
+        rates[phase] = round(jobs / seconds, 1) if seconds else None
+    return CrawlBenchmarkResult(
+        source_id=job_source.source_id,
+        jobs=jobs,
+        wall_seconds=wall,
+        jobs_per_sec=rates,
+        telemetry=telemetry,
+        server_stats=dict(server.stats),
+    )
+
+
+@contextmanager
+def _environ(values: dict[str, str], *, unset: tuple[str, ...] = ()) -> Iterator[None]:
+    saved = {name: os.environ.get(name) for name in (*values, *unset)}
+    os.environ.update(values)
+    for name in unset:
+        os.environ.pop(name, None)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
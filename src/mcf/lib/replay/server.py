@@ -0,0 +1,316 @@
+"""Local stand-in for the MCF and Careers@Gov (Algolia) APIs.
+
+:class:`ReplayServer` serves recorded or synthetic job payloads on the routes
+the crawler uses:
+
+- ``POST /v2/search`` (``categories`` / ``positionLevels`` filters, newest
+  first, paged; no results past 10,000 like the live API)
+- ``GET /v2/jobs/{uuid}``
+- ``POST /1/indexes/{index}/query`` (Algolia search, up to 1000 hits)
+- ``GET /1/indexes/{index}/{objectID}``
+- ``POST /1/indexes/*/objects`` (Algolia multi-get)
+
+Point the clients at it with ``MCF_API_BASE_URL`` and ``CAG_ALGOLIA_BASE_URL``
+(see :meth:`ReplayServer.environ`). Every response can be delayed
+(``latency_ms`` plus up to ``jitter_ms``) and a share of detail requests fails
+with 403 or 503, so retry and throttling paths are exercised too.
+
+Fixtures come from the raw archive (``MCF_RAW_ARCHIVE_DIR``, see
+:mod:`mcf.lib.archive.raw_archive`) or are generated with
+:meth:`ReplayFixtures.synthetic` for CI, where no archive exists.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mcf.lib.api.client import BASE_URL_ENV
+from mcf.lib.archive.raw_archive import RawArchive
+from mcf.lib.categories import CATEGORIES, POSITION_LEVELS
+from mcf.lib.crawler.crawler import SEARCH_RESULT_CAP
+from mcf.lib.sources.cag_source import ALGOLIA_BASE_URL_ENV
+
+_ALGOLIA_MAX_HITS = 1000
+
+_WORDS = (
+    "data platform customer operations analytics cloud security finance audit "
+    "logistics design marketing sales research engineering software hardware "
+    "compliance training healthcare nursing teaching retail hospitality policy"
+).split()
+_SKILLS = (
+    "Python SQL Excel Java Communication Leadership Negotiation Accounting AutoCAD "
+    "Kubernetes Marketing Sales Teamwork Budgeting Procurement Nursing Teaching"
+).split()
+
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    """Latency and fault injection for a :class:`ReplayServer`."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_403_rate: float = 0.0
+    """Share of detail requests answered with 403 (MCF's throttle response)."""
+    error_5xx_rate: float = 0.0
+    """Share of detail requests answered with 503."""
+    faults_on_listing: bool = False
+    """Also inject faults into search requests (the CAG listing does not retry)."""
+    seed: int = 0
+
+
+@dataclass
+class ReplayFixtures:
+    """Raw payloads to serve: MCF jobs by UUID and Algolia objects by objectID."""
+
+    mcf_jobs: dict[str, dict] = field(default_factory=dict)
+    cag_objects: dict[str, dict] = field(default_factory=dict)
+
+    @classmethod
+    def from_archive(cls, archive: RawArchive) -> ReplayFixtures:
+        """Use the newest archived response of every job (details preferred)."""
+        fixtures = cls()
+        for record in archive.latest().values():
+            if record.source_id == "mcf":
+                fixtures.mcf_jobs[record.job_uuid] = record.raw
+            elif record.source_id == "cag":
+                object_id = record.job_uuid.removeprefix("cag:")
+                fixtures.cag_objects[object_id] = {**record.raw, "objectID": object_id}
+        return fixtures
+
+    @classmethod
+    def synthetic(cls, mcf: int = 1000, cag: int = 0, *, seed: int = 0) -> ReplayFixtures:
+        """Generate ``mcf`` MCF jobs and ``cag`` Algolia objects with complete fields."""
+        rnd = random.Random(seed)
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        fixtures = cls()
+        for i in range(mcf):
+            job_uuid = f"{rnd.getrandbits(128):032x}"
+            posted = now - timedelta(minutes=i * 7)
+            category = rnd.choice(CATEGORIES)
+            level = rnd.choice(POSITION_LEVELS)
+            salary_min = rnd.randrange(2000, 12000, 500)
+            fixtures.mcf_jobs[job_uuid] = {
+                "uuid": job_uuid,
+                "title": f"{rnd.choice(_WORDS).title()} {rnd.choice(_WORDS).title()} {level} #{i}",
+                "description": " ".join(rnd.choice(_WORDS) for _ in range(120)) + f" ref {i}",
+                "minimumYearsExperience": rnd.randint(0, 10),
+                "skills": [
+                    {"uuid": f"s{j}", "skill": skill, "isKeySkill": j < 2}
+                    for j, skill in enumerate(rnd.sample(_SKILLS, 5))
+                ],
+                "categories": [{"id": CATEGORIES.index(category) + 1, "category": category}],
+                "employmentTypes": [{"id": 1, "employmentType": "Full Time"}],
+                "positionLevels": [{"id": POSITION_LEVELS.index(level) + 1, "position": level}],
+                "salary": {
+                    "minimum": salary_min,
+                    "maximum": salary_min + 2000,
+                    "type": {"id": 4, "salaryType": "Monthly"},
+                },
+                "postedCompany": {"name": f"Company {rnd.randint(1, 500)}"},
+                "metadata": {
+                    "jobPostId": f"MCF-2026-{i:07d}",
+                    "isHideHiringEmployerName": False,
+                    "isPostedOnBehalf": False,
+                    "totalNumberJobApplication": rnd.randint(0, 200),
+                    "updatedAt": posted.isoformat(),
+                    "newPostingDate": posted.date().isoformat(),
+                    "expiryDate": (posted + timedelta(days=30)).date().isoformat(),
+                    "jobDetailsUrl": f"https://www.mycareersfuture.gov.sg/job/{job_uuid}",
+                    "isHideSalary": False,
+                },
+            }
+        for i in range(cag):
+            object_id = f"{15000000 + i}_{rnd.getrandbits(128):032x}"
+            fixtures.cag_objects[object_id] = {
+                "objectID": object_id,
+                "job_title": f"{rnd.choice(_WORDS).title()} Officer #{i}",
+                "agency_name": f"Agency {rnd.randint(1, 80)}",
+                "location": "Singapore",
+                "skills": rnd.sample(_SKILLS, 4),
+                "description": " ".join(rnd.choice(_WORDS) for _ in range(100)) + f" ref {i}",
+            }
+        return fixtures
+
+
+class ReplayServer:
+    """Threaded HTTP server for :class:`ReplayFixtures` (``port=0`` picks a free port).
+
+    Use as a context manager or call :meth:`start` / :meth:`stop`. Request and
+    injected-fault counts are in :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        fixtures: ReplayFixtures,
+        config: ReplayConfig | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.fixtures = fixtures
+        self.config = config or ReplayConfig()
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        # Newest first, like the live search sorted by new_posting_date.
+        self._mcf_order = sorted(
+            fixtures.mcf_jobs,
+            key=lambda u: ((fixtures.mcf_jobs[u].get("metadata") or {}).get("newPostingDate") or "", u),
+            reverse=True,
+        )
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environ(self) -> dict[str, str]:
+        """Environment variables that point the MCF and Careers@Gov clients here."""
+        return {BASE_URL_ENV: self.url, ALGOLIA_BASE_URL_ENV: self.url}
+
+    def start(self) -> ReplayServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> ReplayServer:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- request handling ---
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _fault(self, listing: bool) -> int | None:
+        if listing and not self.config.faults_on_listing:
+            return None
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.config.error_403_rate:
+            self._count("injected_403")
+            return 403
+        if roll < self.config.error_403_rate + self.config.error_5xx_rate:
+            self._count("injected_5xx")
+            return 503
+        return None
+
+    def _delay(self) -> None:
+        delay_ms = self.config.latency_ms
+        if self.config.jitter_ms:
+            with self._lock:
+                delay_ms += self._random.uniform(0, self.config.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def handle(self, method: str, path: str, query: dict[str, str], body: dict) -> tuple[int, object]:
+        """Route one request; returns (status, JSON payload)."""
+        self._delay()
+        if method == "POST" and path == "/v2/search":
+            self._count("mcf_search")
+            return self._fault(listing=True) or 200, self._mcf_search(query, body)
+        if method == "GET" and (m := re.fullmatch(r"/v2/jobs/([^/]+)", path)):
+            self._count("mcf_detail")
+            if status := self._fault(listing=False):
+                return status, {"message": "injected fault"}
+            raw = self.fixtures.mcf_jobs.get(m.group(1))
+            return (200, raw) if raw is not None else (404, {"message": "Job not found"})
+        if method == "POST" and path == "/1/indexes/*/objects":
+            self._count("cag_multi_get")
+            if status := self._fault(listing=False):
+                return status, {"message": "injected fault"}
+            results = [self.fixtures.cag_objects.get(r.get("objectID")) for r in body.get("requests", [])]
+            return 200, {"results": results}
+        if method == "POST" and re.fullmatch(r"/1/indexes/[^/]+/query", path):
+            self._count("cag_search")
+            return self._fault(listing=True) or 200, self._cag_search(body)
+        if method == "GET" and (m := re.fullmatch(r"/1/indexes/[^/]+/(.+)", path)):
+            self._count("cag_detail")
+            if status := self._fault(listing=False):
+                return status, {"message": "injected fault"}
+            raw = self.fixtures.cag_objects.get(urllib.parse.unquote(m.group(1)))
+            return (200, raw) if raw is not None else (404, {"message": "ObjectID does not exist"})
+        self._count("unknown")
+        return 404, {"message": f"No replay route for {method} {path}"}
+
+    def _mcf_search(self, query: dict[str, str], body: dict) -> dict:
+        categories = set(body.get("categories") or [])
+        levels = set(body.get("positionLevels") or [])
+        matches = [
+            self.fixtures.mcf_jobs[u]
+            for u in self._mcf_order
+            if (not categories or categories & {c.get("category") for c in self.fixtures.mcf_jobs[u].get("categories", [])})
+            and (not levels or levels & {p.get("position") for p in self.fixtures.mcf_jobs[u].get("positionLevels", [])})
+        ]
+        limit = min(int(query.get("limit", 20)), 100)
+        start = int(query.get("page", 0)) * limit
+        page = matches[start : start + limit] if start < SEARCH_RESULT_CAP else []
+        return {"results": page, "total": len(matches), "countWithoutFilters": len(self.fixtures.mcf_jobs)}
+
+    def _cag_search(self, body: dict) -> dict:
+        keyword = (body.get("query") or "").lower()
+        hits = [
+            obj
+            for obj in self.fixtures.cag_objects.values()
+            if not keyword or keyword in (obj.get("job_title") or obj.get("Jobtitle") or "").lower()
+        ]
+        per_page = min(int(body.get("hitsPerPage", 20)), _ALGOLIA_MAX_HITS)
+        start = int(body.get("page", 0)) * per_page
+        return {"hits": hits[start : start + per_page], "nbHits": len(hits)}
+
+
+def _handler_for(server: ReplayServer) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the live APIs
+
+        def _serve(self, method: str) -> None:
+            parsed = urllib.parse.urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            except json.JSONDecodeError:
+                body = {}
+            query = dict(urllib.parse.parse_qsl(parsed.query))
+            status, payload = server.handle(method, parsed.path, query, body)
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            self._serve("GET")
+
+        def do_POST(self) -> None:
+            self._serve("POST")
+
+        def log_message(self, format: str, *args) -> None:
+            pass  # one line per request would drown the benchmark output
+
+    return _Handler
@@ -1,7 +1,21 @@
 """Job source abstractions for multi-source job aggregation."""
 
-from mcf.lib.sources.base import JobSource, NormalizedJob
+from mcf.lib.sources.base import (
+    AsyncBatchJobSource,
+    AsyncJobSource,
+    BatchJobSource,
+    JobSource,
+    NormalizedJob,
+)
 from mcf.lib.sources.cag_source import CareersGovJobSource
 from mcf.lib.sources.mcf_source import MCFJobSource
 
-__all__ = ["JobSource", "NormalizedJob", "MCFJobSource", "CareersGovJobSource"]
+__all__ = [
+    "JobSource",
+    "BatchJobSource",
+    "AsyncJobSource",
+    "AsyncBatchJobSource",
+    "NormalizedJob",
+    "MCFJobSource",
+    "CareersGovJobSource",
+]
@@ -41,6 +41,11 @@ class JobSource(Protocol):
     """Protocol for job data sources.
 
     Implement this to add a new job source (e.g. LinkedIn, Indeed).
+
+    Only per-job :meth:`get_job_detail` is required. A source with a cheaper
+    way to fetch many jobs can also implement the optional methods of
+    :class:`BatchJobSource`, :class:`AsyncJobSource` or
+    :class:`AsyncBatchJobSource`; the pipeline uses the best one available.
     """
 
     @property
@@ -54,6 +59,8 @@ class JobSource(Protocol):
         categories: Sequence[str] | None = None,
         limit: int | None = None,
         on_progress=None,
+        known_ids: set[str] | None = None,
+        checkpoint=None,
     ) -> list[str]:
         """List job IDs from this source.
 
@@ -67,6 +74,14 @@ class JobSource(Protocol):
         ``"{source_id}:"`` (e.g. ``"cag:15219929_005056a3-..."``).  The source
         implementation is responsible for applying (and later stripping) this
         prefix in :meth:`get_job_detail`.
+
+        ``known_ids`` requests delta listing: a source that can list newest
+        first may stop early once it only sees IDs in this set. Sources that
+        cannot do that simply ignore it and return the full listing.
+
+        ``checkpoint`` (a ``mcf.lib.crawler.crawler.ListingCheckpoint``) lets a
+        paginated source record its progress and resume an interrupted listing.
+        Sources whose listing is cheap may ignore it.
         """
         ...
 
@@ -80,3 +95,45 @@ class JobSource(Protocol):
                 the prefix before calling their upstream API.
         """
         ...
+
+
+class BatchJobSource(JobSource, Protocol):
+    """Optional bulk detail fetching, for sources with a multi-get API.
+
+    The pipeline (``mcf.lib.pipeline.detail_fetch.iter_job_details``) checks
+    for these methods with ``hasattr`` and prefers them over per-job calls,
+    so a source only has to implement them to get its cheapest bulk path.
+    """
+
+    def get_job_details(self, job_uuids: Sequence[str]) -> Sequence[NormalizedJob | None]:
+        """Fetch many jobs at once.
+
+        Returns one entry per input ID, in the same order, with ``None`` for a
+        job that no longer exists. An upstream error may fail the whole call;
+        the pipeline then reports (or, if throttled, retries) every ID in it.
+        """
+        ...
+
+
+class AsyncJobSource(JobSource, Protocol):
+    """Optional async detail fetching; the pipeline runs many calls concurrently."""
+
+    async def aget_job_detail(self, job_uuid: str) -> NormalizedJob:
+        """Async variant of :meth:`JobSource.get_job_detail`."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release async resources; called on the same event loop when fetching ends."""
+        ...
+
+
+class AsyncBatchJobSource(JobSource, Protocol):
+    """Optional async bulk fetching; the pipeline runs several batches concurrently."""
+
+    async def aget_job_details(self, job_uuids: Sequence[str]) -> Sequence[NormalizedJob | None]:
+        """Async variant of :meth:`BatchJobSource.get_job_details`."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release async resources; called on the same event loop when fetching ends."""
+        ...
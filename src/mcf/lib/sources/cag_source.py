@@ -5,14 +5,19 @@ Uses the Algolia search index to list job IDs and fetch full job details.
 
 from __future__ import annotations
 
+import asyncio
 import os
 import re
+import threading
 import time
 import urllib.parse
-from typing import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Sequence
 
 import httpx
 
+from mcf.lib.api.http_stats import HTTP_STATS
+from mcf.lib.archive.raw_archive import KIND_DETAIL, KIND_SEARCH, RawArchive, default_archive
 from mcf.lib.sources.base import NormalizedJob
 
 # ---------------------------------------------------------------------------
@@ -21,12 +26,18 @@ from mcf.lib.sources.base import NormalizedJob
 
 _ALGOLIA_APP_ID = os.environ.get("CAG_ALGOLIA_APP_ID", "3OW7D8B4IZ")
 _ALGOLIA_INDEX = "job_index"
-_ALGOLIA_SEARCH_URL = (
-    f"https://{_ALGOLIA_APP_ID.lower()}-dsn.algolia.net/1/indexes/{_ALGOLIA_INDEX}/query"
-)
-_ALGOLIA_OBJECT_URL = (
-    f"https://{_ALGOLIA_APP_ID.lower()}-dsn.algolia.net/1/indexes/{_ALGOLIA_INDEX}/"
-)
+# Points the source at another host, e.g. the offline replay server (mcf.lib.replay).
+ALGOLIA_BASE_URL_ENV = "CAG_ALGOLIA_BASE_URL"
+
+
+def _algolia_url(path: str) -> str:
+    """Algolia URL for ``path`` (read per request, so ``$CAG_ALGOLIA_BASE_URL`` can change)."""
+    base = os.getenv(ALGOLIA_BASE_URL_ENV) or f"https://{_ALGOLIA_APP_ID.lower()}-dsn.algolia.net"
+    return f"{base.rstrip('/')}/1/indexes/{path}"
+
+
+# Algolia's multi-object retrieval accepts at most 1000 objects per request.
+_MULTI_GET_MAX = 1000
 _ALGOLIA_HEADERS = {
     "x-algolia-application-id": _ALGOLIA_APP_ID,
     "x-algolia-api-key": os.environ.get("CAG_ALGOLIA_API_KEY", "32fa71d8b0bc06be1e6395bf8c430107"),
@@ -81,6 +92,32 @@ _LIST_KEYWORDS = [
     "environment",
 ]
 
+# Every attribute read by CareersGovJobSource.normalize_raw, so a search hit
+# carrying them can be normalized without a detail request.
+_NORMALIZER_ATTRIBUTES = [
+    "objectID",
+    "job_title",
+    "Jobtitle",
+    "agency_name",
+    "Agncy",
+    "agencytitle",
+    "location",
+    "LocationTxt",
+    "skills",
+    "job_skills",
+    "job_url",
+    "url",
+    "apply_url",
+    "application_url",
+    "description",
+    "job_description",
+    "Jobdesc",
+    "responsibilities",
+    "requirements",
+    "Jobreq",
+    "Jobres",
+]
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -150,6 +187,15 @@ def _build_description(raw: dict) -> str | None:
     return " ".join(words[:150]) if words else None
 
 
+def _multi_get_payload(job_uuids: Sequence[str]) -> dict:
+    return {
+        "requests": [
+            {"indexName": _ALGOLIA_INDEX, "objectID": job_uuid.removeprefix(_PREFIX)}
+            for job_uuid in job_uuids
+        ]
+    }
+
+
 # ---------------------------------------------------------------------------
 # CareersGovJobSource
 # ---------------------------------------------------------------------------
@@ -167,15 +213,33 @@ class CareersGovJobSource:
     it does not collide with MCF UUIDs in the database.
     """
 
-    def __init__(self, rate_limit: float = 5.0) -> None:
+    def __init__(
+        self,
+        rate_limit: float = 5.0,
+        *,
+        archive: RawArchive | None = None,
+        listing_workers: int = 8,
+        search_ingest: bool = True,
+    ) -> None:
         """Create a new CareersGovJobSource.
 
         Args:
             rate_limit: Maximum Algolia requests per second for detail fetching.
+            archive: Raw-response archive (default: ``$MCF_RAW_ARCHIVE_DIR`` if set).
+            listing_workers: Keyword searches run concurrently while listing.
+            search_ingest: Retrieve the normalizer's attributes with every
+                listing hit, so listed jobs need no detail request.
         """
         self.rate_limit = rate_limit
+        self.listing_workers = listing_workers
+        self.search_ingest = search_ingest
+        self._listed_jobs: dict[str, NormalizedJob] = {}
+        self._archive = archive or default_archive()
         self._min_interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
         self._last_request_time: float = 0.0
+        self._rate_lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
 
     @property
     def source_id(self) -> str:
@@ -185,13 +249,43 @@ class CareersGovJobSource:
     # Rate limiting
     # ------------------------------------------------------------------
 
+    def _reserve_slot(self) -> float:
+        """Reserve the next request slot; return the seconds to wait for it."""
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._last_request_time + self._min_interval)
+            self._last_request_time = slot
+        return slot - now
+
     def _wait(self) -> None:
         if self._min_interval <= 0:
             return
-        elapsed = time.monotonic() - self._last_request_time
-        if elapsed < self._min_interval:
-            time.sleep(self._min_interval - elapsed)
-        self._last_request_time = time.monotonic()
+        delay = self._reserve_slot()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def _await_turn(self) -> None:
+        """Async :meth:`_wait`: reserve the next request slot, then sleep until it."""
+        if self._min_interval <= 0:
+            return
+        await asyncio.sleep(self._reserve_slot())
+
+    def _http(self) -> httpx.Client:
+        """Pooled client for detail requests (closed by :meth:`close`)."""
+        if self._client is None:
+            self._client = httpx.Client(headers=_ALGOLIA_HEADERS, timeout=30.0)
+        return self._client
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the async client opened by :meth:`aget_job_details`."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
 
     # ------------------------------------------------------------------
     # list_job_ids
@@ -203,56 +297,93 @@ class CareersGovJobSource:
         categories: Sequence[str] | None = None,  # ignored for CAG
         limit: int | None = None,
         on_progress=None,
+        known_ids: set[str] | None = None,  # ignored for CAG
+        checkpoint=None,  # ignored for CAG
     ) -> list[str]:
         """List Careers@Gov job IDs via Algolia keyword partitioning.
 
         Algolia search returns max 1000 hits per query. We run multiple
-        searches with different job-title keywords and deduplicate to
-        retrieve ~99%+ of the index.
+        searches with different job-title keywords (``listing_workers`` at a
+        time) and deduplicate to retrieve ~99%+ of the index.
+
+        Returns IDs in prefixed ``job_uuid`` form: ``"cag:{objectID}"``, in
+        keyword order.
 
-        Returns IDs in prefixed ``job_uuid`` form: ``"cag:{objectID}"``.
+        With ``search_ingest`` the hits carry every attribute the normalizer
+        reads; listed jobs are kept for :meth:`get_job_detail` /
+        :meth:`get_job_details`, so a crawl makes no detail requests for them.
 
         The ``categories`` parameter is accepted for protocol compatibility but
         ignored — Careers@Gov does not use the same category taxonomy as MCF.
+        ``known_ids`` is ignored too: hits are not date-sorted, and the full
+        listing is only ~40 requests anyway; for the same reason an interrupted
+        listing is simply redone rather than checkpointed.
         """
-        seen: set[str] = set()
-        job_uuids: list[str] = []
+        attributes = _NORMALIZER_ATTRIBUTES if self.search_ingest else ["objectID"]
+        self._listed_jobs = {}
 
         with httpx.Client(headers=_ALGOLIA_HEADERS, timeout=30.0) as client:
-            for i, keyword in enumerate(_LIST_KEYWORDS):
+
+            def _search(keyword: str) -> list[dict]:
                 payload = {
                     "query": keyword,
                     "hitsPerPage": 1000,
                     "page": 0,
-                    "attributesToRetrieve": ["objectID"],
+                    "attributesToRetrieve": attributes,
+                    "attributesToHighlight": [],
+                    "attributesToSnippet": [],
                 }
-                response = client.post(_ALGOLIA_SEARCH_URL, json=payload)
+                response = client.post(_algolia_url(f"{_ALGOLIA_INDEX}/query"), json=payload)
+                HTTP_STATS.record(response)
                 response.raise_for_status()
-                data = response.json()
-
-                for hit in data.get("hits", []):
-                    object_id = hit.get("objectID")
-                    if not object_id or object_id in seen:
-                        continue
-                    seen.add(object_id)
-                    job_uuids.append(f"{_PREFIX}{object_id}")
+                return response.json().get("hits", [])
+
+            seen: set[str] = set()
+            job_uuids: list[str] = []
+            with ThreadPoolExecutor(max_workers=max(1, self.listing_workers), thread_name_prefix="cag-list") as pool:
+                # map() yields in keyword order, so the listing is deterministic.
+                for hits in pool.map(_search, _LIST_KEYWORDS):
+                    for hit in hits:
+                        object_id = hit.get("objectID")
+                        if not object_id or object_id in seen:
+                            continue
+                        seen.add(object_id)
+                        job_uuid = f"{_PREFIX}{object_id}"
+                        job_uuids.append(job_uuid)
+                        if self.search_ingest:
+                            self._keep_listed(job_uuid, hit)
+
+                        if limit and len(job_uuids) >= limit:
+                            break
+
+                    if on_progress:
+                        try:
+                            on_progress(len(job_uuids))
+                        except Exception:
+                            pass
 
                     if limit and len(job_uuids) >= limit:
                         break
 
-                if on_progress:
-                    try:
-                        on_progress(len(job_uuids))
-                    except Exception:
-                        pass
-
-                if limit and len(job_uuids) >= limit:
-                    break
-
         return job_uuids
 
+    def retain_listed(self, job_uuids: Iterable[str]) -> None:
+        """Forget kept listing hits except those of ``job_uuids`` (the jobs about to be fetched)."""
+        keep = set(job_uuids)
+        self._listed_jobs = {job_uuid: job for job_uuid, job in self._listed_jobs.items() if job_uuid in keep}
+
+    def _keep_listed(self, job_uuid: str, hit: dict) -> None:
+        # Drop Algolia's per-query metadata (_highlightResult, _rankingInfo, ...) so an
+        # unchanged job hashes the same in every listing and is archived only once.
+        hit = {key: value for key, value in hit.items() if not key.startswith("_")}
+        if self._archive is not None and not self._archive.contains(
+            _SOURCE_ID, job_uuid, None, KIND_SEARCH, raw=hit
+        ):
+            self._archive.append(source_id=_SOURCE_ID, job_uuid=job_uuid, kind=KIND_SEARCH, raw=hit)
+        self._listed_jobs[job_uuid] = self.normalize_raw(hit, job_uuid)
+
     # ------------------------------------------------------------------
-    # get_job_detail
+    # get_job_detail / get_job_details
     # ------------------------------------------------------------------
 
     def get_job_detail(self, job_uuid: str) -> NormalizedJob:
@@ -265,6 +396,74 @@ class CareersGovJobSource:
         Returns:
             A :class:`NormalizedJob` populated from the Algolia response.
         """
+        listed = self._listed_jobs.pop(job_uuid, None)
+        if listed is not None:
+            return listed
+        object_id = job_uuid.removeprefix(_PREFIX)
+
+        # Fetch all attributes for this object from Algolia
+        encoded_id = urllib.parse.quote(object_id, safe="")
+        algolia_url = _algolia_url(f"{_ALGOLIA_INDEX}/{encoded_id}")
+
+        self._wait()
+        response = self._http().get(algolia_url)
+        HTTP_STATS.record(response)
+        response.raise_for_status()
+        raw = response.json()
+
+        if self._archive is not None:
+            self._archive.append(source_id=_SOURCE_ID, job_uuid=job_uuid, kind=KIND_DETAIL, raw=raw)
+        return self.normalize_raw(raw, job_uuid)
+
+    def get_job_details(self, job_uuids: Sequence[str]) -> list[NormalizedJob | None]:
+        """Fetch many jobs with Algolia multi-object retrieval.
+
+        Sends one request per 1000 IDs instead of one per job (none for jobs
+        kept from the last listing). Returns one entry per input ID, in order;
+        ``None`` where the object no longer exists. An HTTP error fails the
+        whole call.
+        """
+        fetched = self._multi_get([job_uuid for job_uuid in job_uuids if job_uuid not in self._listed_jobs])
+        return [self._listed_jobs.pop(job_uuid, None) or fetched.get(job_uuid) for job_uuid in job_uuids]
+
+    async def aget_job_details(self, job_uuids: Sequence[str]) -> list[NormalizedJob | None]:
+        """Async variant of :meth:`get_job_details`; several calls may run concurrently."""
+        missing = [job_uuid for job_uuid in job_uuids if job_uuid not in self._listed_jobs]
+        fetched: dict[str, NormalizedJob] = {}
+        for i in range(0, len(missing), _MULTI_GET_MAX):
+            chunk = missing[i : i + _MULTI_GET_MAX]
+            await self._await_turn()
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(headers=_ALGOLIA_HEADERS, timeout=30.0)
+            response = await self._async_client.post(_algolia_url("*/objects"), json=_multi_get_payload(chunk))
+            HTTP_STATS.record(response)
+            response.raise_for_status()
+            fetched.update(self._normalize_objects(chunk, response.json().get("results", [])))
+        return [self._listed_jobs.pop(job_uuid, None) or fetched.get(job_uuid) for job_uuid in job_uuids]
+
+    def _multi_get(self, job_uuids: Sequence[str]) -> dict[str, NormalizedJob]:
+        jobs: dict[str, NormalizedJob] = {}
+        for i in range(0, len(job_uuids), _MULTI_GET_MAX):
+            chunk = job_uuids[i : i + _MULTI_GET_MAX]
+            self._wait()
+            response = self._http().post(_algolia_url("*/objects"), json=_multi_get_payload(chunk))
+            HTTP_STATS.record(response)
+            response.raise_for_status()
+            jobs.update(self._normalize_objects(chunk, response.json().get("results", [])))
+        return jobs
+
+    def _normalize_objects(self, job_uuids: Sequence[str], objects: list[dict | None]) -> dict[str, NormalizedJob]:
+        jobs: dict[str, NormalizedJob] = {}
+        for job_uuid, raw in zip(job_uuids, objects):
+            if not raw:
+                continue  # object no longer exists
+            if self._archive is not None:
+                self._archive.append(source_id=_SOURCE_ID, job_uuid=job_uuid, kind=KIND_DETAIL, raw=raw)
+            jobs[job_uuid] = self.normalize_raw(raw, job_uuid)
+        return jobs
+
+    def normalize_raw(self, raw: dict, job_uuid: str) -> NormalizedJob:
+        """Build a :class:`NormalizedJob` from a raw Algolia object (no network access)."""
         object_id = job_uuid.removeprefix(_PREFIX)
 
         raw_job_id, posting_uuid = _parse_object_id(object_id)
@@ -276,16 +475,6 @@ class CareersGovJobSource:
         if posting_uuid:
             job_url = f"https://www.jobs.gov.sg/career/hrp/{numeric_id}/{posting_uuid}"
 
-        # Fetch all attributes for this object from Algolia
-        encoded_id = urllib.parse.quote(object_id, safe="")
-        algolia_url = f"{_ALGOLIA_OBJECT_URL}{encoded_id}"
-
-        self._wait()
-        with httpx.Client(headers=_ALGOLIA_HEADERS, timeout=30.0) as client:
-            response = client.get(algolia_url)
-            response.raise_for_status()
-            raw = response.json()
-
         # For non-HRP jobs fall back to any URL field in the Algolia response
         if not job_url:
             job_url = (
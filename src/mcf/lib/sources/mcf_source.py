@@ -2,12 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Callable, Sequence
+from typing import Callable, Iterable, Sequence
 
-from mcf.lib.api.client import MCFClient
-from mcf.lib.crawler.crawler import Crawler, CrawlProgress
+from mcf.lib.api.client import AsyncMCFClient, MCFClient
+from mcf.lib.api.rate_limit import TokenBucket, shared_limiter
+from mcf.lib.archive.raw_archive import KIND_DETAIL, KIND_SEARCH, RawArchive, default_archive
+from mcf.lib.crawler.crawler import Crawler, CrawlProgress, ListingCheckpoint
+from mcf.lib.models.models import Job
 from mcf.lib.sources.base import NormalizedJob
 
+# Detail requests give up quickly when throttled; the pipeline defers those
+# jobs to a later retry round instead of stalling on them.
+_DETAIL_THROTTLE_ATTEMPTS = 3
+
+# Keys a search result must carry to be ingested without a detail call.
+# Anything else (e.g. metadata.expiryDate, minimumYearsExperience) is optional;
+# upserts never null it out.
+_SEARCH_INGEST_KEYS = (
+    "title",
+    "description",
+    "skills",
+    "categories",
+    "employmentTypes",
+    "positionLevels",
+    "salary",
+    "metadata",
+)
+
 
 def _extract_mcf_skills(raw: dict) -> list[str]:
     """Extract skill names from MCF API job detail (key skills first)."""
@@ -24,6 +45,19 @@ def _extract_mcf_skills(raw: dict) -> list[str]:
     return key_skills + other_skills
 
 
+def _search_result_to_normalized(raw: dict, job_uuid: str) -> NormalizedJob | None:
+    """Normalize a raw search result, or return None if it lacks fields only the detail has."""
+    if any(key not in raw for key in _SEARCH_INGEST_KEYS):
+        return None
+    if not raw.get("description") or not (raw.get("metadata") or {}).get("newPostingDate"):
+        return None
+    # Key skills are stored first; without the flag the skill order (and so the
+    # job text, embedding and content hash) would differ from the detail's.
+    if any(isinstance(s, dict) and "isKeySkill" not in s for s in raw.get("skills") or []):
+        return None
+    return _mcf_raw_to_normalized(raw, job_uuid)
+
+
 def _mcf_raw_to_normalized(raw: dict, external_id: str) -> NormalizedJob:
     """Convert MCF API job detail dict to NormalizedJob."""
     title = raw.get("title") or raw.get("jobTitle")
@@ -108,10 +142,40 @@ def _mcf_raw_to_normalized(raw: dict, external_id: str) -> NormalizedJob:
 
 
 class MCFJobSource:
-    """Job source for MyCareersFuture Singapore API."""
+    """Job source for MyCareersFuture Singapore API.
+
+    Listing and detail calls share one token bucket (by default the
+    process-wide ``"mcf"`` bucket, see :func:`shared_limiter`) and detail calls
+    reuse one keep-alive connection pool. Call :meth:`close` when done.
+
+    With ``search_ingest`` (the default), jobs whose search result already
+    carries every field the pipeline stores are normalized straight from the
+    listing; :meth:`get_job_detail` then returns that instead of calling the
+    API, so a crawl costs about one request per new job less.
 
-    def __init__(self, rate_limit: float = 4.0) -> None:
+    Raw detail responses and complete search results are written to the raw
+    archive (default: ``$MCF_RAW_ARCHIVE_DIR`` if set) for ``mcf reparse``.
+    """
+
+    def __init__(
+        self,
+        rate_limit: float = 4.0,
+        *,
+        limiter: TokenBucket | None = None,
+        listing_workers: int = 4,
+        search_ingest: bool = True,
+        archive: RawArchive | None = None,
+    ) -> None:
         self.rate_limit = rate_limit
+        self.listing_workers = listing_workers
+        self.search_ingest = search_ingest
+        self._archive = archive or default_archive()
+        self._limiter = limiter or shared_limiter("mcf", rate_limit)
+        self._client: MCFClient | None = None
+        self._async_client: AsyncMCFClient | None = None
+        self._watermarks: dict[str, str] = {}
+        self._listed_jobs: dict[str, NormalizedJob] = {}
+        self._truncated: set[str] = set()
 
     @property
     def source_id(self) -> str:
@@ -123,19 +187,129 @@ class MCFJobSource:
         categories: Sequence[str] | None = None,
         limit: int | None = None,
         on_progress: Callable[[CrawlProgress], None] | None = None,
+        known_ids: set[str] | None = None,
+        checkpoint: ListingCheckpoint | None = None,
     ) -> list[str]:
-        """List job UUIDs from MCF."""
-        crawler = Crawler(rate_limit=self.rate_limit)
+        """List job UUIDs from MCF (only the new-postings head when ``known_ids`` is given).
+
+        The ``metadata.updatedAt`` of every listed job is kept for
+        :meth:`listed_watermarks`, and complete search results for
+        :meth:`get_job_detail` (unless ``search_ingest`` is off). In delta mode
+        only jobs outside ``known_ids`` are kept.
+        """
+        crawler = Crawler(
+            rate_limit=self.rate_limit,
+            limiter=self._limiter,
+            max_workers=self.listing_workers,
+        )
         cats = list(categories) if categories else None
+        self._watermarks = {}
+        self._listed_jobs = {}
+        self._truncated = set()
+
+        def _keep_listed(jobs: list[Job]) -> None:
+            for job in jobs:
+                updated_at = job.metadata.updatedAt if job.metadata else None
+                keep = self.search_ingest and (known_ids is None or job.uuid not in known_ids)
+                archive = self._archive is not None and not self._archive.contains(
+                    "mcf", job.uuid, updated_at, KIND_SEARCH
+                )
+                if not keep and not archive:
+                    continue
+                raw = job.model_dump(by_alias=True, mode="json", exclude_unset=True)
+                normalized = _search_result_to_normalized(raw, job.uuid)
+                if normalized is None:
+                    continue
+                if keep:
+                    self._listed_jobs[job.uuid] = normalized
+                if archive:
+                    self._archive.append(
+                        source_id="mcf", job_uuid=job.uuid, kind=KIND_SEARCH, raw=raw, updated_at=updated_at
+                    )
+
         return crawler.list_job_uuids_all_categories(
             categories=cats,
             limit=limit,
             on_progress=on_progress,
+            known=known_ids,
+            checkpoint=checkpoint,
+            watermarks=self._watermarks,
+            on_results=_keep_listed if self.search_ingest or self._archive is not None else None,
+            truncated=self._truncated,
         )
 
+    def retain_listed(self, job_uuids: Iterable[str]) -> None:
+        """Forget kept search results except those of ``job_uuids`` (the jobs about to be fetched).
+
+        A full listing keeps a result for every posting; the pipeline calls this
+        after the diff so maintained jobs do not hold memory for the whole crawl.
+        """
+        keep = set(job_uuids)
+        self._listed_jobs = {job_uuid: job for job_uuid, job in self._listed_jobs.items() if job_uuid in keep}
+
+    def listed_watermarks(self) -> dict[str, str]:
+        """``job_uuid -> metadata.updatedAt`` from the last :meth:`list_job_ids` call."""
+        return dict(self._watermarks)
+
+    def truncated_partitions(self) -> set[str]:
+        """Categories or partitions the last :meth:`list_job_ids` call could not list completely."""
+        return set(self._truncated)
+
     def get_job_detail(self, external_id: str) -> NormalizedJob:
-        """Fetch job detail from MCF API and return as NormalizedJob."""
-        with MCFClient(rate_limit=self.rate_limit) as client:
-            detail = client.get_job_detail(external_id)
-            raw = detail.model_dump(by_alias=True, mode="json")
-            return _mcf_raw_to_normalized(raw, external_id)
+        """Fetch job detail from MCF API and return as NormalizedJob.
+
+        Served from the last listing instead when its search result was complete.
+        """
+        listed = self._listed_jobs.pop(external_id, None)
+        if listed is not None:
+            return listed
+        if self._client is None:
+            self._client = MCFClient(limiter=self._limiter, max_throttle_attempts=_DETAIL_THROTTLE_ATTEMPTS)
+        detail = self._client.get_job_detail(external_id)
+        raw = detail.model_dump(by_alias=True, mode="json")
+        self._archive_detail(external_id, raw)
+        return _mcf_raw_to_normalized(raw, external_id)
+
+    def normalize_raw(self, raw: dict, job_uuid: str) -> NormalizedJob:
+        """Build a :class:`NormalizedJob` from a raw detail or search result (no network access)."""
+        return _mcf_raw_to_normalized(raw, job_uuid)
+
+    def _archive_detail(self, external_id: str, raw: dict) -> None:
+        if self._archive is not None:
+            self._archive.append(
+                source_id="mcf",
+                job_uuid=external_id,
+                kind=KIND_DETAIL,
+                raw=raw,
+                updated_at=(raw.get("metadata") or {}).get("updatedAt"),
+            )
+
+    def close(self) -> None:
+        """Close the pooled sync client opened by :meth:`get_job_detail`."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aget_job_detail(self, external_id: str) -> NormalizedJob:
+        """Async variant of :meth:`get_job_detail` for concurrent fetching.
+
+        All calls share one pooled ``AsyncMCFClient`` until :meth:`aclose` is
+        called from the same event loop; the rate limiter is the source's.
+        """
+        listed = self._listed_jobs.pop(external_id, None)
+        if listed is not None:
+            return listed
+        if self._async_client is None:
+            self._async_client = AsyncMCFClient(
+                limiter=self._limiter, max_throttle_attempts=_DETAIL_THROTTLE_ATTEMPTS
+            )
+        detail = await self._async_client.get_job_detail(external_id)
+        raw = detail.model_dump(by_alias=True, mode="json")
+        self._archive_detail(external_id, raw)
+        return _mcf_raw_to_normalized(raw, external_id)
+
+    async def aclose(self) -> None:
+        """Close the pooled async client opened by :meth:`aget_job_detail`."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
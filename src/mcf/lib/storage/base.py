@@ -2,11 +2,37 @@
 
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Iterable, Sequence
 
+import numpy as np
+
+# Element type of embedding blobs in embeddings_cache: float32 (default, exact)
+# or float16 (half the bytes; cosine similarity changes by < 1e-3).
+EMBEDDINGS_CACHE_DTYPE_ENV = "EMBEDDINGS_CACHE_DTYPE"
+EMBEDDING_DTYPES = ("float32", "float16")
+
+
+def embeddings_cache_dtype() -> str:
+    """Blob dtype for new embeddings_cache rows, from ``$EMBEDDINGS_CACHE_DTYPE``."""
+    dtype = os.getenv(EMBEDDINGS_CACHE_DTYPE_ENV, "float32").strip().lower() or "float32"
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"{EMBEDDINGS_CACHE_DTYPE_ENV}={dtype!r}; expected one of {EMBEDDING_DTYPES}")
+    return dtype
+
+
+def encode_embedding(embedding: Sequence[float], dtype: str) -> bytes:
+    """Little-endian ``dtype`` bytes of ``embedding``."""
+    return np.asarray(embedding, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+def decode_embedding(blob: bytes, dtype: str) -> list[float]:
+    """Inverse of :func:`encode_embedding`."""
+    return np.frombuffer(blob, dtype=np.dtype(dtype).newbyteorder("<")).tolist()
+
 
 @dataclass(frozen=True)
 class RunStats:
@@ -36,11 +62,98 @@ class Storage(ABC):
 
     @abstractmethod
     def finish_run(
-        self, run_id: str, *, total_seen: int, added: int, maintained: int, removed: int
-    ) -> None: ...
+        self,
+        run_id: str,
+        *,
+        total_seen: int,
+        added: int,
+        maintained: int,
+        removed: int,
+        telemetry: dict | None = None,
+    ) -> None:
+        """Close a run with its totals and optional telemetry (see :mod:`mcf.lib.pipeline.telemetry`)."""
 
     @abstractmethod
-    def get_recent_runs(self, limit: int = 10) -> list[dict]: ...
+    def get_recent_runs(self, limit: int = 10) -> list[dict]:
+        """Finished runs, newest first: run_id, kind, timestamps, counts and ``telemetry`` (dict or None)."""
+
+    # === Change detection ===
+
+    def job_watermarks(self) -> dict[str, str]:
+        """Return ``job_uuid -> source_updated_at`` for jobs with a recorded watermark."""
+        raise NotImplementedError
+
+    def set_job_watermarks(self, items: Iterable[tuple[str, str]]) -> None:
+        """Record the source's last-modified watermark for (job_uuid, watermark) pairs."""
+        raise NotImplementedError
+
+    # === Crawl checkpoints (resumable runs) ===
+
+    def save_crawl_checkpoint(self, run_id: str, state: dict) -> None:
+        """Upsert the small JSON state of an in-progress run (params, phase, listing cursor)."""
+        raise NotImplementedError
+
+    def get_crawl_checkpoint(self, run_id: str) -> dict | None:
+        """Return the saved state for run_id, or None if there is no checkpoint."""
+        raise NotImplementedError
+
+    def add_crawl_checkpoint_items(
+        self, run_id: str, stage: str, items: Iterable[tuple[str, str | None]]
+    ) -> None:
+        """Record (job_uuid, payload) pairs that reached a stage (listed/added/fetched/embedded/classified)."""
+        raise NotImplementedError
+
+    def get_crawl_checkpoint_items(self, run_id: str, stage: str) -> dict[str, str | None]:
+        """Return {job_uuid: payload} for every job recorded at a stage."""
+        raise NotImplementedError
+
+    def delete_crawl_checkpoint(self, run_id: str) -> None:
+        """Drop the checkpoint state and items for a finished run."""
+        raise NotImplementedError
+
+    def delete_stale_crawl_checkpoints(self, older_than: datetime) -> int:
+        """Drop checkpoints last saved before ``older_than``; return how many were dropped."""
+        raise NotImplementedError
+
+    def check_crawl_schema(self) -> None:
+        """Raise RuntimeError if the tables/columns a crawl writes are missing.
+
+        Stores that create their own schema on open need not override this.
+        """
+
+    # === Crawl epochs (sharded full crawls) ===
+
+    def create_crawl_epoch(self, epoch_id: str, source_id: str, plan: dict) -> None:
+        """Store a new epoch and its shard plan."""
+        raise NotImplementedError
+
+    def get_crawl_epoch(self, epoch_id: str) -> dict | None:
+        """Return ``{epoch_id, source_id, plan, created_at, finished_at, shards}`` or None.
+
+        ``shards`` maps each finished shard number to ``{run_id, truncated, finished_at}``.
+        """
+        raise NotImplementedError
+
+    def add_crawl_epoch_seen(self, epoch_id: str, job_uuids: Iterable[str]) -> None:
+        """Record job UUIDs listed by one of the epoch's shards."""
+        raise NotImplementedError
+
+    def get_crawl_epoch_seen(self, epoch_id: str) -> set[str]:
+        """Return every job UUID seen during the epoch.
+
+        That is every UUID a shard listed, plus any job another run saw
+        (``last_seen_at``) after the epoch was created, so removals inferred
+        from this set never drop a job posted mid-epoch.
+        """
+        raise NotImplementedError
+
+    def finish_crawl_epoch_shard(self, epoch_id: str, shard: int, *, run_id: str, truncated: bool) -> None:
+        """Mark a shard finished (re-finishing a shard replaces its row)."""
+        raise NotImplementedError
+
+    def claim_crawl_epoch_finish(self, epoch_id: str) -> bool:
+        """Atomically mark the epoch finished; True only for the one caller that did it."""
+        raise NotImplementedError
 
     # === Job lifecycle ===
 
@@ -53,6 +166,10 @@ class Storage(ABC):
     @abstractmethod
     def active_job_uuids_for_source(self, job_source: str) -> set[str]: ...
 
+    def get_job_categories(self, job_uuids: Sequence[str]) -> dict[str, list[str]]:
+        """Return ``job_uuid -> category names`` for the given jobs (jobs without categories omitted)."""
+        raise NotImplementedError
+
     @abstractmethod
     def record_statuses(
         self,
@@ -92,6 +209,20 @@ class Storage(ABC):
         min_years_experience: int | None = None,
     ) -> None: ...
 
+    def upsert_job_details(self, run_id: str, jobs: Sequence[dict]) -> None:
+        """Bulk :meth:`upsert_new_job_detail`: each dict holds one job's keyword
+        arguments (everything but ``run_id``)."""
+        raise NotImplementedError
+
+    def update_job_details(self, jobs: Sequence[dict]) -> None:
+        """Rewrite the parsed fields of existing jobs (dicts as for :meth:`upsert_job_details`).
+
+        Unlike the upserts this leaves ``last_seen_*`` and ``is_active`` alone,
+        so rewriting a job (e.g. ``mcf reparse``) does not count as seeing it.
+        Unknown job UUIDs are ignored.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def update_daily_stats(self, run_id: str) -> None:
         """Recompute job_daily_stats for today from the current active job roster."""
@@ -10,13 +10,119 @@ from typing import Iterable, Sequence
 
 import duckdb
 
-from mcf.lib.storage.base import RunStats, Storage
+from mcf.lib.storage.base import (
+    RunStats,
+    Storage,
+    decode_embedding,
+    embeddings_cache_dtype,
+    encode_embedding,
+)
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+_UPSERT_JOB_DETAIL_SQL = """
+    INSERT INTO jobs(job_uuid, job_source, first_seen_run_id, last_seen_run_id, is_active,
+                     first_seen_at, last_seen_at,
+                     title, company_name, location, job_url, skills_json,
+                     categories_json, employment_types_json, position_levels_json,
+                     salary_min, salary_max, posted_date, expiry_date, min_years_experience)
+    VALUES (?, ?, ?, ?, TRUE, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (job_uuid) DO UPDATE SET
+      job_source = COALESCE(excluded.job_source, jobs.job_source),
+      last_seen_run_id = excluded.last_seen_run_id,
+      is_active = TRUE,
+      last_seen_at = excluded.last_seen_at,
+      title = COALESCE(excluded.title, jobs.title),
+      company_name = COALESCE(excluded.company_name, jobs.company_name),
+      location = COALESCE(excluded.location, jobs.location),
+      job_url = COALESCE(excluded.job_url, jobs.job_url),
+      skills_json = COALESCE(excluded.skills_json, jobs.skills_json),
+      categories_json = COALESCE(excluded.categories_json, jobs.categories_json),
+      employment_types_json = COALESCE(excluded.employment_types_json, jobs.employment_types_json),
+      position_levels_json = COALESCE(excluded.position_levels_json, jobs.position_levels_json),
+      salary_min = COALESCE(excluded.salary_min, jobs.salary_min),
+      salary_max = COALESCE(excluded.salary_max, jobs.salary_max),
+      posted_date = COALESCE(excluded.posted_date, jobs.posted_date),
+      expiry_date = COALESCE(excluded.expiry_date, jobs.expiry_date),
+      min_years_experience = COALESCE(excluded.min_years_experience, jobs.min_years_experience)
+"""
+
+
+def _job_detail_row(
+    run_id: str,
+    now: datetime,
+    *,
+    job_uuid: str,
+    title: str | None,
+    company_name: str | None,
+    location: str | None,
+    job_url: str | None,
+    job_source: str = "mcf",
+    skills: list[str] | None = None,
+    raw_json: dict | None = None,
+    categories: list[str] | None = None,
+    employment_types: list[str] | None = None,
+    position_levels: list[str] | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    posted_date: str | None = None,
+    expiry_date: str | None = None,
+    min_years_experience: int | None = None,
+) -> list:
+    """Parameters of ``_UPSERT_JOB_DETAIL_SQL`` for one job."""
+    return [
+        job_uuid,
+        job_source,
+        run_id,
+        run_id,
+        now,
+        now,
+        title,
+        company_name,
+        location,
+        job_url,
+        json.dumps(skills) if skills else None,
+        json.dumps(categories) if categories else None,
+        json.dumps(employment_types) if employment_types else None,
+        json.dumps(position_levels) if position_levels else None,
+        salary_min,
+        salary_max,
+        posted_date,
+        expiry_date,
+        min_years_experience,
+    ]
+
+
+_UPDATE_JOB_DETAIL_SQL = """
+    UPDATE jobs SET
+      job_source = COALESCE(?, job_source),
+      title = COALESCE(?, title),
+      company_name = COALESCE(?, company_name),
+      location = COALESCE(?, location),
+      job_url = COALESCE(?, job_url),
+      skills_json = COALESCE(?, skills_json),
+      categories_json = COALESCE(?, categories_json),
+      employment_types_json = COALESCE(?, employment_types_json),
+      position_levels_json = COALESCE(?, position_levels_json),
+      salary_min = COALESCE(?, salary_min),
+      salary_max = COALESCE(?, salary_max),
+      posted_date = COALESCE(?, posted_date),
+      expiry_date = COALESCE(?, expiry_date),
+      min_years_experience = COALESCE(?, min_years_experience)
+    WHERE job_uuid = ?
+"""
+
+
+def _job_detail_update_row(**fields) -> list:
+    """Parameters of ``_UPDATE_JOB_DETAIL_SQL``: the upsert's field values, job_uuid last."""
+    row = _job_detail_row("", None, **fields)
+    # Upsert order: job_uuid, job_source, 2 run ids, 2 timestamps, then the parsed fields.
+    return [row[1], *row[6:], row[0]]
+
+
 class DuckDBStore(Storage):
     """Persistence layer for incremental crawl state."""
 
@@ -42,7 +148,8 @@ class DuckDBStore(Storage):
               total_seen INTEGER,
               added INTEGER,
               maintained INTEGER,
-              removed INTEGER
+              removed INTEGER,
+              telemetry_json TEXT
             )
             """
         )
@@ -115,6 +222,11 @@ class DuckDBStore(Storage):
             "ALTER TABLE jobs ADD COLUMN posted_date DATE",
             "ALTER TABLE jobs ADD COLUMN expiry_date DATE",
             "ALTER TABLE jobs ADD COLUMN min_years_experience INTEGER",
+            "ALTER TABLE jobs ADD COLUMN source_updated_at TEXT",
+            "ALTER TABLE crawl_runs ADD COLUMN telemetry_json TEXT",
+            # embeddings_cache: binary vectors (rows written before keep embedding_json)
+            "ALTER TABLE embeddings_cache ADD COLUMN embedding_blob BLOB",
+            "ALTER TABLE embeddings_cache ADD COLUMN embedding_dtype TEXT",
             # candidate_embeddings: support multiple embedding types per profile
             # (taste embedding stored with profile_id suffix ':taste')
             "ALTER TABLE candidate_embeddings ADD COLUMN embedding_type TEXT DEFAULT 'resume'",
@@ -206,6 +318,8 @@ class DuckDBStore(Storage):
               embedding_json TEXT,
               dim INTEGER,
               cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+              embedding_blob BLOB,
+              embedding_dtype TEXT,
               PRIMARY KEY (content_hash, model_name, embed_type)
             )
             """
@@ -240,6 +354,62 @@ class DuckDBStore(Storage):
             """
         )
 
+        # Crawl epochs (sharded full crawls; see scripts/migrations/013_add_crawl_epochs.sql)
+        self._con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_epochs (
+                epoch_id     TEXT PRIMARY KEY,
+                source_id    TEXT NOT NULL,
+                plan_json    TEXT NOT NULL,
+                created_at   TIMESTAMP,
+                finished_at  TIMESTAMP
+            )
+            """
+        )
+        self._con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_epoch_shards (
+                epoch_id     TEXT NOT NULL,
+                shard        INTEGER NOT NULL,
+                run_id       TEXT NOT NULL,
+                truncated    BOOLEAN NOT NULL DEFAULT FALSE,
+                finished_at  TIMESTAMP,
+                PRIMARY KEY (epoch_id, shard)
+            )
+            """
+        )
+        self._con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_epoch_seen (
+                epoch_id  TEXT NOT NULL,
+                job_uuid  TEXT NOT NULL,
+                PRIMARY KEY (epoch_id, job_uuid)
+            )
+            """
+        )
+
+        # Crawl checkpoints (resumable runs); deleted when a run finishes
+        self._con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+                run_id      TEXT PRIMARY KEY,
+                state_json  TEXT NOT NULL,
+                updated_at  TIMESTAMP
+            )
+            """
+        )
+        self._con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_checkpoint_items (
+                run_id    TEXT NOT NULL,
+                stage     TEXT NOT NULL,
+                job_uuid  TEXT NOT NULL,
+                payload   TEXT,
+                PRIMARY KEY (run_id, stage, job_uuid)
+            )
+            """
+        )
+
         # Migration: add resume_storage_path column for Supabase Storage paths
         try:
             self._con.execute("ALTER TABLE candidate_profiles ADD COLUMN resume_storage_path TEXT")
@@ -267,7 +437,16 @@ class DuckDBStore(Storage):
             removed=0,
         )
 
-    def finish_run(self, run_id: str, *, total_seen: int, added: int, maintained: int, removed: int) -> None:
+    def finish_run(
+        self,
+        run_id: str,
+        *,
+        total_seen: int,
+        added: int,
+        maintained: int,
+        removed: int,
+        telemetry: dict | None = None,
+    ) -> None:
         self._con.execute(
             """
             UPDATE crawl_runs
@@ -275,12 +454,150 @@ class DuckDBStore(Storage):
                    total_seen = ?,
                    added = ?,
                    maintained = ?,
-                   removed = ?
+                   removed = ?,
+                   telemetry_json = ?
              WHERE run_id = ?
             """,
-            [_utcnow(), total_seen, added, maintained, removed, run_id],
+            [
+                _utcnow(),
+                total_seen,
+                added,
+                maintained,
+                removed,
+                json.dumps(telemetry) if telemetry is not None else None,
+                run_id,
+            ],
+        )
+
+    def job_watermarks(self) -> dict[str, str]:
+        rows = self._con.execute(
+            "SELECT job_uuid, source_updated_at FROM jobs WHERE source_updated_at IS NOT NULL"
+        ).fetchall()
+        return {r[0]: r[1] for r in rows}
+
+    def set_job_watermarks(self, items: Iterable[tuple[str, str]]) -> None:
+        rows = [(watermark, job_uuid) for job_uuid, watermark in items]
+        if not rows:
+            return
+        self._con.executemany("UPDATE jobs SET source_updated_at = ? WHERE job_uuid = ?", rows)
+
+    def save_crawl_checkpoint(self, run_id: str, state: dict) -> None:
+        self._con.execute(
+            """
+            INSERT INTO crawl_checkpoints(run_id, state_json, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT (run_id) DO UPDATE SET
+              state_json = excluded.state_json,
+              updated_at = excluded.updated_at
+            """,
+            [run_id, json.dumps(state), _utcnow()],
+        )
+
+    def get_crawl_checkpoint(self, run_id: str) -> dict | None:
+        row = self._con.execute(
+            "SELECT state_json FROM crawl_checkpoints WHERE run_id = ?", [run_id]
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_crawl_checkpoint_items(
+        self, run_id: str, stage: str, items: Iterable[tuple[str, str | None]]
+    ) -> None:
+        rows = [(run_id, stage, job_uuid, payload) for job_uuid, payload in items]
+        if not rows:
+            return
+        self._con.executemany(
+            "INSERT OR REPLACE INTO crawl_checkpoint_items(run_id, stage, job_uuid, payload) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    def get_crawl_checkpoint_items(self, run_id: str, stage: str) -> dict[str, str | None]:
+        rows = self._con.execute(
+            "SELECT job_uuid, payload FROM crawl_checkpoint_items WHERE run_id = ? AND stage = ?",
+            [run_id, stage],
+        ).fetchall()
+        return {r[0]: r[1] for r in rows}
+
+    def delete_crawl_checkpoint(self, run_id: str) -> None:
+        self._con.execute("DELETE FROM crawl_checkpoint_items WHERE run_id = ?", [run_id])
+        self._con.execute("DELETE FROM crawl_checkpoints WHERE run_id = ?", [run_id])
+
+    def delete_stale_crawl_checkpoints(self, older_than: datetime) -> int:
+        stale = [
+            r[0]
+            for r in self._con.execute(
+                "SELECT run_id FROM crawl_checkpoints WHERE updated_at < ?", [older_than]
+            ).fetchall()
+        ]
+        for run_id in stale:
+            self.delete_crawl_checkpoint(run_id)
+        return len(stale)
+
+    def create_crawl_epoch(self, epoch_id: str, source_id: str, plan: dict) -> None:
+        self._con.execute(
+            "INSERT INTO crawl_epochs(epoch_id, source_id, plan_json, created_at) VALUES (?, ?, ?, ?)",
+            [epoch_id, source_id, json.dumps(plan), _utcnow()],
+        )
+
+    def get_crawl_epoch(self, epoch_id: str) -> dict | None:
+        row = self._con.execute(
+            "SELECT source_id, plan_json, created_at, finished_at FROM crawl_epochs WHERE epoch_id = ?",
+            [epoch_id],
+        ).fetchone()
+        if not row:
+            return None
+        shards = self._con.execute(
+            "SELECT shard, run_id, truncated, finished_at FROM crawl_epoch_shards WHERE epoch_id = ?",
+            [epoch_id],
+        ).fetchall()
+        return {
+            "epoch_id": epoch_id,
+            "source_id": row[0],
+            "plan": json.loads(row[1]),
+            "created_at": row[2],
+            "finished_at": row[3],
+            "shards": {r[0]: {"run_id": r[1], "truncated": bool(r[2]), "finished_at": r[3]} for r in shards},
+        }
+
+    def add_crawl_epoch_seen(self, epoch_id: str, job_uuids: Iterable[str]) -> None:
+        rows = [(epoch_id, job_uuid) for job_uuid in job_uuids]
+        if not rows:
+            return
+        self._con.executemany(
+            "INSERT OR IGNORE INTO crawl_epoch_seen(epoch_id, job_uuid) VALUES (?, ?)",
+            rows,
+        )
+
+    def get_crawl_epoch_seen(self, epoch_id: str) -> set[str]:
+        rows = self._con.execute(
+            """
+            SELECT job_uuid FROM crawl_epoch_seen WHERE epoch_id = ?
+            UNION
+            SELECT job_uuid FROM jobs
+             WHERE last_seen_at >= (SELECT created_at FROM crawl_epochs WHERE epoch_id = ?)
+            """,
+            [epoch_id, epoch_id],
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def finish_crawl_epoch_shard(self, epoch_id: str, shard: int, *, run_id: str, truncated: bool) -> None:
+        self._con.execute(
+            """
+            INSERT OR REPLACE INTO crawl_epoch_shards(epoch_id, shard, run_id, truncated, finished_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [epoch_id, shard, run_id, truncated, _utcnow()],
         )
 
+    def claim_crawl_epoch_finish(self, epoch_id: str) -> bool:
+        row = self._con.execute(
+            """
+            UPDATE crawl_epochs SET finished_at = ?
+             WHERE epoch_id = ? AND finished_at IS NULL
+            RETURNING epoch_id
+            """,
+            [_utcnow(), epoch_id],
+        ).fetchone()
+        return row is not None
+
     def existing_job_uuids(self) -> set[str]:
         rows = self._con.execute("SELECT job_uuid FROM jobs").fetchall()
         return {r[0] for r in rows}
@@ -302,6 +619,18 @@ class DuckDBStore(Storage):
             ).fetchall()
         return {r[0] for r in rows}
 
+
+    def get_job_categories(self, job_uuids: Sequence[str]) -> dict[str, list[str]]:
+        if not job_uuids:
+            return {}
+        rows = self._con.execute(
+            """
+            SELECT job_uuid, categories_json FROM jobs
+             WHERE job_uuid IN (SELECT UNNEST(?::VARCHAR[])) AND categories_json IS NOT NULL
+            """,
+            [list(job_uuids)],
+        ).fetchall()
+        return {r[0]: json.loads(r[1]) for r in rows if r[1]}
     def get_job_uuids_needing_rich_backfill(self, limit: int | None = None) -> list[str]:
         """Return MCF job UUIDs where categories_json is NULL or empty."""
         sql = """
@@ -351,61 +680,40 @@ class DuckDBStore(Storage):
         expiry_date: str | None = None,
         min_years_experience: int | None = None,
     ) -> None:
-        now = _utcnow()
-        skills_json_str = json.dumps(skills) if skills else None
-        categories_json_str = json.dumps(categories) if categories else None
-        employment_types_json_str = json.dumps(employment_types) if employment_types else None
-        position_levels_json_str = json.dumps(position_levels) if position_levels else None
         self._con.execute(
-            """
-            INSERT INTO jobs(job_uuid, job_source, first_seen_run_id, last_seen_run_id, is_active,
-                             first_seen_at, last_seen_at,
-                             title, company_name, location, job_url, skills_json,
-                             categories_json, employment_types_json, position_levels_json,
-                             salary_min, salary_max, posted_date, expiry_date, min_years_experience)
-            VALUES (?, ?, ?, ?, TRUE, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT (job_uuid) DO UPDATE SET
-              job_source = COALESCE(excluded.job_source, jobs.job_source),
-              last_seen_run_id = excluded.last_seen_run_id,
-              is_active = TRUE,
-              last_seen_at = excluded.last_seen_at,
-              title = COALESCE(excluded.title, jobs.title),
-              company_name = COALESCE(excluded.company_name, jobs.company_name),
-              location = COALESCE(excluded.location, jobs.location),
-              job_url = COALESCE(excluded.job_url, jobs.job_url),
-              skills_json = COALESCE(excluded.skills_json, jobs.skills_json),
-              categories_json = COALESCE(excluded.categories_json, jobs.categories_json),
-              employment_types_json = COALESCE(excluded.employment_types_json, jobs.employment_types_json),
-              position_levels_json = COALESCE(excluded.position_levels_json, jobs.position_levels_json),
-              salary_min = COALESCE(excluded.salary_min, jobs.salary_min),
-              salary_max = COALESCE(excluded.salary_max, jobs.salary_max),
-              posted_date = COALESCE(excluded.posted_date, jobs.posted_date),
-              expiry_date = COALESCE(excluded.expiry_date, jobs.expiry_date),
-              min_years_experience = COALESCE(excluded.min_years_experience, jobs.min_years_experience)
-            """,
-            [
-                job_uuid,
-                job_source,
-                run_id,
+            _UPSERT_JOB_DETAIL_SQL,
+            _job_detail_row(
                 run_id,
-                now,
-                now,
-                title,
-                company_name,
-                location,
-                job_url,
-                skills_json_str,
-                categories_json_str,
-                employment_types_json_str,
-                position_levels_json_str,
-                salary_min,
-                salary_max,
-                posted_date,
-                expiry_date,
-                min_years_experience,
-            ],
+                _utcnow(),
+                job_uuid=job_uuid,
+                title=title,
+                company_name=company_name,
+                location=location,
+                job_url=job_url,
+                job_source=job_source,
+                skills=skills,
+                categories=categories,
+                employment_types=employment_types,
+                position_levels=position_levels,
+                salary_min=salary_min,
+                salary_max=salary_max,
+                posted_date=posted_date,
+                expiry_date=expiry_date,
+                min_years_experience=min_years_experience,
+            ),
         )
 
+    def upsert_job_details(self, run_id: str, jobs: Sequence[dict]) -> None:
+        if not jobs:
+            return
+        now = _utcnow()
+        self._con.executemany(_UPSERT_JOB_DETAIL_SQL, [_job_detail_row(run_id, now, **job) for job in jobs])
+
+    def update_job_details(self, jobs: Sequence[dict]) -> None:
+        if not jobs:
+            return
+        self._con.executemany(_UPDATE_JOB_DETAIL_SQL, [_job_detail_update_row(**job) for job in jobs])
+
     def touch_jobs(self, *, run_id: str, job_uuids: Iterable[str]) -> None:
         now = _utcnow()
         rows = [(run_id, now, uuid) for uuid in job_uuids]
@@ -444,19 +752,33 @@ class DuckDBStore(Storage):
         self, *, content_hash: str, model_name: str, embed_type: str
     ) -> list[float] | None:
         """Return cached embedding by content hash, or None."""
+        return self.get_embeddings_by_content_hashes(
+            [content_hash], model_name=model_name, embed_type=embed_type
+        ).get(content_hash)
+
+    def get_embeddings_by_content_hashes(
+        self, content_hashes: Sequence[str], *, model_name: str, embed_type: str
+    ) -> dict[str, list[float]]:
+        """Return cached embeddings for ``content_hashes`` (misses omitted) in one query."""
+        hashes = list(dict.fromkeys(content_hashes))
+        if not hashes:
+            return {}
         try:
-            row = self._con.execute(
+            rows = self._con.execute(
                 """
-                SELECT embedding_json FROM embeddings_cache
-                WHERE content_hash = ? AND model_name = ? AND embed_type = ?
+                SELECT content_hash, embedding_blob, embedding_dtype, embedding_json
+                  FROM embeddings_cache
+                 WHERE model_name = ? AND embed_type = ?
+                   AND content_hash IN (SELECT UNNEST(?::VARCHAR[]))
                 """,
-                [content_hash, model_name, embed_type],
-            ).fetchone()
+                [model_name, embed_type, hashes],
+            ).fetchall()
         except Exception:
-            return None
-        if not row:
-            return None
-        return json.loads(row[0])
+            return {}
+        return {
+            ch: decode_embedding(blob, dtype) if blob is not None else json.loads(emb_json)
+            for ch, blob, dtype, emb_json in rows
+        }
 
     def batch_upsert_job_classifications(
         self, classifications: list[tuple[str, int, str]]
@@ -472,17 +794,41 @@ class DuckDBStore(Storage):
         self, *, content_hash: str, model_name: str, embed_type: str, embedding: Sequence[float]
     ) -> None:
         """Store embedding in cache by content hash."""
-        emb_list = [float(x) for x in embedding]
+        self.upsert_embeddings_cache(
+            [(content_hash, embedding)], model_name=model_name, embed_type=embed_type
+        )
+
+    def upsert_embeddings_cache(
+        self,
+        items: Sequence[tuple[str, Sequence[float]]],
+        *,
+        model_name: str,
+        embed_type: str,
+    ) -> None:
+        """Store ``(content_hash, embedding)`` pairs in the cache as one batch."""
+        if not items:
+            return
+        dtype = embeddings_cache_dtype()
+        # Deduplicated by hash: one statement cannot upsert the same key twice.
+        unique = dict(items)
+        params: list = []
+        for ch, emb in unique.items():
+            params += [ch, model_name, embed_type, encode_embedding(emb, dtype), dtype, len(emb)]
+        values = ", ".join(["(?, ?, ?, ?, ?, NULL, ?, CURRENT_TIMESTAMP)"] * len(unique))
         self._con.execute(
-            """
-            INSERT INTO embeddings_cache(content_hash, model_name, embed_type, embedding_json, dim, cached_at)
-            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            f"""
+            INSERT INTO embeddings_cache(
+              content_hash, model_name, embed_type, embedding_blob, embedding_dtype, embedding_json, dim, cached_at
+            )
+            VALUES {values}
             ON CONFLICT (content_hash, model_name, embed_type) DO UPDATE SET
-              embedding_json = excluded.embedding_json,
+              embedding_blob = excluded.embedding_blob,
+              embedding_dtype = excluded.embedding_dtype,
+              embedding_json = NULL,
               dim = excluded.dim,
               cached_at = excluded.cached_at
             """,
-            [content_hash, model_name, embed_type, json.dumps(emb_list), len(emb_list)],
+            params,
         )
 
     def upsert_embedding(self, *, job_uuid: str, model_name: str, embedding: Sequence[float]) -> None:
@@ -936,7 +1282,8 @@ class DuckDBStore(Storage):
         """Get recent crawl runs with statistics."""
         rows = self._con.execute(
             """
-            SELECT run_id, started_at, finished_at, total_seen, added, maintained, removed
+            SELECT run_id, started_at, finished_at, total_seen, added, maintained, removed,
+                   kind, telemetry_json
             FROM crawl_runs
             WHERE finished_at IS NOT NULL
             ORDER BY finished_at DESC
@@ -953,6 +1300,8 @@ class DuckDBStore(Storage):
                 "added": row[4],
                 "maintained": row[5],
                 "removed": row[6],
+                "kind": row[7],
+                "telemetry": json.loads(row[8]) if row[8] else None,
             }
             for row in rows
         ]
@@ -19,13 +19,116 @@ import psycopg2.extras
 from psycopg2 import pool as pg_pool
 from psycopg2.extras import execute_values
 
-from mcf.lib.storage.base import RunStats, Storage
+from mcf.lib.storage.base import (
+    RunStats,
+    Storage,
+    decode_embedding,
+    embeddings_cache_dtype,
+    encode_embedding,
+)
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+_UPSERT_JOB_DETAIL_SQL = """
+    INSERT INTO jobs(job_uuid, job_source, first_seen_run_id, last_seen_run_id,
+                     is_active, first_seen_at, last_seen_at,
+                     title, company_name, location, job_url, skills_json,
+                     categories_json, employment_types_json, position_levels_json,
+                     salary_min, salary_max, posted_date, expiry_date, min_years_experience)
+    VALUES (%s, %s, %s, %s, TRUE, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (job_uuid) DO UPDATE SET
+      job_source            = COALESCE(EXCLUDED.job_source, jobs.job_source),
+      last_seen_run_id      = EXCLUDED.last_seen_run_id,
+      is_active             = TRUE,
+      last_seen_at          = EXCLUDED.last_seen_at,
+      title                 = COALESCE(EXCLUDED.title, jobs.title),
+      company_name          = COALESCE(EXCLUDED.company_name, jobs.company_name),
+      location              = COALESCE(EXCLUDED.location, jobs.location),
+      job_url               = COALESCE(EXCLUDED.job_url, jobs.job_url),
+      skills_json           = COALESCE(EXCLUDED.skills_json, jobs.skills_json),
+      categories_json       = COALESCE(EXCLUDED.categories_json, jobs.categories_json),
+      employment_types_json = COALESCE(EXCLUDED.employment_types_json, jobs.employment_types_json),
+      position_levels_json  = COALESCE(EXCLUDED.position_levels_json, jobs.position_levels_json),
+      salary_min            = COALESCE(EXCLUDED.salary_min, jobs.salary_min),
+      salary_max            = COALESCE(EXCLUDED.salary_max, jobs.salary_max),
+      posted_date           = COALESCE(EXCLUDED.posted_date, jobs.posted_date),
+      expiry_date           = COALESCE(EXCLUDED.expiry_date, jobs.expiry_date),
+      min_years_experience  = COALESCE(EXCLUDED.min_years_experience, jobs.min_years_experience)
+"""
+
+
+def _job_detail_row(
+    run_id: str,
+    now: datetime,
+    *,
+    job_uuid: str,
+    title: str | None,
+    company_name: str | None,
+    location: str | None,
+    job_url: str | None,
+    job_source: str = "mcf",
+    skills: list[str] | None = None,
+    raw_json: dict | None = None,
+    categories: list[str] | None = None,
+    employment_types: list[str] | None = None,
+    position_levels: list[str] | None = None,
+    salary_min: int | None = None,
+    salary_max: int | None = None,
+    posted_date: str | None = None,
+    expiry_date: str | None = None,
+    min_years_experience: int | None = None,
+) -> list:
+    """Parameters of ``_UPSERT_JOB_DETAIL_SQL`` for one job."""
+    return [
+        job_uuid, job_source, run_id, run_id,
+        now, now, title, company_name, location, job_url,
+        json.dumps(skills) if skills else None,
+        json.dumps(categories) if categories else None,
+        json.dumps(employment_types) if employment_types else None,
+        json.dumps(position_levels) if position_levels else None,
+        salary_min, salary_max, posted_date, expiry_date, min_years_experience,
+    ]
+
+
+_UPDATE_JOB_DETAIL_SQL = """
+    UPDATE jobs SET
+      job_source            = COALESCE(%s, job_source),
+      title                 = COALESCE(%s, title),
+      company_name          = COALESCE(%s, company_name),
+      location              = COALESCE(%s, location),
+      job_url               = COALESCE(%s, job_url),
+      skills_json           = COALESCE(%s, skills_json),
+      categories_json       = COALESCE(%s, categories_json),
+      employment_types_json = COALESCE(%s, employment_types_json),
+      position_levels_json  = COALESCE(%s, position_levels_json),
+      salary_min            = COALESCE(%s, salary_min),
+      salary_max            = COALESCE(%s, salary_max),
+      posted_date           = COALESCE(%s, posted_date),
+      expiry_date           = COALESCE(%s, expiry_date),
+      min_years_experience  = COALESCE(%s, min_years_experience)
+    WHERE job_uuid = %s
+"""
+
+
+def _job_detail_update_row(**fields) -> list:
+    """Parameters of ``_UPDATE_JOB_DETAIL_SQL``: the upsert's field values, job_uuid last."""
+    row = _job_detail_row("", None, **fields)
+    # Upsert order: job_uuid, job_source, 2 run ids, 2 timestamps, then the parsed fields.
+    return [row[1], *row[6:], row[0]]
+
+
+# (table, column) -> migration that adds it, for columns every crawl run writes
+_CRAWL_SCHEMA = {
+    ("crawl_checkpoints", "state_json"): "011_add_crawl_checkpoints.sql",
+    ("crawl_checkpoint_items", "payload"): "011_add_crawl_checkpoints.sql",
+    ("jobs", "source_updated_at"): "012_add_job_source_updated_at.sql",
+    ("crawl_runs", "telemetry_json"): "014_add_crawl_run_telemetry.sql",
+}
+
+
 class PostgresStore(Storage):
     """PostgreSQL-backed persistence layer — mirrors DuckDBStore API exactly."""
 
@@ -38,6 +141,9 @@ class PostgresStore(Storage):
         )
         self._job_emb_select: str | None = None  # cached: "e.embedding_json" or "e.embedding::text"
         self._job_emb_has_vector: bool | None = None  # cached: True if embedding column exists
+        self._crawl_schema_checked = False
+        self._emb_cache_has_blob: bool | None = None  # cached: migration 015 applied
+        self._emb_cache_checked = False
 
     def close(self) -> None:
         self._pool.closeall()
@@ -101,7 +207,14 @@ class PostgresStore(Storage):
         )
 
     def finish_run(
-        self, run_id: str, *, total_seen: int, added: int, maintained: int, removed: int
+        self,
+        run_id: str,
+        *,
+        total_seen: int,
+        added: int,
+        maintained: int,
+        removed: int,
+        telemetry: dict | None = None,
     ) -> None:
         with self._cur() as cur:
             cur.execute(
@@ -111,17 +224,27 @@ class PostgresStore(Storage):
                        total_seen = %s,
                        added = %s,
                        maintained = %s,
-                       removed = %s
+                       removed = %s,
+                       telemetry_json = %s
                  WHERE run_id = %s
                 """,
-                [_utcnow(), total_seen, added, maintained, removed, run_id],
+                [
+                    _utcnow(),
+                    total_seen,
+                    added,
+                    maintained,
+                    removed,
+                    json.dumps(telemetry) if telemetry is not None else None,
+                    run_id,
+                ],
             )
 
     def get_recent_runs(self, limit: int = 10) -> list[dict]:
         with self._cur() as cur:
             cur.execute(
                 """
-                SELECT run_id, started_at, finished_at, total_seen, added, maintained, removed
+                SELECT run_id, started_at, finished_at, total_seen, added, maintained, removed,
+                       kind, telemetry_json
                 FROM crawl_runs
                 WHERE finished_at IS NOT NULL
                 ORDER BY finished_at DESC
@@ -139,10 +262,188 @@ class PostgresStore(Storage):
                 "added": r[4],
                 "maintained": r[5],
                 "removed": r[6],
+                "kind": r[7],
+                "telemetry": json.loads(r[8]) if r[8] else None,
             }
             for r in rows
         ]
 
+    # === Change detection ===
+
+    def job_watermarks(self) -> dict[str, str]:
+        with self._cur() as cur:
+            cur.execute("SELECT job_uuid, source_updated_at FROM jobs WHERE source_updated_at IS NOT NULL")
+            return {r[0]: r[1] for r in cur.fetchall()}
+
+    def set_job_watermarks(self, items: Iterable[tuple[str, str]]) -> None:
+        rows = [(watermark, job_uuid) for job_uuid, watermark in items]
+        if not rows:
+            return
+        with self._cur() as cur:
+            cur.executemany("UPDATE jobs SET source_updated_at = %s WHERE job_uuid = %s", rows)
+
+    # === Crawl checkpoints ===
+
+    def save_crawl_checkpoint(self, run_id: str, state: dict) -> None:
+        with self._cur() as cur:
+            cur.execute(
+                """
+                INSERT INTO crawl_checkpoints(run_id, state_json, updated_at) VALUES (%s, %s, %s)
+                ON CONFLICT (run_id) DO UPDATE SET
+                  state_json = EXCLUDED.state_json,
+                  updated_at = EXCLUDED.updated_at
+                """,
+                [run_id, json.dumps(state), _utcnow()],
+            )
+
+    def get_crawl_checkpoint(self, run_id: str) -> dict | None:
+        with self._cur() as cur:
+            cur.execute("SELECT state_json FROM crawl_checkpoints WHERE run_id = %s", [run_id])
+            row = cur.fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_crawl_checkpoint_items(
+        self, run_id: str, stage: str, items: Iterable[tuple[str, str | None]]
+    ) -> None:
+        rows = [(run_id, stage, job_uuid, payload) for job_uuid, payload in items]
+        if not rows:
+            return
+        with self._cur() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO crawl_checkpoint_items(run_id, stage, job_uuid, payload) VALUES %s
+                ON CONFLICT (run_id, stage, job_uuid) DO UPDATE SET payload = EXCLUDED.payload
+                """,
+                rows,
+            )
+
+    def get_crawl_checkpoint_items(self, run_id: str, stage: str) -> dict[str, str | None]:
+        with self._cur() as cur:
+            cur.execute(
+                "SELECT job_uuid, payload FROM crawl_checkpoint_items WHERE run_id = %s AND stage = %s",
+                [run_id, stage],
+            )
+            rows = cur.fetchall()
+        return {r[0]: r[1] for r in rows}
+
+    def delete_crawl_checkpoint(self, run_id: str) -> None:
+        with self._cur() as cur:
+            cur.execute("DELETE FROM crawl_checkpoint_items WHERE run_id = %s", [run_id])
+            cur.execute("DELETE FROM crawl_checkpoints WHERE run_id = %s", [run_id])
+
+    def delete_stale_crawl_checkpoints(self, older_than: datetime) -> int:
+        with self._cur() as cur:
+            cur.execute(
+                """
+                DELETE FROM crawl_checkpoint_items
+                WHERE run_id IN (SELECT run_id FROM crawl_checkpoints WHERE updated_at < %s)
+                """,
+                [older_than],
+            )
+            cur.execute("DELETE FROM crawl_checkpoints WHERE updated_at < %s", [older_than])
+            return cur.rowcount
+
+    def check_crawl_schema(self) -> None:
+        if self._crawl_schema_checked:
+            return
+        with self._cur() as cur:
+            cur.execute(
+                "SELECT table_name, column_name FROM information_schema.columns "
+                "WHERE (table_name, column_name) IN %s",
+                [tuple(_CRAWL_SCHEMA)],
+            )
+            present = {(r[0], r[1]) for r in cur.fetchall()}
+        missing = sorted({migration for column, migration in _CRAWL_SCHEMA.items() if column not in present})
+        if missing:
+            raise RuntimeError(
+                "The Postgres schema is missing columns the crawl needs. Apply these migrations first:\n"
+                + "\n".join(f"  psql $DATABASE_URL -f scripts/migrations/{m}" for m in missing)
+            )
+        self._crawl_schema_checked = True
+
+    # === Crawl epochs ===
+
+    def create_crawl_epoch(self, epoch_id: str, source_id: str, plan: dict) -> None:
+        with self._cur() as cur:
+            cur.execute(
+                "INSERT INTO crawl_epochs(epoch_id, source_id, plan_json, created_at) VALUES (%s, %s, %s, %s)",
+                [epoch_id, source_id, json.dumps(plan), _utcnow()],
+            )
+
+    def get_crawl_epoch(self, epoch_id: str) -> dict | None:
+        with self._cur() as cur:
+            cur.execute(
+                "SELECT source_id, plan_json, created_at, finished_at FROM crawl_epochs WHERE epoch_id = %s",
+                [epoch_id],
+            )
+            row = cur.fetchone()
+            if not row:
+                return None
+            cur.execute(
+                "SELECT shard, run_id, truncated, finished_at FROM crawl_epoch_shards WHERE epoch_id = %s",
+                [epoch_id],
+            )
+            shards = cur.fetchall()
+        return {
+            "epoch_id": epoch_id,
+            "source_id": row[0],
+            "plan": json.loads(row[1]),
+            "created_at": row[2],
+            "finished_at": row[3],
+            "shards": {r[0]: {"run_id": r[1], "truncated": bool(r[2]), "finished_at": r[3]} for r in shards},
+        }
+
+    def add_crawl_epoch_seen(self, epoch_id: str, job_uuids: Iterable[str]) -> None:
+        rows = [(epoch_id, job_uuid) for job_uuid in job_uuids]
+        if not rows:
+            return
+        with self._cur() as cur:
+            execute_values(
+                cur,
+                "INSERT INTO crawl_epoch_seen(epoch_id, job_uuid) VALUES %s ON CONFLICT DO NOTHING",
+                rows,
+            )
+
+    def get_crawl_epoch_seen(self, epoch_id: str) -> set[str]:
+        with self._cur() as cur:
+            cur.execute(
+                """
+                SELECT job_uuid FROM crawl_epoch_seen WHERE epoch_id = %s
+                UNION
+                SELECT job_uuid FROM jobs
+                 WHERE last_seen_at >= (SELECT created_at FROM crawl_epochs WHERE epoch_id = %s)
+                """,
+                [epoch_id, epoch_id],
+            )
+            return {r[0] for r in cur.fetchall()}
+
+    def finish_crawl_epoch_shard(self, epoch_id: str, shard: int, *, run_id: str, truncated: bool) -> None:
+        with self._cur() as cur:
+            cur.execute(
+                """
+                INSERT INTO crawl_epoch_shards(epoch_id, shard, run_id, truncated, finished_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (epoch_id, shard) DO UPDATE SET
+                  run_id = EXCLUDED.run_id,
+                  truncated = EXCLUDED.truncated,
+                  finished_at = EXCLUDED.finished_at
+                """,
+                [epoch_id, shard, run_id, truncated, _utcnow()],
+            )
+
+    def claim_crawl_epoch_finish(self, epoch_id: str) -> bool:
+        with self._cur() as cur:
+            cur.execute(
+                """
+                UPDATE crawl_epochs SET finished_at = %s
+                 WHERE epoch_id = %s AND finished_at IS NULL
+                RETURNING epoch_id
+                """,
+                [_utcnow(), epoch_id],
+            )
+            return cur.fetchone() is not None
+
     # === Job lifecycle ===
 
     def existing_job_uuids(self) -> set[str]:
@@ -168,6 +469,20 @@ class PostgresStore(Storage):
                 )
             return {r[0] for r in cur.fetchall()}
 
+
+    def get_job_categories(self, job_uuids: Sequence[str]) -> dict[str, list[str]]:
+        if not job_uuids:
+            return {}
+        with self._cur() as cur:
+            cur.execute(
+                """
+                SELECT job_uuid, categories_json FROM jobs
+                 WHERE job_uuid = ANY(%s) AND categories_json IS NOT NULL
+                """,
+                [list(job_uuids)],
+            )
+            rows = cur.fetchall()
+        return {r[0]: json.loads(r[1]) for r in rows if r[1]}
     def get_job_uuids_needing_rich_backfill(self, limit: int | None = None) -> list[str]:
         """Return MCF job UUIDs where categories_json is NULL or empty."""
         with self._cur() as cur:
@@ -251,45 +566,40 @@ class PostgresStore(Storage):
         expiry_date: str | None = None,
         min_years_experience: int | None = None,
     ) -> None:
+        row = _job_detail_row(
+            run_id, _utcnow(),
+            job_uuid=job_uuid, title=title, company_name=company_name, location=location,
+            job_url=job_url, job_source=job_source, skills=skills, categories=categories,
+            employment_types=employment_types, position_levels=position_levels,
+            salary_min=salary_min, salary_max=salary_max, posted_date=posted_date,
+            expiry_date=expiry_date, min_years_experience=min_years_experience,
+        )
+        with self._cur() as cur:
+            cur.execute(_UPSERT_JOB_DETAIL_SQL, row)
+
+    def upsert_job_details(self, run_id: str, jobs: Sequence[dict]) -> None:
+        if not jobs:
+            return
         now = _utcnow()
-        skills_json_str = json.dumps(skills) if skills else None
-        categories_json_str = json.dumps(categories) if categories else None
-        employment_types_json_str = json.dumps(employment_types) if employment_types else None
-        position_levels_json_str = json.dumps(position_levels) if position_levels else None
         with self._cur() as cur:
-            cur.execute(
-                """
-                INSERT INTO jobs(job_uuid, job_source, first_seen_run_id, last_seen_run_id,
-                                 is_active, first_seen_at, last_seen_at,
-                                 title, company_name, location, job_url, skills_json,
-                                 categories_json, employment_types_json, position_levels_json,
-                                 salary_min, salary_max, posted_date, expiry_date, min_years_experience)
-                VALUES (%s, %s, %s, %s, TRUE, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (job_uuid) DO UPDATE SET
-                  job_source            = COALESCE(EXCLUDED.job_source, jobs.job_source),
-                  last_seen_run_id      = EXCLUDED.last_seen_run_id,
-                  is_active             = TRUE,
-                  last_seen_at          = EXCLUDED.last_seen_at,
-                  title                 = COALESCE(EXCLUDED.title, jobs.title),
-                  company_name          = COALESCE(EXCLUDED.company_name, jobs.company_name),
-                  location              = COALESCE(EXCLUDED.location, jobs.location),
-                  job_url               = COALESCE(EXCLUDED.job_url, jobs.job_url),
-                  skills_json           = COALESCE(EXCLUDED.skills_json, jobs.skills_json),
-                  categories_json       = COALESCE(EXCLUDED.categories_json, jobs.categories_json),
-                  employment_types_json = COALESCE(EXCLUDED.employment_types_json, jobs.employment_types_json),
-                  position_levels_json  = COALESCE(EXCLUDED.position_levels_json, jobs.position_levels_json),
-                  salary_min            = COALESCE(EXCLUDED.salary_min, jobs.salary_min),
-                  salary_max            = COALESCE(EXCLUDED.salary_max, jobs.salary_max),
-                  posted_date           = COALESCE(EXCLUDED.posted_date, jobs.posted_date),
-                  expiry_date           = COALESCE(EXCLUDED.expiry_date, jobs.expiry_date),
-                  min_years_experience  = COALESCE(EXCLUDED.min_years_experience, jobs.min_years_experience)
-                """,
-                [
-                    job_uuid, job_source, run_id, run_id,
-                    now, now, title, company_name, location, job_url, skills_json_str,
-                    categories_json_str, employment_types_json_str, position_levels_json_str,
-                    salary_min, salary_max, posted_date, expiry_date, min_years_experience,
-                ],
+            # execute_batch rather than one multi-row INSERT: ON CONFLICT cannot
+            # update the same row twice within a single statement.
+            psycopg2.extras.execute_batch(
+                cur,
+                _UPSERT_JOB_DETAIL_SQL,
+                [_job_detail_row(run_id, now, **job) for job in jobs],
+                page_size=500,
+            )
+
+    def update_job_details(self, jobs: Sequence[dict]) -> None:
+        if not jobs:
+            return
+        with self._cur() as cur:
+            psycopg2.extras.execute_batch(
+                cur,
+                _UPDATE_JOB_DETAIL_SQL,
+                [_job_detail_update_row(**job) for job in jobs],
+                page_size=500,
             )
 
     def get_job(self, job_uuid: str) -> dict | None:
@@ -324,43 +634,122 @@ class PostgresStore(Storage):
         self, *, content_hash: str, model_name: str, embed_type: str
     ) -> list[float] | None:
         """Return cached embedding by content hash, or None."""
-        try:
-            with self._cur() as cur:
-                cur.execute(
-                    """
-                    SELECT embedding_json FROM embeddings_cache
-                    WHERE content_hash = %s AND model_name = %s AND embed_type = %s
-                    """,
-                    [content_hash, model_name, embed_type],
-                )
-                row = cur.fetchone()
-        except psycopg2.ProgrammingError:
-            return None  # table may not exist
-        if not row:
-            return None
-        return json.loads(row[0])
+        return self.get_embeddings_by_content_hashes(
+            [content_hash], model_name=model_name, embed_type=embed_type
+        ).get(content_hash)
+
+    def get_embeddings_by_content_hashes(
+        self, content_hashes: Sequence[str], *, model_name: str, embed_type: str
+    ) -> dict[str, list[float]]:
+        """Return cached embeddings for ``content_hashes`` (misses omitted) in one query."""
+        hashes = list(dict.fromkeys(content_hashes))
+        if not hashes:
+            return {}
+        has_blob = self._embeddings_cache_has_blob()
+        if has_blob is None:
+            return {}
+        blob_columns = "embedding_blob, embedding_dtype" if has_blob else "NULL, NULL"
+        with self._cur() as cur:
+            cur.execute(
+                f"""
+                SELECT content_hash, {blob_columns}, embedding_json
+                  FROM embeddings_cache
+                 WHERE model_name = %s AND embed_type = %s AND content_hash = ANY(%s)
+                """,
+                [model_name, embed_type, hashes],
+            )
+            rows = cur.fetchall()
+        return {
+            ch: decode_embedding(bytes(blob), dtype) if blob is not None else json.loads(emb_json)
+            for ch, blob, dtype, emb_json in rows
+        }
 
     def upsert_embedding_cache(
         self, *, content_hash: str, model_name: str, embed_type: str, embedding: Sequence[float]
     ) -> None:
         """Store embedding in cache by content hash."""
-        emb_list = [float(x) for x in embedding]
-        emb_str = json.dumps(emb_list)
-        try:
+        self.upsert_embeddings_cache(
+            [(content_hash, embedding)], model_name=model_name, embed_type=embed_type
+        )
+
+    def upsert_embeddings_cache(
+        self,
+        items: Sequence[tuple[str, Sequence[float]]],
+        *,
+        model_name: str,
+        embed_type: str,
+    ) -> None:
+        """Store ``(content_hash, embedding)`` pairs in the cache as one batch."""
+        if not items:
+            return
+        has_blob = self._embeddings_cache_has_blob()
+        if has_blob is None:
+            return
+        unique = dict(items)  # one INSERT cannot upsert the same key twice
+        if not has_blob:
+            rows = [
+                (ch, model_name, embed_type, json.dumps([float(x) for x in emb]), len(emb))
+                for ch, emb in unique.items()
+            ]
             with self._cur() as cur:
-                cur.execute(
+                execute_values(
+                    cur,
                     """
                     INSERT INTO embeddings_cache(content_hash, model_name, embed_type, embedding_json, dim, cached_at)
-                    VALUES (%s, %s, %s, %s, %s, NOW())
+                    VALUES %s
                     ON CONFLICT (content_hash, model_name, embed_type) DO UPDATE SET
                       embedding_json = EXCLUDED.embedding_json,
                       dim = EXCLUDED.dim,
                       cached_at = EXCLUDED.cached_at
                     """,
-                    [content_hash, model_name, embed_type, emb_str, len(emb_list)],
+                    rows,
+                    template="(%s, %s, %s, %s, %s, NOW())",
+                    page_size=len(rows),
                 )
-        except psycopg2.ProgrammingError:
-            pass  # table may not exist
+            return
+        dtype = embeddings_cache_dtype()
+        rows = [
+            (ch, model_name, embed_type, psycopg2.Binary(encode_embedding(emb, dtype)), dtype, len(emb))
+            for ch, emb in unique.items()
+        ]
+        with self._cur() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO embeddings_cache(
+                  content_hash, model_name, embed_type, embedding_blob, embedding_dtype, dim, cached_at
+                )
+                VALUES %s
+                ON CONFLICT (content_hash, model_name, embed_type) DO UPDATE SET
+                  embedding_blob = EXCLUDED.embedding_blob,
+                  embedding_dtype = EXCLUDED.embedding_dtype,
+                  embedding_json = NULL,
+                  dim = EXCLUDED.dim,
+                  cached_at = EXCLUDED.cached_at
+                """,
+                rows,
+                template="(%s, %s, %s, %s, %s, %s, NOW())",
+                page_size=len(rows),
+            )
+
+    def _embeddings_cache_has_blob(self) -> bool | None:
+        """Whether embeddings_cache has migration 015's blob columns (None: no table, migration 004 missing)."""
+        if self._emb_cache_checked:
+            return self._emb_cache_has_blob
+        with self._cur() as cur:
+            cur.execute(
+                "SELECT column_name FROM information_schema.columns WHERE table_name = 'embeddings_cache'"
+            )
+            cols = {r[0] for r in cur.fetchall()}
+        self._emb_cache_checked = True
+        if cols:
+            self._emb_cache_has_blob = "embedding_blob" in cols
+            if not self._emb_cache_has_blob:
+                print(
+                    "Warning: embeddings_cache has no embedding_blob column; caching as JSON. Apply "
+                    "scripts/migrations/015_add_embeddings_cache_blob.sql for compact binary vectors."
+                )
+        return self._emb_cache_has_blob
 
     # === Job classifications ===
 
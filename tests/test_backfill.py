@@ -0,0 +1,94 @@
+"""Rich-field backfill: interrupted runs are closed and continued from the checkpoint."""
+
+from collections import Counter
+
+import pytest
+
+from mcf.lib.api.client import MCFAPIError
+from mcf.lib.pipeline import backfill
+from mcf.lib.pipeline.backfill import BACKFILL_CHECKPOINT_KEY, run_rich_backfill
+from mcf.lib.pipeline.checkpoint import CrawlCheckpoint
+from mcf.lib.pipeline.incremental_crawl import run_incremental_crawl
+from mcf.lib.replay.benchmark import HashEmbedder
+from mcf.lib.sources.base import NormalizedJob
+from mcf.lib.storage.duckdb_store import DuckDBStore
+
+JOB_IDS = ["a", "b", "c-gone", "d", "e-flaky", "z-crash"]  # fetched in this order
+
+
+class _BackfillSource:
+    """Lists ``JOB_IDS``; serves details with categories only when ``rich``.
+
+    ``c-gone`` is a 404, ``e-flaky`` fails with a 500 for its first
+    ``flaky_failures`` calls, and ``z-crash`` interrupts the process on its first call.
+    """
+
+    source_id = "mcf"
+
+    def __init__(self, *, rich: bool = True, flaky_failures: int = 0) -> None:
+        self.rich = rich
+        self.flaky_failures = flaky_failures
+        self.calls: Counter[str] = Counter()
+
+    def list_job_ids(self, *, categories=None, limit=None, on_progress=None, known_ids=None, checkpoint=None):
+        return list(JOB_IDS)
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        self.calls[job_id] += 1
+        if self.rich:
+            if job_id == "c-gone":
+                raise MCFAPIError(404, "Not found")
+            if job_id == "e-flaky" and self.calls[job_id] <= self.flaky_failures:
+                raise MCFAPIError(500, "Internal Server Error")
+            if job_id == "z-crash" and self.calls[job_id] == 1:
+                raise KeyboardInterrupt
+        return NormalizedJob(
+            source_id="mcf",
+            external_id=job_id,
+            title=f"Job {job_id}",
+            company_name="Acme",
+            location="Singapore",
+            job_url=None,
+            skills=["Python"],
+            description_snippet="Build things.",
+            categories=["Engineering"] if self.rich else [],
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DuckDBStore(str(tmp_path / "backfill.duckdb"))
+    run_incremental_crawl(store=s, source=_BackfillSource(rich=False), embedder=HashEmbedder())
+    yield s
+    s.close()
+
+
+def test_backfill_resumes_after_failure(store, monkeypatch):
+    monkeypatch.setattr(backfill, "_UPSERT_BATCH_SIZE", 2)
+    source = _BackfillSource(flaky_failures=2)
+    assert store.get_job_uuids_needing_rich_backfill() == sorted(JOB_IDS)
+
+    with pytest.raises(KeyboardInterrupt):
+        run_rich_backfill(store=store, source=source, concurrency=1)
+    (failed_run,) = [r for r in store.get_recent_runs(limit=10) if r["kind"] == "backfill"]
+    assert failed_run["finished_at"] is not None
+    assert failed_run["telemetry"]["error"].startswith("KeyboardInterrupt")
+    assert (failed_run["added"], failed_run["removed"]) == (3, 1)  # a, b, d updated; 404 counted
+    assert CrawlCheckpoint.load(store, BACKFILL_CHECKPOINT_KEY) is not None
+
+    second = run_rich_backfill(store=store, source=source, concurrency=1)
+    assert second.resumed and second.total == len(JOB_IDS)
+    assert second.skipped == 4  # a, b, d and the 404 were written before the crash
+    assert (second.updated, second.not_found, second.failed) == (1, 0, 1)
+    assert CrawlCheckpoint.load(store, BACKFILL_CHECKPOINT_KEY) is not None  # e-flaky failed again
+
+    third = run_rich_backfill(store=store, source=source, concurrency=1)
+    assert third.resumed and third.skipped == 5
+    assert (third.updated, third.failed) == (1, 0)
+    assert CrawlCheckpoint.load(store, BACKFILL_CHECKPOINT_KEY) is None
+
+    assert source.calls == {"a": 1, "b": 1, "c-gone": 1, "d": 1, "e-flaky": 3, "z-crash": 2}
+    assert store.get_job_uuids_needing_rich_backfill() == ["c-gone"]
+    runs = [r for r in store.get_recent_runs(limit=10) if r["kind"] == "backfill"]
+    assert len(runs) == 3 and all(r["finished_at"] is not None for r in runs)
+
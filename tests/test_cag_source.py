@@ -0,0 +1,85 @@
+"""Careers@Gov source against the local replay server: concurrent listing, search ingest, multi-get."""
+
+import asyncio
+
+import pytest
+
+from mcf.lib.archive.raw_archive import ARCHIVE_DIR_ENV, RawArchive
+from mcf.lib.replay.server import ReplayFixtures, ReplayServer
+from mcf.lib.sources import cag_source
+from mcf.lib.sources.cag_source import CareersGovJobSource
+
+N_JOBS = 10
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    monkeypatch.delenv(ARCHIVE_DIR_ENV, raising=False)
+    with ReplayServer(ReplayFixtures.synthetic(mcf=0, cag=N_JOBS, seed=3)) as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        yield server
+
+
+def _job_uuids(server: ReplayServer) -> list[str]:
+    return [f"cag:{object_id}" for object_id in server.fixtures.cag_objects]
+
+
+def test_get_job_details_uses_multi_get(replay, monkeypatch):
+    monkeypatch.setattr(cag_source, "_MULTI_GET_MAX", 4)
+    source = CareersGovJobSource(rate_limit=0)
+    job_uuids = [*_job_uuids(replay), "cag:missing"]
+    try:
+        jobs = source.get_job_details(job_uuids)
+    finally:
+        source.close()
+    assert [job.job_uuid if job else None for job in jobs] == [*job_uuids[:-1], None]
+    assert replay.stats["cag_multi_get"] == 3  # 11 IDs, 4 per request
+    assert replay.stats["cag_detail"] == 0
+
+
+def test_aget_job_details_matches_sync(replay):
+    source = CareersGovJobSource(rate_limit=0)
+    job_uuids = _job_uuids(replay)
+
+    async def fetch():
+        try:
+            return await source.aget_job_details(job_uuids)
+        finally:
+            await source.aclose()
+
+    try:
+        assert asyncio.run(fetch()) == source.get_job_details(job_uuids)
+    finally:
+        source.close()
+    assert replay.stats["cag_multi_get"] == 2
+
+
+def test_listing_runs_keywords_concurrently_and_ingests_hits(replay):
+    serial = CareersGovJobSource(rate_limit=0, listing_workers=1, search_ingest=False).list_job_ids()
+    searches = replay.stats["cag_search"]
+    source = CareersGovJobSource(rate_limit=0, listing_workers=8)
+    try:
+        listed = source.list_job_ids()
+        assert listed == serial  # keyword order, whatever order the searches finish in
+        assert sorted(listed) == sorted(_job_uuids(replay))
+        assert replay.stats["cag_search"] == 2 * searches == 2 * len(cag_source._LIST_KEYWORDS)
+        jobs = source.get_job_details(listed)
+        assert source.get_job_detail(listed[0]).job_uuid == listed[0]  # no longer kept: a detail request
+    finally:
+        source.close()
+    assert [job.job_uuid for job in jobs] == listed
+    assert replay.stats["cag_multi_get"] == 0
+    assert replay.stats["cag_detail"] == 1
+
+
+def test_listing_archives_each_hit_once(replay, tmp_path):
+    archive = RawArchive(tmp_path)
+    for listing in range(2):
+        for raw in replay.fixtures.cag_objects.values():
+            raw["_rankingInfo"] = {"listing": listing}  # per-query metadata is not part of the version
+        CareersGovJobSource(rate_limit=0, archive=archive).list_job_ids()
+    archive.flush()
+    records = list(archive.iter_records("cag"))
+    assert sorted(r.job_uuid for r in records) == sorted(_job_uuids(replay))
+    assert all(not any(key.startswith("_") for key in r.raw) for r in records)
@@ -0,0 +1,436 @@
+"""Incremental crawl against the local replay server: full runs, resume, shard planning and epochs."""
+
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from mcf.lib.api.client import MCFAPIError
+from mcf.lib.api.rate_limit import AdaptiveTokenBucket
+from mcf.lib.archive.raw_archive import ARCHIVE_DIR_ENV
+from mcf.lib.categories import CATEGORIES
+from mcf.lib.crawler.crawler import Crawler
+from mcf.lib.crawler.shards import partition_totals, plan_shards
+from mcf.lib.pipeline.checkpoint import PHASE_DIFFED, STAGE_FETCHED, CrawlCheckpoint
+from mcf.lib.pipeline.incremental_crawl import (
+    run_incremental_crawl,
+    run_multi_source_crawl,
+)
+from mcf.lib.replay.benchmark import HashEmbedder
+from mcf.lib.replay.server import ReplayFixtures, ReplayServer
+from mcf.lib.sources.base import NormalizedJob
+from mcf.lib.sources.mcf_source import MCFJobSource
+from mcf.lib.storage.duckdb_store import DuckDBStore
+
+N_JOBS = 60
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    with ReplayServer(ReplayFixtures.synthetic(mcf=N_JOBS, seed=7)) as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.delenv(ARCHIVE_DIR_ENV, raising=False)
+        yield server
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DuckDBStore(str(tmp_path / "crawl.duckdb"))
+    yield s
+    s.close()
+
+
+def _source(**kwargs) -> MCFJobSource:
+    return MCFJobSource(limiter=AdaptiveTokenBucket(None), **kwargs)
+
+
+class _InterruptedEmbedder(HashEmbedder):
+    """Raises KeyboardInterrupt on the first ``embed_texts`` call, like Ctrl-C mid-run."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failed = False
+
+    def embed_texts(self, texts):
+        if not self.failed:
+            self.failed = True
+            raise KeyboardInterrupt
+        return super().embed_texts(texts)
+
+
+@pytest.mark.parametrize("search_ingest", [True, False])
+def test_crawl_adds_then_maintains(replay, store, search_ingest):
+    source = _source(search_ingest=search_ingest)
+    try:
+        first = run_incremental_crawl(store=store, source=source, embedder=HashEmbedder())
+        second = run_incremental_crawl(store=store, source=source, embedder=HashEmbedder())
+    finally:
+        source.close()
+    assert len(first.added) == N_JOBS
+    assert first.removed == []
+    assert second.added == [] and len(second.maintained) == N_JOBS
+    assert store.active_job_uuids() == set(replay.fixtures.mcf_jobs)
+    assert replay.stats["mcf_detail"] == (0 if search_ingest else N_JOBS)
+    assert store.get_recent_runs(limit=1)[0]["telemetry"]["phases"]
+
+
+def test_crawl_resumes_after_interrupt(replay, store):
+    source = _source(search_ingest=False)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            run_incremental_crawl(store=store, source=source, embedder=_InterruptedEmbedder())
+        (run_id,) = [
+            r[0] for r in store._con.execute("SELECT run_id FROM crawl_runs WHERE finished_at IS NULL").fetchall()
+        ]
+        checkpoint = CrawlCheckpoint.load(store, run_id)
+        assert checkpoint is not None and checkpoint.phase == PHASE_DIFFED
+        searches = replay.stats["mcf_search"]
+
+        result = run_incremental_crawl(store=store, source=source, embedder=HashEmbedder(), resume_run_id=run_id)
+    finally:
+        source.close()
+    assert result.run.run_id == run_id
+    assert len(result.added) == N_JOBS
+    assert replay.stats["mcf_search"] == searches  # listing was not repeated
+    assert replay.stats["mcf_detail"] < 2 * N_JOBS  # jobs fetched before the crash were not refetched
+    assert CrawlCheckpoint.load(store, run_id) is None
+    assert store.get_job_embeddings_for_uuids(sorted(replay.fixtures.mcf_jobs))
+
+
+
+def test_delta_crawl_only_adds_new_postings(monkeypatch, store):
+    fixtures = ReplayFixtures.synthetic(mcf=N_JOBS, seed=7)
+    monkeypatch.delenv(ARCHIVE_DIR_ENV, raising=False)
+    with ReplayServer(fixtures) as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        run_incremental_crawl(store=store, source=_source(), embedder=HashEmbedder())
+
+    new = ReplayFixtures.synthetic(mcf=3, seed=8).mcf_jobs
+    for raw in new.values():
+        raw["metadata"]["newPostingDate"] = "2026-02-01"
+    gone = next(iter(fixtures.mcf_jobs))
+    live = {u: raw for u, raw in fixtures.mcf_jobs.items() if u != gone} | new
+    with ReplayServer(ReplayFixtures(mcf_jobs=live)) as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        source = _source()
+        try:
+            result = run_incremental_crawl(store=store, source=source, embedder=HashEmbedder(), delta=True)
+        finally:
+            source.close()
+        assert server.stats["mcf_search"] == len(CATEGORIES)  # the first page of each category is enough
+    assert sorted(result.added) == sorted(new)
+    assert result.maintained == [] and result.removed == []
+    assert store.active_job_uuids() == set(fixtures.mcf_jobs) | set(new)  # removals wait for a full crawl
+
+
+def test_crawl_refetches_jobs_whose_watermark_moved(replay, store):
+    source = _source(search_ingest=False)
+    edited, baseline, *_ = sorted(replay.fixtures.mcf_jobs)
+    try:
+        run_incremental_crawl(store=store, source=source, embedder=HashEmbedder())
+        replay.fixtures.mcf_jobs[edited]["metadata"]["updatedAt"] = "2026-03-01T00:00:00+00:00"
+        replay.fixtures.mcf_jobs[edited]["title"] = "Edited title"
+        store._con.execute("UPDATE jobs SET source_updated_at = NULL WHERE job_uuid = ?", [baseline])
+        details = replay.stats["mcf_detail"]
+        result = run_incremental_crawl(store=store, source=source, embedder=HashEmbedder())
+    finally:
+        source.close()
+    assert result.updated == [edited]
+    assert result.added == [] and len(result.maintained) == N_JOBS
+    assert replay.stats["mcf_detail"] == details + 1
+    watermarks = store.job_watermarks()
+    assert watermarks[edited] == "2026-03-01T00:00:00+00:00"
+    # A job seen without a stored watermark just records it as the baseline.
+    assert watermarks[baseline] == replay.fixtures.mcf_jobs[baseline]["metadata"]["updatedAt"]
+    (title,) = store._con.execute("SELECT title FROM jobs WHERE job_uuid = ?", [edited]).fetchone()
+    assert title == "Edited title"
+
+def test_listing_resume_keeps_truncated_categories(store):
+    checkpoint = CrawlCheckpoint.start(
+        store,
+        "run-1",
+        source_id="mcf",
+        started_at="2026-01-01T00:00:00+00:00",
+        categories=["Engineering"],
+        limit=None,
+        delta=False,
+    )
+    checkpoint.record_truncated("Engineering")
+    checkpoint.record_page("Engineering", 100, True, [("job-1", "2026-01-01")])
+
+    truncated: set[str] = set()
+    resumed = CrawlCheckpoint.load(store, "run-1")
+    listed = Crawler().list_job_uuids_all_categories(
+        categories=["Engineering"], checkpoint=resumed, truncated=truncated
+    )
+    assert listed == ["job-1"]
+    assert truncated == {"Engineering"}
+
+
+def test_plan_shards_balances_partitions():
+    totals = {"a": 900, "b": 500, "c": 400, "d": 300, "e": 100}
+    plan = plan_shards(totals, 2)
+    assert [s.index for s in plan] == [0, 1]
+    # Largest first, each to the least-loaded shard.
+    assert [s.partitions for s in plan] == [("a", "d"), ("b", "c", "e")]
+    assert [s.estimated_jobs for s in plan] == [1200, 1000]
+    for shard in plan:
+        assert shard.estimated_jobs == sum(totals[p] for p in shard.partitions)
+
+
+def test_plan_shards_edge_cases():
+    assert [s.partitions for s in plan_shards({"a": 1, "b": 2}, 0)] == [("b", "a")]
+    plan = plan_shards({"a": 5}, 3)
+    assert [s.estimated_jobs for s in plan] == [5, 0, 0]
+    assert plan[1].partitions == ()
+
+
+class _FakeTotalsClient:
+    """``search_jobs(limit=1)`` totals: ``IT`` is over the cap, split by level."""
+
+    def search_jobs(self, *, limit, categories, position_levels=None):
+        totals = {"Engineering": 40, "IT": 150, "IT|Executive": 90, "IT|Manager": 80}
+        key = categories[0] + (f"|{position_levels[0]}" if position_levels else "")
+        return SimpleNamespace(total=totals.get(key, 0))
+
+
+def test_partition_totals_splits_categories_over_the_cap():
+    measured = partition_totals(_FakeTotalsClient(), ["Engineering", "IT"], cap=100)
+    # Level totals (170) exceed the category total, yet IT is never treated as complete.
+    assert measured.totals == {"Engineering": 40, "IT|Executive": 90, "IT|Manager": 80}
+    assert measured.split == ["IT"]
+
+
+class _FakeListingSource:
+    """Lists ``listed`` and serves details with the categories in ``categories``."""
+
+    source_id = "mcf"
+
+    def __init__(self, listed: list[str], categories: dict[str, list[str]]) -> None:
+        self.listed = listed
+        self.categories = categories
+
+    def list_job_ids(self, *, categories=None, limit=None, on_progress=None, known_ids=None, checkpoint=None):
+        return list(self.listed)
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        return NormalizedJob(
+            source_id="mcf",
+            external_id=job_id,
+            title=f"Job {job_id}",
+            company_name="Acme",
+            location="Singapore",
+            job_url=None,
+            skills=["Python"],
+            description_snippet="Build things.",
+            categories=self.categories[job_id],
+        )
+
+
+def test_epoch_keeps_unseen_jobs_of_split_categories(store):
+    categories = {"a": ["Engineering"], "b": ["IT"], "c": ["IT", "Engineering"], "d": []}
+    run_incremental_crawl(store=store, source=_FakeListingSource(list(categories), categories), embedder=HashEmbedder())
+    store.create_crawl_epoch(
+        "epoch-1", "mcf", {"shards": [["Engineering", "IT|Executive"]], "estimated_jobs": [0], "split": ["IT"]}
+    )
+
+    result = run_incremental_crawl(
+        store=store, source=_FakeListingSource([], categories), embedder=HashEmbedder(), epoch_id="epoch-1", shard=0
+    )
+    # Engineering was listed whole, so its unseen jobs are gone; IT and uncategorised jobs may be live.
+    assert result.removed == ["a", "c"]
+    assert store.active_job_uuids() == {"b", "d"}
+
+
+class _CountingSource(_FakeListingSource):
+    """Counts ``get_job_detail`` calls per job."""
+
+    def __init__(self, listed: list[str]) -> None:
+        super().__init__(listed, {job_id: ["Engineering"] for job_id in listed})
+        self.calls: Counter[str] = Counter()
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        self.calls[job_id] += 1
+        return super().get_job_detail(job_id)
+
+
+def test_resume_never_refetches_checkpointed_jobs(store):
+    listed = [f"job-{i:03d}" for i in range(80)]
+    source = _CountingSource(listed)
+    with pytest.raises(KeyboardInterrupt):  # on the first embedding batch, after 32 fetches
+        run_incremental_crawl(store=store, source=source, embedder=_InterruptedEmbedder())
+    (run_id,) = [r[0] for r in store._con.execute("SELECT run_id FROM crawl_runs WHERE finished_at IS NULL").fetchall()]
+    fetched_before = set(CrawlCheckpoint.load(store, run_id).items(STAGE_FETCHED))
+    assert len(fetched_before) >= 32
+    calls_before = Counter(source.calls)
+
+    result = run_incremental_crawl(store=store, source=source, embedder=HashEmbedder(), resume_run_id=run_id)
+    assert sorted(result.added) == listed
+    assert all(source.calls[job_id] == 1 for job_id in fetched_before)
+    # Only jobs fetched but not yet checkpointed (still in the fetch buffer) are fetched again.
+    refetched = {job_id for job_id, n in source.calls.items() if n > 1}
+    assert refetched <= set(calls_before) - fetched_before
+    assert set(source.calls) == set(listed)
+    assert len(store.get_job_embeddings_for_uuids(listed)) == len(listed)
+
+
+class _SlowSource(_CountingSource):
+    """Each detail takes a few milliseconds, like a network round trip."""
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        time.sleep(0.005)
+        return super().get_job_detail(job_id)
+
+
+class _RecordingEmbedder(HashEmbedder):
+    """Records how many details had been fetched, and on which thread, at each batch."""
+
+    def __init__(self, source: _CountingSource) -> None:
+        super().__init__()
+        self.source = source
+        self.batches: list[tuple[int, int, str]] = []  # (batch size, fetched so far, thread)
+
+    def embed_texts(self, texts):
+        self.batches.append((len(texts), sum(self.source.calls.values()), threading.current_thread().name))
+        return super().embed_texts(texts)
+
+
+def test_crawl_embeds_while_details_are_still_fetched(store):
+    listed = [f"job-{i:03d}" for i in range(100)]
+    source = _SlowSource(listed)
+    embedder = _RecordingEmbedder(source)
+    result = run_incremental_crawl(store=store, source=source, embedder=embedder, concurrency=1)
+    assert sorted(result.added) == listed
+    assert [size for size, _, _ in embedder.batches] == [32, 32, 32, 4]
+    assert embedder.batches[0][1] < len(listed)  # the first batch did not wait for the last fetch
+    assert {thread for _, _, thread in embedder.batches} == {threading.current_thread().name}
+    assert len(store.get_job_embeddings_for_uuids(listed)) == len(listed)
+
+
+class _AsyncBatchSource(_CountingSource):
+    """``aget_job_details`` only: the first batch is throttled, ``missing`` no longer exists."""
+
+    def __init__(self, listed: list[str], missing: str) -> None:
+        super().__init__(listed)
+        self.missing = missing
+        self.batches: list[list[str]] = []
+        self.closed = 0
+
+    async def aget_job_details(self, job_ids):
+        self.batches.append(list(job_ids))
+        if len(self.batches) == 1:
+            raise MCFAPIError(429, "Too Many Requests")
+        return [None if job_id == self.missing else self.get_job_detail(job_id) for job_id in job_ids]
+
+    async def aclose(self) -> None:
+        self.closed += 1
+
+
+def test_crawl_fetches_batch_sources_in_batches(store):
+    listed = [f"job-{i}" for i in range(10)]
+    source = _AsyncBatchSource(listed, missing="job-3")
+    run_incremental_crawl(store=store, source=source, embedder=HashEmbedder())
+    # One batch for every job; the throttled batch is retried whole in the next round.
+    assert source.batches == [listed, listed]
+    assert source.closed == 1
+    stored = {r[0] for r in store._con.execute("SELECT job_uuid FROM jobs WHERE title IS NOT NULL").fetchall()}
+    assert stored == set(listed) - {"job-3"}
+    assert len(store.get_job_embeddings_for_uuids(listed)) == 9
+
+
+class _NamedSource:
+    """Source ``source_id`` listing ``n`` jobs; each detail takes a few milliseconds.
+
+    Records when each fetch ran, so overlap between sources can be checked.
+    """
+
+    def __init__(self, source_id: str, n: int, *, fail_listing: bool = False) -> None:
+        self.source_id = source_id
+        self.prefix = "" if source_id == "mcf" else f"{source_id}:"
+        self.listed = [f"{self.prefix}job-{i}" for i in range(n)]
+        self.fail_listing = fail_listing
+        self.calls: Counter[str] = Counter()
+        self.windows: list[tuple[float, float]] = []
+
+    def list_job_ids(self, *, categories=None, limit=None, on_progress=None, known_ids=None, checkpoint=None):
+        if self.fail_listing:
+            raise RuntimeError(f"{self.source_id} is down")
+        return list(self.listed)
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        start = time.monotonic()
+        time.sleep(0.005)
+        self.calls[job_id] += 1
+        self.windows.append((start, time.monotonic()))
+        return NormalizedJob(
+            source_id=self.source_id,
+            external_id=job_id.removeprefix(self.prefix),
+            title=f"Job {job_id}",
+            company_name="Acme",
+            location="Singapore",
+            job_url=None,
+            skills=["Python"],
+            description_snippet="Build things.",
+        )
+
+
+class _ExclusiveCheck:
+    """Proxy that fails if two threads are ever inside ``target`` at once."""
+
+    def __init__(self, target: object) -> None:
+        self._target = target
+        self._inside = 0
+        self._lock = threading.Lock()
+        self.overlapped = False
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                self._inside += 1
+                self.overlapped |= self._inside > 1
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._inside -= 1
+
+        return call
+
+
+def test_multi_source_crawl_overlaps_sources_and_serializes_the_store(store):
+    sources = [_NamedSource("mcf", 30), _NamedSource("test", 30)]
+    checked_store, checked_embedder = _ExclusiveCheck(store), _ExclusiveCheck(HashEmbedder())
+    results = run_multi_source_crawl(store=checked_store, sources=sources, embedder=checked_embedder, concurrency=1)
+    assert [sorted(r.added) for r in results] == [sorted(s.listed) for s in sources]
+    assert results[0].run.run_id == results[1].run.run_id
+    assert not checked_store.overlapped and not checked_embedder.overlapped
+    (mcf_windows, test_windows) = (s.windows for s in sources)
+    assert any(a0 < b1 and b0 < a1 for a0, a1 in mcf_windows for b0, b1 in test_windows)
+    (run,) = store.get_recent_runs(limit=1)
+    assert run["added"] == 60
+    assert store.active_job_uuids() == set(sources[0].listed) | set(sources[1].listed)
+
+
+def test_multi_source_crawl_resumes_after_one_source_fails(store):
+    healthy, failing = _NamedSource("mcf", 10), _NamedSource("test", 10, fail_listing=True)
+    with pytest.raises(RuntimeError, match="test is down"):
+        run_multi_source_crawl(store=store, sources=[healthy, failing], embedder=HashEmbedder())
+    (run_id,) = [r[0] for r in store._con.execute("SELECT run_id FROM crawl_runs WHERE finished_at IS NULL").fetchall()]
+
+    failing.fail_listing = False
+    results = run_multi_source_crawl(
+        store=store, sources=[healthy, failing], embedder=HashEmbedder(), resume_run_id=run_id
+    )
+    assert [r.run.run_id for r in results] == [run_id, run_id]
+    assert sorted(results[1].added) == failing.listed
+    assert healthy.calls == Counter(healthy.listed)  # the source that finished is not fetched again
+    assert store.get_crawl_checkpoint(run_id) is None
@@ -0,0 +1,82 @@
+"""Category listing against the local replay server: concurrent paging and delta mode."""
+
+import threading
+import time
+
+import pytest
+
+from mcf.lib.api.client import MCFClient
+from mcf.lib.api.rate_limit import AdaptiveTokenBucket
+from mcf.lib.crawler.crawler import Crawler
+from mcf.lib.replay.server import ReplayFixtures, ReplayServer
+
+SIZES = {"Engineering": 250, "Information Technology": 30, "Legal": 0}
+
+
+def _fixtures(seed: int = 1) -> ReplayFixtures:
+    fixtures = ReplayFixtures.synthetic(mcf=sum(SIZES.values()), seed=seed)
+    jobs = iter(fixtures.mcf_jobs.values())
+    for category, size in SIZES.items():
+        for _, raw in zip(range(size), jobs):
+            raw["categories"] = [{"id": 1, "category": category}]
+    return fixtures
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    with ReplayServer(_fixtures()) as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        yield server
+
+
+def _crawler(max_workers: int = 4) -> Crawler:
+    return Crawler(limiter=AdaptiveTokenBucket(None), max_workers=max_workers)
+
+
+def test_categories_are_paged_concurrently(replay, monkeypatch):
+    in_flight = peak = 0
+    lock = threading.Lock()
+    search_jobs = MCFClient.search_jobs
+
+    def slow_search(self, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        try:
+            time.sleep(0.05)
+            return search_jobs(self, **kwargs)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    monkeypatch.setattr(MCFClient, "search_jobs", slow_search)
+    uuids = _crawler(max_workers=2).list_job_uuids_all_categories(categories=list(SIZES))
+    assert sorted(uuids) == sorted(replay.fixtures.mcf_jobs) and len(uuids) == len(set(uuids))
+    assert peak == 2
+    # No limit=1 count probes: each category's total comes from its first page.
+    assert replay.stats["mcf_search"] == 3 + 1 + 1
+
+
+def test_watermarks_and_search_results_are_reported(replay):
+    watermarks: dict[str, str] = {}
+    pages: list[int] = []
+    _crawler().list_job_uuids_all_categories(
+        categories=list(SIZES), watermarks=watermarks, on_results=lambda jobs: pages.append(len(jobs))
+    )
+    assert watermarks == {u: raw["metadata"]["updatedAt"] for u, raw in replay.fixtures.mcf_jobs.items()}
+    assert sum(pages) == len(replay.fixtures.mcf_jobs)
+
+
+
+def test_delta_listing_stops_at_the_first_known_page(replay):
+    jobs = replay.fixtures.mcf_jobs
+    engineering = [u for u in replay._mcf_order if jobs[u]["categories"][0]["category"] == "Engineering"]
+    known = set(jobs) - set(engineering[:5])
+
+    uuids = _crawler().list_job_uuids_all_categories(categories=list(SIZES), known=known)
+    assert set(engineering[:5]) <= set(uuids)
+    # Engineering: page 0 holds the new jobs and page 1 is all known; IT's only page is known; Legal is empty.
+    assert replay.stats["mcf_search"] == 2 + 1 + 1
+    assert len(uuids) == 200 + 30
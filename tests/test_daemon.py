@@ -0,0 +1,107 @@
+"""Crawl daemon: delta cycles, failure isolation, full sweeps and stale checkpoints."""
+
+import threading
+
+import pytest
+
+from mcf.api import active_jobs_pool_cache
+from mcf.lib.pipeline.daemon import run_crawl_daemon
+from mcf.lib.replay.benchmark import HashEmbedder
+from mcf.lib.sources.base import NormalizedJob
+from mcf.lib.storage.duckdb_store import DuckDBStore
+
+
+class _PostingSource:
+    """Lists ``postings[n]`` on its n-th listing; raises instead where that entry is an exception."""
+
+    source_id = "mcf"
+
+    def __init__(self, postings: list) -> None:
+        self.postings = postings
+        self.listings = 0
+        self.known_ids: list[set[str] | None] = []
+
+    def list_job_ids(self, *, categories=None, limit=None, on_progress=None, known_ids=None, checkpoint=None):
+        listed = self.postings[min(self.listings, len(self.postings) - 1)]
+        self.listings += 1
+        self.known_ids.append(known_ids)
+        if isinstance(listed, Exception):
+            raise listed
+        return list(listed)
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        return NormalizedJob(
+            source_id="mcf",
+            external_id=job_id,
+            title=f"Job {job_id}",
+            company_name="Acme",
+            location="Singapore",
+            job_url=None,
+            skills=["Python"],
+            description_snippet=f"Build things for {job_id}.",
+        )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    for name in ("CRAWL_API_URL", "CRAWL_WEBHOOK_URL", "NEXT_PUBLIC_VERCEL_URL"):
+        monkeypatch.delenv(name, raising=False)
+    s = DuckDBStore(str(tmp_path / "daemon.duckdb"))
+    yield s
+    s.close()
+
+
+def _run(store, source, cycles: int, **kwargs) -> list:
+    stop = threading.Event()
+    results = []
+
+    def on_cycle(cycle):
+        results.append(cycle)
+        if len(results) >= cycles:
+            stop.set()
+
+    run_crawl_daemon(
+        store=store, sources=[source], embedder=HashEmbedder(), interval=0, stop=stop, on_cycle=on_cycle, **kwargs
+    )
+    return results
+
+
+def test_daemon_runs_delta_cycles_and_survives_failures(store):
+    source = _PostingSource([RuntimeError("listing failed"), ["a", "b"], ["c", "a", "b"]])
+    cycles = _run(store, source, 3)
+    assert isinstance(cycles[0].error, RuntimeError) and cycles[0].result is None
+    assert [c.result.added for c in cycles[1:]] == [["a", "b"], ["c"]]
+    assert not any(c.full_sweep for c in cycles)
+    assert all(c.result.maintained == [] and c.result.removed == [] for c in cycles[1:])
+    assert source.known_ids[2] == {"a", "b"}  # delta listings know the stored jobs
+
+
+def test_daemon_full_sweeps_remove_jobs(store):
+    source = _PostingSource([["a", "b"], ["b"]])
+    cycles = _run(store, source, 2, full_sweep_interval=0.0)
+    assert all(c.full_sweep for c in cycles)
+    assert cycles[1].result.removed == ["a"]
+    assert store.active_job_uuids() == {"b"}
+
+
+def test_daemon_drops_stale_checkpoints(store):
+    store.save_crawl_checkpoint("abandoned", {"phase": "listing"})
+    store.save_crawl_checkpoint("recent", {"phase": "listing"})
+    store._con.execute(
+        "UPDATE crawl_checkpoints SET updated_at = updated_at - INTERVAL 30 DAY WHERE run_id = 'abandoned'"
+    )
+    _run(store, _PostingSource([[]]), 1, checkpoint_max_age=7 * 24 * 3600.0)
+    assert store.get_crawl_checkpoint("abandoned") is None
+    assert store.get_crawl_checkpoint("recent") is not None
+
+
+def test_delta_cycles_grow_the_warm_pool(store):
+    embedder = HashEmbedder()
+    active_jobs_pool_cache.set_cached([("old", embedder.embed_text("old"), None)])
+    try:
+        _run(store, _PostingSource([["a", "b"]]), 1)
+        pool, matrix = active_jobs_pool_cache.get_cached()
+        assert [job_uuid for job_uuid, _, _ in pool] == ["old", "a", "b"]
+        assert matrix.shape == (3, embedder.dims)
+    finally:
+        active_jobs_pool_cache.invalidate()
@@ -0,0 +1,148 @@
+"""Concurrent detail fetching: backpressure, deferred throttle rounds and source method choice."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcf.lib.api.client import MCFAPIError
+from mcf.lib.pipeline.detail_fetch import iter_job_details
+
+
+class _CountingSource:
+    """Sync or async single-job source that counts calls."""
+
+    source_id = "test"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _fetch(self, job_id: str) -> dict:
+        with self._lock:
+            self.calls += 1
+        return {"job_uuid": job_id}
+
+    def get_job_detail(self, job_id: str) -> dict:
+        return self._fetch(job_id)
+
+
+class _AsyncCountingSource(_CountingSource):
+    async def aget_job_detail(self, job_id: str) -> dict:
+        await asyncio.sleep(0)
+        return self._fetch(job_id)
+
+
+def _wait_for_idle(source: _CountingSource) -> int:
+    """Call count once the fetcher has stopped making progress."""
+    calls = -1
+    while calls != source.calls:
+        calls = source.calls
+        time.sleep(0.1)
+    return calls
+
+
+@pytest.mark.parametrize("source_cls", [_CountingSource, _AsyncCountingSource])
+def test_fetching_pauses_while_the_buffer_is_full(source_cls):
+    source = source_cls()
+    ids = [f"job-{i}" for i in range(50)]
+    results = iter_job_details(source, ids, concurrency=4, buffer=3)
+    first = next(results)
+    # One result consumed, three buffered, at most one per worker blocked on the full queue.
+    assert _wait_for_idle(source) <= 1 + 3 + 4
+    rest = list(results)
+    assert sorted(r.job_id for r in [first, *rest]) == sorted(ids)
+    assert source.calls == len(ids)
+
+
+class _ThrottleThenSucceed:
+    """Async source: each job in ``throttle`` gets ``times`` 429s before it succeeds."""
+
+    source_id = "test"
+
+    def __init__(self, throttle: set[str], times: int) -> None:
+        self.throttle = throttle
+        self.times = times
+        self.calls: list[str] = []
+
+    async def aget_job_detail(self, job_id: str) -> dict:
+        self.calls.append(job_id)
+        await asyncio.sleep(0)
+        if job_id in self.throttle and self.calls.count(job_id) <= self.times:
+            raise MCFAPIError(429, "Too Many Requests")
+        return {"job_uuid": job_id}
+
+
+def test_throttled_jobs_are_retried_after_the_round():
+    source = _ThrottleThenSucceed({"b", "d"}, times=2)
+    results = list(iter_job_details(source, ["a", "b", "c", "d", "e"], concurrency=2, deferred_rounds=2))
+    assert all(r.error is None for r in results)
+    # Unthrottled jobs first; the deferred ones only succeed in the second retry round.
+    assert {r.job_id for r in results[:3]} == {"a", "c", "e"}
+    assert {r.job_id for r in results[3:]} == {"b", "d"}
+    assert sorted(source.calls[:5]) == ["a", "b", "c", "d", "e"]
+    assert sorted(source.calls[5:7]) == sorted(source.calls[7:]) == ["b", "d"]
+
+
+def test_throttle_error_is_reported_once_rounds_run_out():
+    source = _ThrottleThenSucceed({"b"}, times=5)
+    results = {r.job_id: r for r in iter_job_details(source, ["a", "b"], concurrency=2, deferred_rounds=1)}
+    assert results["a"].job == {"job_uuid": "a"}
+    assert results["b"].error.status_code == 429
+    assert source.calls.count("b") == 2
+
+
+_METHODS = ("aget_job_details", "get_job_details", "aget_job_detail", "get_job_detail")
+
+
+def _source_with(methods: tuple[str, ...], used: list[str]):
+    async def aget_job_details(self, ids):
+        used.append("aget_job_details")
+        return [{"job_uuid": i} for i in ids]
+
+    def get_job_details(self, ids):
+        used.append("get_job_details")
+        return [{"job_uuid": i} for i in ids]
+
+    async def aget_job_detail(self, job_id):
+        used.append("aget_job_detail")
+        return {"job_uuid": job_id}
+
+    def get_job_detail(self, job_id):
+        used.append("get_job_detail")
+        return {"job_uuid": job_id}
+
+    available = {
+        "aget_job_details": aget_job_details,
+        "get_job_details": get_job_details,
+        "aget_job_detail": aget_job_detail,
+        "get_job_detail": get_job_detail,
+    }
+    return type("_Source", (), {"source_id": "test", **{name: available[name] for name in methods}})()
+
+
+@pytest.mark.parametrize("start", range(len(_METHODS)))
+def test_source_method_preference(start):
+    used: list[str] = []
+    source = _source_with(_METHODS[start:], used)
+    results = list(iter_job_details(source, ["a", "b", "c"], concurrency=2, batch_size=2))
+    assert sorted(r.job_id for r in results) == ["a", "b", "c"]
+    assert set(used) == {_METHODS[start]}
+    assert len(used) == (2 if start < 2 else 3)  # batch sources get batch_size IDs per call
+
+
+def test_single_async_requests_need_concurrency():
+    used: list[str] = []
+    source = _source_with(("aget_job_detail", "get_job_detail"), used)
+    list(iter_job_details(source, ["a", "b"], concurrency=1))
+    assert used == ["get_job_detail", "get_job_detail"]
+
+
+def test_batch_source_reports_missing_jobs():
+    used: list[str] = []
+    source = _source_with(("get_job_details",), used)
+    source.get_job_details = lambda ids: [None if i == "b" else {"job_uuid": i} for i in ids]
+    results = {r.job_id: r for r in iter_job_details(source, ["a", "b"])}
+    assert results["a"].job == {"job_uuid": "a"}
+    assert isinstance(results["b"].error, LookupError)
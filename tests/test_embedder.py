@@ -0,0 +1,132 @@
+"""Length-bucketed batching in the embedders (no model download: a fake model stands in)."""
+
+import re
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from mcf.lib.embeddings.embedder import (
+    _BGE_QUERY_PREFIX,
+    Embedder,
+    EmbedderConfig,
+    token_budget_batches,
+)
+from mcf.lib.embeddings.process_pool import ProcessPoolEmbedder
+
+
+def test_token_budget_batches_packs_by_padded_length():
+    lengths = [10, 100, 12, 90, 11, 300]
+    batches = token_budget_batches(lengths, max_tokens=200)
+    assert sorted(i for b in batches for i in b) == list(range(len(lengths)))
+    # Longest first; 300 exceeds the budget alone, 100 + 90 pad to 2 x 100.
+    assert batches == [[5], [1, 3], [2, 4, 0]]
+    for batch in batches:
+        padded = max(lengths[i] for i in batch)
+        assert len(batch) == 1 or len(batch) * padded <= 200
+        assert [lengths[i] for i in batch] == sorted((lengths[i] for i in batch), reverse=True)
+
+
+def test_token_budget_batches_edge_cases():
+    assert token_budget_batches([], max_tokens=100) == []
+    assert token_budget_batches([5000], max_tokens=100) == [[0]]
+    # Empty texts still cost one token each.
+    assert token_budget_batches([0, 0, 0], max_tokens=2) == [[0, 1], [2]]
+
+
+class _FakeSentenceTransformer:
+    """Token length = word count + 2; vector = [word count, first letter code]."""
+
+    max_seq_length = 512
+
+    def __init__(self, model_name: str) -> None:
+        self.batches: list[list[str]] = []
+        self.tokenizer = self._tokenize
+
+    def _tokenize(self, texts, **kwargs):
+        return {"input_ids": [[0] * min(len(t.split()) + 2, self.max_seq_length) for t in texts]}
+
+    def encode(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        return np.array([[len(t.split()), ord(t[0])] for t in texts], dtype=np.float32)
+
+
+def test_embed_texts_returns_input_order(monkeypatch):
+    fake_module = SimpleNamespace(SentenceTransformer=_FakeSentenceTransformer)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+    embedder = Embedder(EmbedderConfig(backend="torch", max_batch_tokens=40))
+    texts = ["a " * 3, "b " * 30, "c " * 5, "d " * 28, "e"]
+    vectors = embedder.embed_texts(texts)
+    assert vectors == [[3, ord("a")], [30, ord("b")], [5, ord("c")], [28, ord("d")], [1, ord("e")]]
+    batches = embedder._model.batches
+    assert batches[0] == [texts[1]] and batches[1] == [texts[3]]  # long texts are not padded together
+    assert sorted(t for b in batches for t in b) == sorted(texts)
+
+
+def test_token_budget_batches_caps_texts_per_batch():
+    batches = token_budget_batches([5] * 7, max_tokens=1000, max_texts=3)
+    assert [len(b) for b in batches] == [3, 3, 1]
+
+
+def test_embed_texts_honours_batch_size(monkeypatch):
+    fake_module = SimpleNamespace(SentenceTransformer=_FakeSentenceTransformer)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+    embedder = Embedder(EmbedderConfig(backend="torch", batch_size=2))
+    embedder.embed_texts(["short text"] * 5)
+    assert [len(b) for b in embedder._model.batches] == [2, 2, 1]
+
+
+@pytest.mark.parametrize(("n_texts", "workers", "expected"), [(128, 4, 4), (6, 4, 6), (3, 8, 3), (400, 2, 13)])
+def test_process_pool_splits_work_across_workers(monkeypatch, n_texts, workers, expected):
+    embedder = ProcessPoolEmbedder(EmbedderConfig(backend="torch"), workers=workers)
+    sent: list[list[str]] = []
+
+    def fake_encode_batches(batches):
+        sent.extend(batches)
+        return [[[float(len(t))] for t in batch] for batch in batches]
+
+    monkeypatch.setattr(embedder, "_encode_batches", fake_encode_batches)
+    texts = [f"job {i} " + "word " * (i % 7) for i in range(n_texts)]
+    vectors = embedder.embed_texts(texts)
+    # Short texts fit one token budget, but every worker still gets a batch (and none exceeds batch_size).
+    assert len(sent) == expected
+    assert max(len(b) for b in sent) <= 32
+    assert vectors == [[float(len(t))] for t in texts]
+
+
+class _OffsetsSentenceTransformer(_FakeSentenceTransformer):
+    """Fake whose tokenizer also returns character offsets: one token per word."""
+
+    def _tokenize(self, texts, **kwargs):
+        if kwargs.get("return_offsets_mapping"):
+            return {"offset_mapping": [m.span() for m in re.finditer(r"\S+", texts)]}
+        return super()._tokenize(texts, **kwargs)
+
+
+@pytest.fixture
+def offsets_embedder(monkeypatch):
+    fake_module = SimpleNamespace(SentenceTransformer=_OffsetsSentenceTransformer)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+    return Embedder(EmbedderConfig(backend="torch"))
+
+
+def test_resume_chunks_cut_overlapping_token_windows(offsets_embedder):
+    text = "Skills:\n  python sql\n\nExperience:\n  w5 w6 w7 w8 w9"
+    assert offsets_embedder.resume_chunks(text, chunk_size=10, overlap=2) == [text]
+    # 9 tokens, windows of 4 stepping by 3; chunks are slices of the original text.
+    assert offsets_embedder.resume_chunks(text, chunk_size=4, overlap=1) == [
+        "Skills:\n  python sql\n\nExperience:",
+        "Experience:\n  w5 w6 w7",
+        "w7 w8 w9",
+    ]
+
+
+def test_embed_resume_encodes_all_chunks_in_one_batch(offsets_embedder):
+    text = " ".join(f"w{i}" for i in range(1000))
+    chunks = offsets_embedder.resume_chunks(text)
+    assert len(chunks) == 3 and all(len(c.split()) <= 400 for c in chunks)
+    vector = offsets_embedder.embed_resume(text)
+    assert len(offsets_embedder._model.batches) == 1
+    assert sorted(offsets_embedder._model.batches[0]) == sorted(f"{_BGE_QUERY_PREFIX}{c}" for c in chunks)
+    assert np.linalg.norm(vector) == pytest.approx(1.0)
@@ -0,0 +1,73 @@
+"""Process-wide embedder registry: one model load per config, shared by every caller."""
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcf.lib.embeddings import registry
+from mcf.lib.embeddings.embedder import EmbedderConfig
+
+_loads: list[str] = []
+
+
+class _SlowSentenceTransformer:
+    """Records each load in ``_loads``; a load takes long enough for concurrent callers to pile up."""
+
+    def __init__(self, model_name: str) -> None:
+        time.sleep(0.05)
+        _loads.append(model_name)
+
+
+@pytest.fixture(autouse=True)
+def fake_models(monkeypatch):
+    _loads.clear()
+    fake_module = SimpleNamespace(SentenceTransformer=_SlowSentenceTransformer)
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+    registry.clear_embedders()
+    yield
+    registry.clear_embedders()
+
+
+def test_get_embedder_shares_one_instance_per_config():
+    config = EmbedderConfig(backend="torch")
+    embedder = registry.preload_embedder(config)
+    assert registry.get_embedder(EmbedderConfig(backend="torch")) is embedder
+    other = registry.get_embedder(EmbedderConfig(model_name="other-model", backend="torch"))
+    assert other is not embedder
+    assert _loads == [config.model_name, "other-model"]
+
+    registry.clear_embedders()
+    assert registry.get_embedder(config) is not embedder
+    assert len(_loads) == 3
+
+
+def test_cache_views_reuse_the_shared_model():
+    config = EmbedderConfig(backend="torch")
+    cache = object()
+    view = registry.get_embedder(config, embeddings_cache=cache)
+    shared = registry.get_embedder(config)
+    assert view is not shared
+    assert view._model is shared._model and view._encode_lock is shared._encode_lock
+    assert view._embeddings_cache is cache and shared._embeddings_cache is None
+    assert len(_loads) == 1
+
+
+def test_concurrent_first_callers_wait_for_one_load():
+    config = EmbedderConfig(backend="torch")
+    start = threading.Barrier(8)
+    got = []
+
+    def borrow():
+        start.wait()
+        got.append(registry.get_embedder(config))
+
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(got) == 8 and all(e is got[0] for e in got)
+    assert _loads == [config.model_name]
@@ -0,0 +1,159 @@
+"""Bulk EmbeddingsCache lookups and binary vector storage."""
+
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from mcf.lib.embeddings.embeddings_cache import EmbeddingsCache, content_hash
+from mcf.lib.storage.base import (
+    EMBEDDINGS_CACHE_DTYPE_ENV,
+    decode_embedding,
+    embeddings_cache_dtype,
+    encode_embedding,
+)
+from mcf.lib.storage.duckdb_store import DuckDBStore
+from mcf.lib.storage.postgres_store import PostgresStore
+
+MODEL = "test-model"
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DuckDBStore(str(tmp_path / "cache.duckdb"))
+    yield s
+    s.close()
+
+
+def test_encode_decode_embedding():
+    vector = [0.5, -0.25, 1.0, 0.1]
+    assert decode_embedding(encode_embedding(vector, "float32"), "float32") == pytest.approx(vector, abs=1e-7)
+    assert decode_embedding(encode_embedding(vector, "float16"), "float16") == pytest.approx(vector, abs=1e-3)
+    assert len(encode_embedding(vector, "float16")) == 2 * len(vector)
+
+
+def test_embeddings_cache_dtype(monkeypatch):
+    monkeypatch.delenv(EMBEDDINGS_CACHE_DTYPE_ENV, raising=False)
+    assert embeddings_cache_dtype() == "float32"
+    monkeypatch.setenv(EMBEDDINGS_CACHE_DTYPE_ENV, "float64")
+    with pytest.raises(ValueError):
+        embeddings_cache_dtype()
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_set_many_get_many_round_trip(store, monkeypatch, dtype):
+    monkeypatch.setenv(EMBEDDINGS_CACHE_DTYPE_ENV, dtype)
+    items = [("first text", [0.5, -0.25, 0.125]), ("second text", [1.0, 0.0, -1.0])]
+    EmbeddingsCache(store=store).set_many(items, MODEL, "passage")
+
+    fresh = EmbeddingsCache(store=store)  # empty LRU: every hit comes from the DB
+    got = fresh.get_many(["second text", "missing", "first text", "second text"], MODEL, "passage")
+    assert got == [[1.0, 0.0, -1.0], None, [0.5, -0.25, 0.125], [1.0, 0.0, -1.0]]
+    assert fresh.get_many(["first text"], MODEL, "query") == [None]
+    (stored_dtype,) = store._con.execute("SELECT DISTINCT embedding_dtype FROM embeddings_cache").fetchone()
+    assert stored_dtype == dtype
+
+
+def test_get_many_queries_db_once_for_lru_misses(store, monkeypatch):
+    cache = EmbeddingsCache(store=store)
+    cache.set_many([(f"text {i}", [float(i)]) for i in range(5)], MODEL, "passage")
+    fresh = EmbeddingsCache(store=store)
+    fresh.get_many(["text 0"], MODEL, "passage")  # now in the LRU
+
+    calls = []
+    lookup = store.get_embeddings_by_content_hashes
+
+    def counting_lookup(hashes, **kwargs):
+        calls.append(list(hashes))
+        return lookup(hashes, **kwargs)
+
+    monkeypatch.setattr(store, "get_embeddings_by_content_hashes", counting_lookup)
+    got = fresh.get_many([f"text {i}" for i in range(5)], MODEL, "passage")
+    assert got == [[float(i)] for i in range(5)]
+    assert calls == [[content_hash(f"text {i}") for i in range(1, 5)]]
+
+
+def test_get_many_reads_legacy_json_rows(store):
+    store._con.execute(
+        """
+        INSERT INTO embeddings_cache(content_hash, model_name, embed_type, embedding_json, dim, cached_at)
+        VALUES (?, ?, 'passage', ?, 2, CURRENT_TIMESTAMP)
+        """,
+        [content_hash("old text"), MODEL, json.dumps([0.25, 0.75])],
+    )
+    assert EmbeddingsCache(store=store).get_many(["old text"], MODEL, "passage") == [[0.25, 0.75]]
+
+
+def test_set_many_overwrites_existing_rows(store):
+    cache = EmbeddingsCache(store=store)
+    cache.set_many([("text", [1.0, 2.0]), ("text", [3.0, 4.0])], MODEL, "passage")
+    cache.set_many([("text", [5.0, 6.0])], MODEL, "passage")
+    assert EmbeddingsCache(store=store).get_many(["text"], MODEL, "passage") == [[5.0, 6.0]]
+
+
+class _FakePgCursor:
+    """Records SQL; answers the information_schema probe and returns ``rows`` for cache reads."""
+
+    connection = SimpleNamespace(encoding="UTF8")
+
+    def __init__(self, columns: list[str], rows: list[tuple]) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.statements: list[str] = []
+        self._result: list[tuple] = []
+
+    def execute(self, sql, params=None):
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        self.statements.append(sql)
+        self._result = [(c,) for c in self.columns] if "information_schema" in sql else self.rows
+
+    def mogrify(self, template, args):
+        return repr(tuple(args)).encode()
+
+    def fetchall(self):
+        return self._result
+
+
+def _pg_store(cursor: _FakePgCursor) -> PostgresStore:
+    store = PostgresStore.__new__(PostgresStore)
+    store._emb_cache_has_blob = None
+    store._emb_cache_checked = False
+    store._cur = contextmanager(lambda: iter([cursor]))
+    return store
+
+
+def test_postgres_cache_without_migration_015_uses_json(capsys):
+    cursor = _FakePgCursor(
+        ["content_hash", "model_name", "embed_type", "embedding_json", "dim", "cached_at"],
+        [("h1", None, None, json.dumps([0.5, 1.5]))],
+    )
+    store = _pg_store(cursor)
+    assert store.get_embeddings_by_content_hashes(["h1", "h2"], model_name=MODEL, embed_type="passage") == {
+        "h1": [0.5, 1.5]
+    }
+    assert "embedding_blob" not in cursor.statements[-1]
+    store.upsert_embeddings_cache([("h2", [1.0, 2.0])], model_name=MODEL, embed_type="passage")
+    assert "embedding_json" in cursor.statements[-1] and "embedding_blob" not in cursor.statements[-1]
+    assert "015_add_embeddings_cache_blob.sql" in capsys.readouterr().out
+    assert sum("information_schema" in sql for sql in cursor.statements) == 1
+
+
+def test_postgres_cache_with_migration_015_uses_blobs():
+    cursor = _FakePgCursor(
+        ["content_hash", "embedding_blob", "embedding_dtype", "embedding_json"],
+        [("h1", encode_embedding([0.25], "float32"), "float32", None), ("h2", None, None, "[0.75]")],
+    )
+    store = _pg_store(cursor)
+    got = store.get_embeddings_by_content_hashes(["h1", "h2"], model_name=MODEL, embed_type="passage")
+    assert got == {"h1": [0.25], "h2": [0.75]}
+    store.upsert_embeddings_cache([("h3", [1.0])], model_name=MODEL, embed_type="passage")
+    assert "embedding_blob" in cursor.statements[-1]
+
+
+def test_postgres_cache_without_table_is_a_no_op():
+    cursor = _FakePgCursor([], [])
+    store = _pg_store(cursor)
+    assert store.get_embeddings_by_content_hashes(["h1"], model_name=MODEL, embed_type="passage") == {}
+    store.upsert_embeddings_cache([("h1", [1.0])], model_name=MODEL, embed_type="passage")
+    assert all("information_schema" in sql for sql in cursor.statements)
@@ -0,0 +1,99 @@
+"""MCF job source: shared limiter and client, and search-ingested jobs matching detail-fetched ones."""
+
+import threading
+
+import pytest
+
+from mcf.lib.api import rate_limit
+from mcf.lib.api.rate_limit import TokenBucket, shared_limiter
+from mcf.lib.archive.raw_archive import ARCHIVE_DIR_ENV
+from mcf.lib.models.job_detail import JobDetail
+from mcf.lib.models.models import Job
+from mcf.lib.replay.server import ReplayFixtures, ReplayServer
+from mcf.lib.sources.mcf_source import (
+    MCFJobSource,
+    _mcf_raw_to_normalized,
+    _search_result_to_normalized,
+)
+
+
+def _raw_job() -> tuple[str, dict]:
+    ((job_uuid, raw),) = ReplayFixtures.synthetic(mcf=1, seed=3).mcf_jobs.items()
+    # Key skills last, so the normalized order only comes out right if the flag is read.
+    for j, skill in enumerate(raw["skills"]):
+        skill["isKeySkill"] = j >= 3
+    return job_uuid, raw
+
+
+def _search_raw(raw: dict) -> dict:
+    return Job.model_validate(raw).model_dump(by_alias=True, mode="json", exclude_unset=True)
+
+
+def test_search_and_detail_paths_normalize_identically():
+    job_uuid, raw = _raw_job()
+    from_detail = _mcf_raw_to_normalized(JobDetail.model_validate(raw).model_dump(by_alias=True, mode="json"), job_uuid)
+    from_search = _search_result_to_normalized(_search_raw(raw), job_uuid)
+    assert from_search == from_detail
+    assert from_search.skills[:2] == [s["skill"] for s in raw["skills"][3:]]
+
+
+def test_search_result_without_key_skill_flags_needs_detail():
+    job_uuid, raw = _raw_job()
+    for skill in raw["skills"]:
+        del skill["isKeySkill"]
+    assert _search_result_to_normalized(_search_raw(raw), job_uuid) is None
+    raw["skills"] = []
+    assert _search_result_to_normalized(_search_raw(raw), job_uuid) is not None
+
+
+@pytest.fixture
+def fresh_limiters(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_shared", {})
+    monkeypatch.delenv(rate_limit.RATE_LIMIT_FILE_ENV, raising=False)
+
+
+def test_shared_limiter_is_one_bucket_per_name(fresh_limiters):
+    bucket = shared_limiter("mcf", 4.0)
+    assert shared_limiter("mcf", 10.0) is bucket and bucket.rate == 4.0  # the first caller's rate wins
+    assert shared_limiter("cag", 10.0) is not bucket
+    assert MCFJobSource()._limiter is MCFJobSource(rate_limit=1.0)._limiter is bucket
+
+
+def test_bucket_state_file_is_shared(tmp_path):
+    first = TokenBucket(10.0, state_path=tmp_path / "mcf.bucket")
+    second = TokenBucket(10.0, state_path=tmp_path / "mcf.bucket")  # as in another process
+    assert first._reserve() == 0.0
+    assert second._reserve() == pytest.approx(0.1, abs=0.02)
+
+
+class _CountingBucket(TokenBucket):
+    def __init__(self) -> None:
+        super().__init__(None)
+        self.acquired = 0
+        self._count_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._count_lock:
+            self.acquired += 1
+
+
+def test_listing_and_details_share_limiter_and_client(monkeypatch):
+    monkeypatch.delenv(ARCHIVE_DIR_ENV, raising=False)
+    with ReplayServer(ReplayFixtures.synthetic(mcf=12, seed=5)) as server:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        bucket = _CountingBucket()
+        source = MCFJobSource(limiter=bucket, search_ingest=False)
+        try:
+            job_ids = source.list_job_ids()
+            client = source._client
+            jobs = [source.get_job_detail(job_id) for job_id in job_ids]
+            assert client is None and source._client is not None
+            pooled = source._client
+            source.get_job_detail(job_ids[0])
+            assert source._client is pooled  # one keep-alive client for every detail call
+        finally:
+            source.close()
+        assert source._client is None
+        assert sorted(job.job_uuid for job in jobs) == sorted(server.fixtures.mcf_jobs)
+        assert bucket.acquired == server.stats["mcf_search"] + server.stats["mcf_detail"]
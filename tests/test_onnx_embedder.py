@@ -0,0 +1,74 @@
+"""ONNX Runtime backend: parity with the PyTorch model (needs the ``onnx`` extra and a model download)."""
+
+import numpy as np
+import pytest
+
+from mcf.lib.embeddings import onnx_embedder
+from mcf.lib.embeddings.embedder import EmbedderConfig
+from mcf.lib.embeddings.onnx_embedder import ParityReport, check_parity
+
+PARITY_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # small; same export path as the default model
+TEXTS = [
+    "Senior data engineer building batch and streaming pipelines in Python and Spark.",
+    "Part-time retail assistant, weekend shifts, Orchard Road.",
+    "Nurse",
+]
+
+
+class _Reference:
+    """Stands in for the PyTorch :class:`Embedder`: one unit vector per text."""
+
+    def _encode(self, texts):
+        return [[1.0, 0.0] if i % 2 == 0 else [0.0, 1.0] for i, _ in enumerate(texts)]
+
+
+class _DriftingOnnx:
+    """Stands in for :class:`OnnxEmbedder`: the last text's vector is rotated by 0.1 rad."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def _encode(self, texts):
+        vectors = _Reference()._encode(texts)
+        x, y = vectors[-1]
+        c, s = np.cos(0.1), np.sin(0.1)
+        vectors[-1] = [c * x - s * y, s * x + c * y]
+        return vectors
+
+
+def test_check_parity_reports_the_worst_text(monkeypatch):
+    monkeypatch.setattr(onnx_embedder, "OnnxEmbedder", _DriftingOnnx)
+    report = check_parity(EmbedderConfig(backend="onnx"), TEXTS, reference=_Reference())
+    assert report.texts == 3
+    assert report.min_cosine == pytest.approx(np.cos(0.1), abs=1e-5)
+    assert report.mean_cosine == pytest.approx((2 + np.cos(0.1)) / 3, abs=1e-5)
+    assert report.passed  # cos(0.1) = 0.995
+    assert not ParityReport(texts=3, min_cosine=0.98, mean_cosine=0.999, threshold=0.99).passed
+
+
+def test_onnx_embedder_requires_an_export(tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tokenizers")
+    with pytest.raises(FileNotFoundError, match="mcf export-onnx"):
+        onnx_embedder.OnnxEmbedder(EmbedderConfig(backend="onnx", onnx_dir=str(tmp_path)))
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    pytest.importorskip("sentence_transformers")
+    out_dir = tmp_path_factory.mktemp("onnx")
+    try:
+        return onnx_embedder.export_onnx(PARITY_MODEL, out_dir)
+    except OSError as e:  # no network / model not cached
+        pytest.skip(f"cannot load {PARITY_MODEL}: {e}")
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_onnx_vectors_match_pytorch(exported, quantize):
+    config = EmbedderConfig(model_name=PARITY_MODEL, backend="onnx", onnx_dir=str(exported), quantize=quantize)
+    report = check_parity(config, TEXTS)
+    assert report.passed, report
+    vectors = onnx_embedder.OnnxEmbedder(config).embed_texts(TEXTS)
+    assert np.linalg.norm(vectors, axis=1) == pytest.approx(1.0, abs=1e-4)
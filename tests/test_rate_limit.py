@@ -0,0 +1,114 @@
+"""Adaptive rate limiting and throttle deferral in the detail fetcher."""
+
+import time
+
+import pytest
+
+from mcf.lib.api.client import MCFAPIError
+from mcf.lib.api.rate_limit import AdaptiveTokenBucket, TokenBucket
+from mcf.lib.pipeline.detail_fetch import iter_job_details
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(100.0)
+    assert bucket._reserve() == 0.0  # the initial burst token
+    assert bucket._reserve() == pytest.approx(0.01, abs=0.005)
+
+
+def test_token_bucket_disabled():
+    bucket = TokenBucket(None)
+    assert not bucket.enabled
+    assert all(bucket._reserve() == 0.0 for _ in range(5))
+
+
+def test_adaptive_bucket_decreases_on_throttle_and_recovers():
+    bucket = AdaptiveTokenBucket(4.0, min_rate=0.5, increase=1.0, success_window=2, open_after=10)
+    bucket.record_throttle()
+    assert bucket.rate == 2.0
+    bucket.record_throttle()  # within 1 / rate of the last decrease: counted once
+    assert bucket.rate == 2.0
+    for _ in range(4):
+        bucket.record_success()
+    assert bucket.rate == 4.0
+    for _ in range(4):
+        bucket.record_success()
+    assert bucket.rate == 4.0  # never above the configured rate
+
+
+def test_adaptive_bucket_circuit_breaker():
+    bucket = AdaptiveTokenBucket(4.0, min_rate=0.5, open_after=2, open_for=30.0, max_open_for=45.0)
+    bucket.record_throttle()
+    assert bucket._circuit_wait() == 0.0
+    bucket.record_throttle()
+    assert bucket._circuit_wait() == pytest.approx(30.0, abs=1.0)
+    assert bucket.rate == 0.5
+    bucket.record_throttle()  # in-flight failure while open: no re-open
+    assert bucket._circuit_wait() <= 30.0
+
+    # Re-opening doubles the pause, up to max_open_for; a success resets it.
+    bucket._open_until = 0.0
+    bucket.record_throttle()
+    bucket.record_throttle()
+    assert bucket._circuit_wait() == pytest.approx(45.0, abs=1.0)
+    bucket._open_until = 0.0
+    bucket.record_success()
+    bucket.record_throttle()
+    bucket.record_throttle()
+    assert bucket._circuit_wait() == pytest.approx(30.0, abs=1.0)
+
+
+def test_adaptive_bucket_honours_retry_after():
+    bucket = AdaptiveTokenBucket(4.0, open_after=3)
+    bucket.record_throttle(retry_after=5.0)
+    assert bucket._circuit_wait() == pytest.approx(5.0, abs=1.0)
+
+
+def test_adaptive_bucket_acquire_waits_for_open_circuit():
+    bucket = AdaptiveTokenBucket(1000.0)
+    bucket._open_until = time.monotonic() + 0.2
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.19
+
+
+class _ThrottlingSource:
+    """Sync source that throttles each job in ``throttle`` for its first ``times`` calls."""
+
+    source_id = "test"
+
+    def __init__(self, throttle: set[str], times: int) -> None:
+        self.throttle = throttle
+        self.times = times
+        self.calls: list[str] = []
+
+    def get_job_detail(self, job_id: str):
+        self.calls.append(job_id)
+        if job_id in self.throttle and self.calls.count(job_id) <= self.times:
+            raise MCFAPIError(403, "Forbidden")
+        if job_id == "missing":
+            raise MCFAPIError(404, "Not found")
+        return {"job_uuid": job_id}
+
+
+def test_iter_job_details_defers_throttled_jobs():
+    source = _ThrottlingSource({"b"}, times=1)
+    results = list(iter_job_details(source, ["a", "b", "c"], concurrency=1))
+    assert [r.job_id for r in results] == ["a", "c", "b"]
+    assert all(r.error is None for r in results)
+    assert source.calls == ["a", "b", "c", "b"]
+
+
+def test_iter_job_details_reports_throttle_after_deferred_rounds():
+    source = _ThrottlingSource({"b"}, times=10)
+    results = {r.job_id: r for r in iter_job_details(source, ["a", "b"], concurrency=1, deferred_rounds=2)}
+    assert results["a"].job == {"job_uuid": "a"}
+    assert results["b"].error.status_code == 403
+    assert source.calls.count("b") == 3
+
+
+def test_iter_job_details_does_not_defer_other_errors():
+    source = _ThrottlingSource(set(), times=0)
+    results = list(iter_job_details(source, ["missing", "a"], concurrency=1))
+    assert [r.job_id for r in results] == ["missing", "a"]
+    assert results[0].error.status_code == 404
+    assert source.calls == ["missing", "a"]
@@ -0,0 +1,119 @@
+"""Raw archive dedup, crash recovery and ``latest()``; ``mcf reparse`` against DuckDB."""
+
+import pytest
+
+from mcf.lib.archive.raw_archive import KIND_DETAIL, KIND_SEARCH, RawArchive
+from mcf.lib.pipeline.incremental_crawl import run_incremental_crawl
+from mcf.lib.pipeline.reparse import run_reparse
+from mcf.lib.replay.benchmark import HashEmbedder
+from mcf.lib.sources.base import NormalizedJob
+from mcf.lib.storage.duckdb_store import DuckDBStore
+
+
+def _append(archive: RawArchive, job_uuid: str, kind: str, updated_at: str | None, **raw) -> bool:
+    return archive.append(source_id="mcf", job_uuid=job_uuid, kind=kind, raw=raw, updated_at=updated_at)
+
+
+def test_append_dedups_by_key(tmp_path):
+    archive = RawArchive(tmp_path)
+    assert _append(archive, "a", KIND_SEARCH, "t1", title="A")
+    assert not _append(archive, "a", KIND_SEARCH, "t1", title="A again")
+    assert _append(archive, "a", KIND_DETAIL, "t1", title="A detail")
+    assert not _append(archive, "a", KIND_SEARCH, "t1", title="A")  # the detail covers its search result
+    assert _append(archive, "a", KIND_SEARCH, "t2", title="A v2")
+    # Without updatedAt the payload hash is the version.
+    assert _append(archive, "b", KIND_DETAIL, None, title="B")
+    assert not _append(archive, "b", KIND_DETAIL, None, title="B")
+    assert _append(archive, "b", KIND_DETAIL, None, title="B edited")
+    archive.flush()
+
+    reopened = RawArchive(tmp_path)  # keys come back from index.tsv
+    assert reopened.contains("mcf", "a", "t1", KIND_SEARCH)
+    assert reopened.contains("mcf", "a", "t2", KIND_SEARCH)
+    assert not reopened.contains("mcf", "a", "t2", KIND_DETAIL)
+    assert reopened.contains("mcf", "b", None, raw={"title": "B"})
+    assert not reopened.contains("mcf", "b", None)
+    assert not _append(reopened, "a", KIND_DETAIL, "t1", title="A detail")
+    assert len(list(reopened.iter_records())) == 5
+
+
+def test_truncated_frame_keeps_earlier_records(tmp_path):
+    archive = RawArchive(tmp_path)
+    _append(archive, "a", KIND_DETAIL, "t1", title="A")
+    archive.flush()
+    (segment,) = (tmp_path / "mcf").glob("*.jsonl.zst")
+    intact = segment.stat().st_size
+    _append(archive, "b", KIND_DETAIL, "t1", title="B " * 200)
+    archive.flush()
+    with open(segment, "r+b") as f:  # a crash mid-write of the second frame
+        f.truncate(intact + (segment.stat().st_size - intact) // 2)
+
+    assert [r.job_uuid for r in RawArchive(tmp_path).iter_records()] == ["a"]
+
+
+def test_latest_prefers_newest_then_detail(tmp_path):
+    archive = RawArchive(tmp_path)
+    _append(archive, "a", KIND_SEARCH, "t1", title="A search")
+    _append(archive, "a", KIND_DETAIL, "t1", title="A detail")
+    _append(archive, "b", KIND_DETAIL, "t1", title="B detail")
+    _append(archive, "b", KIND_SEARCH, "t2", title="B newer search")
+    archive.flush()
+    latest = RawArchive(tmp_path).latest("mcf")
+    assert latest["a"].kind == KIND_DETAIL and latest["a"].raw == {"title": "A detail"}
+    assert latest["b"].kind == KIND_SEARCH and latest["b"].updated_at == "t2"
+
+
+class _TitleSource:
+    """Serves ``Job <id>`` details and normalizes archived ``{"title": ...}`` payloads."""
+
+    source_id = "mcf"
+
+    def list_job_ids(self, *, categories=None, limit=None, on_progress=None, known_ids=None, checkpoint=None):
+        return ["a", "b"]
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        return self.normalize_raw({"title": f"Job {job_id}"}, job_id)
+
+    def normalize_raw(self, raw: dict, job_uuid: str) -> NormalizedJob:
+        return NormalizedJob(
+            source_id="mcf",
+            external_id=job_uuid,
+            title=raw["title"],
+            company_name="Acme",
+            location="Singapore",
+            job_url=None,
+            skills=["Python"],
+            description_snippet="Build things.",
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DuckDBStore(str(tmp_path / "reparse.duckdb"))
+    yield s
+    s.close()
+
+
+def _rows(store: DuckDBStore) -> dict[str, tuple]:
+    rows = store._con.execute(
+        "SELECT job_uuid, title, source_updated_at, last_seen_run_id, last_seen_at FROM jobs"
+    ).fetchall()
+    return {r[0]: r[1:] for r in rows}
+
+
+def test_reparse_keeps_newer_watermark_and_last_seen(tmp_path, store):
+    run_incremental_crawl(store=store, source=_TitleSource(), embedder=HashEmbedder())
+    store.set_job_watermarks([("a", "2026-01-02T00:00:00"), ("b", "2026-01-02T00:00:00")])
+    before = _rows(store)
+
+    archive = RawArchive(tmp_path / "archive")
+    _append(archive, "a", KIND_DETAIL, "2026-01-01T00:00:00", title="Stale A")
+    _append(archive, "b", KIND_DETAIL, "2026-01-03T00:00:00", title="Fresh B")
+    archive.flush()
+    result = run_reparse(store=store, archive=archive, sources=[_TitleSource()], embedder=HashEmbedder())
+
+    after = _rows(store)
+    assert (result.reparsed, result.skipped, result.failed) == (1, 1, 0)
+    assert after["a"] == before["a"]  # an older archived version never replaces the row
+    assert after["b"][:2] == ("Fresh B", "2026-01-03T00:00:00")
+    assert after["b"][2:] == before["b"][2:]  # a reparse is not a sighting
@@ -0,0 +1,39 @@
+"""Replay server fixtures and the crawl throughput benchmark."""
+
+from mcf.lib.archive.raw_archive import KIND_DETAIL, KIND_SEARCH, RawArchive
+from mcf.lib.replay.benchmark import run_crawl_benchmark
+from mcf.lib.replay.server import ReplayConfig, ReplayFixtures
+
+
+def test_fixtures_from_archive_use_the_newest_records(tmp_path):
+    archive = RawArchive(tmp_path)
+    archive.append(source_id="mcf", job_uuid="a", kind=KIND_SEARCH, raw={"title": "old"}, updated_at="t1")
+    archive.append(source_id="mcf", job_uuid="a", kind=KIND_DETAIL, raw={"title": "new"}, updated_at="t2")
+    archive.append(source_id="cag", job_uuid="cag:123_x", kind=KIND_DETAIL, raw={"job_title": "Officer"})
+    archive.flush()
+    fixtures = ReplayFixtures.from_archive(archive)
+    assert fixtures.mcf_jobs == {"a": {"title": "new"}}
+    assert fixtures.cag_objects == {"123_x": {"job_title": "Officer", "objectID": "123_x"}}
+
+
+def test_synthetic_fixtures_are_deterministic():
+    assert ReplayFixtures.synthetic(mcf=5, cag=3, seed=4) == ReplayFixtures.synthetic(mcf=5, cag=3, seed=4)
+    assert ReplayFixtures.synthetic(mcf=5, seed=4) != ReplayFixtures.synthetic(mcf=5, seed=5)
+
+
+def test_mcf_benchmark_recovers_from_injected_throttling():
+    fixtures = ReplayFixtures.synthetic(mcf=40, seed=2)
+    result = run_crawl_benchmark(fixtures, config=ReplayConfig(error_403_rate=0.1, seed=1), search_ingest=False)
+    assert result.source_id == "mcf" and result.jobs == 40
+    stats = result.server_stats
+    assert stats["injected_403"] > 0
+    assert stats["mcf_detail"] == 40 + stats["injected_403"]  # each 403 cost one retry, no job was lost
+    assert result.jobs_per_sec["overall"] > 0
+    assert result.telemetry["detail_fetch"]["calls"] >= 40
+
+
+def test_search_ingest_benchmarks_need_no_detail_requests():
+    mcf = run_crawl_benchmark(ReplayFixtures.synthetic(mcf=30, seed=2))
+    assert mcf.jobs == 30 and mcf.server_stats.get("mcf_detail", 0) == 0
+    cag = run_crawl_benchmark(ReplayFixtures.synthetic(mcf=0, cag=30, seed=2), source="cag")
+    assert cag.jobs == 30 and set(cag.server_stats) == {"cag_search"}
@@ -72,3 +72,28 @@ def test_lowball_check_requires_auth(client):
         "salary_min": 5000,
     })
     assert r.status_code < 500
+
+
+@pytest.mark.parametrize("loads", [True, False])
+def test_preload_embedder_thread_does_not_raise(monkeypatch, loads):
+    """The lifespan's background model preload logs success or failure; it never dies with an exception."""
+    import threading
+    from types import SimpleNamespace
+
+    from mcf.api import server
+
+    def fake_preload():
+        if not loads:
+            raise OSError("model not available")
+        return SimpleNamespace(model_name="fake-model")
+
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+    monkeypatch.setattr(server.settings, "preload_embedder", True)
+    monkeypatch.setattr(server, "preload_embedder", fake_preload)
+    with TestClient(app):
+        pass
+    for thread in threading.enumerate():
+        if thread.name == "preload-embedder":
+            thread.join(timeout=10)
+    assert errors == []
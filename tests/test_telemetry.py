@@ -0,0 +1,101 @@
+"""Per-run crawl telemetry: stored by the crawl, shown by ``mcf runs --stats`` and the admin API."""
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from mcf.api.server import app as api_app
+from mcf.api.server import get_store
+from mcf.cli.cli import app as cli_app
+from mcf.lib.pipeline.incremental_crawl import run_incremental_crawl
+from mcf.lib.pipeline.telemetry import PHASE_DB_WRITE, PHASE_LISTING, CrawlTelemetry
+from mcf.lib.replay.benchmark import HashEmbedder
+from mcf.lib.sources.base import NormalizedJob
+from mcf.lib.storage.duckdb_store import DuckDBStore
+
+N_JOBS = 12
+
+
+class _Source:
+    source_id = "mcf"
+
+    def list_job_ids(self, *, categories=None, limit=None, on_progress=None, known_ids=None, checkpoint=None):
+        return [f"job-{i}" for i in range(N_JOBS)]
+
+    def get_job_detail(self, job_id: str) -> NormalizedJob:
+        return NormalizedJob(
+            source_id="mcf",
+            external_id=job_id,
+            title=f"Job {job_id}",
+            company_name="Acme",
+            location="Singapore",
+            job_url=None,
+            skills=["Python"],
+            description_snippet="Build things.",
+        )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "telemetry.duckdb"
+    store = DuckDBStore(str(path))
+    try:
+        run_incremental_crawl(store=store, source=_Source(), embedder=HashEmbedder())
+    finally:
+        store.close()
+    return path
+
+
+def test_telemetry_latency_histogram():
+    telemetry = CrawlTelemetry()
+    for seconds in (0.01, 0.02, 0.2, 0.3, 20.0):
+        telemetry.record_fetch(seconds)
+    telemetry.record_embed(100, 2.0)
+    with telemetry.phase(PHASE_LISTING):
+        pass
+    summary = telemetry.to_dict()
+    fetch = summary["detail_fetch"]
+    assert (fetch["calls"], fetch["p50_ms"], fetch["max_ms"]) == (5, 200.0, 20000.0)
+    assert fetch["histogram_ms"]["<=50"] == 2 and fetch["histogram_ms"]["<=250"] == 1
+    assert fetch["histogram_ms"][">10000"] == 1
+    assert summary["embed"] == {"texts": 100, "seconds": 2.0, "texts_per_sec": 50.0}
+    assert PHASE_LISTING in summary["phases"]
+
+
+def test_crawl_stores_telemetry_with_the_run(db_path):
+    store = DuckDBStore(str(db_path))
+    try:
+        (run,) = store.get_recent_runs(limit=1)
+    finally:
+        store.close()
+    telemetry = run["telemetry"]
+    assert {PHASE_LISTING, PHASE_DB_WRITE} <= set(telemetry["phases"])
+    assert telemetry["detail_fetch"]["calls"] == N_JOBS
+    assert telemetry["embed"]["texts"] == N_JOBS
+    assert telemetry["wall_seconds"] > 0
+
+
+def test_runs_command_shows_stats(db_path, monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("COLUMNS", "250")
+    result = CliRunner().invoke(cli_app, ["runs", "--db", str(db_path), "--stats"])
+    assert result.exit_code == 0, result.output
+    assert "Fetch p50/p95 ms" in result.output
+    assert f"{N_JOBS}" in result.output
+
+
+def test_admin_crawl_runs_endpoint(db_path, monkeypatch):
+    monkeypatch.setenv("CRON_SECRET", "secret")
+    store = DuckDBStore(str(db_path))
+    api_app.dependency_overrides[get_store] = lambda: store
+    try:
+        client = TestClient(api_app)
+        assert client.get("/api/admin/crawl-runs").status_code == 403
+        response = client.get("/api/admin/crawl-runs", params={"limit": 5}, headers={"X-Crawl-Secret": "secret"})
+    finally:
+        api_app.dependency_overrides.pop(get_store, None)
+        store.close()
+    assert response.status_code == 200
+    (run,) = response.json()["runs"]
+    assert run["added"] == N_JOBS
+    assert run["telemetry"]["detail_fetch"]["calls"] == N_JOBS